@@ -0,0 +1,265 @@
+from figure import *
+from evaluation import PIECE_VALUES
+from notation import CODE_BITS, POSITION_STRUCT
+
+try:
+    import numpy as np
+except ImportError:  # NumPy нужен только для пакетной обработки
+    np = None
+
+MOBILITY_WEIGHT = 2  # Сантипешек за каждую клетку, куда может пойти хотя бы одна фигура
+
+# Направления ходов (порядок не важен, в отличие от таблиц figure.py)
+KING_OFFSETS = ((0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1), (1, 0), (-1, 0))
+NIGHT_OFFSETS = ((-1, 2), (-2, 1), (-2, -1), (-1, -2), (1, -2), (2, -1), (1, 2), (2, 1))
+JUMPMAN_OFFSETS = ((0, 2), (-2, 2), (-2, 0), (-2, -2), (0, -2), (2, -2), (2, 0))
+ROOK_DIRECTIONS = ((1, 0), (0, -1), (-1, 0), (0, 1))
+BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, -1), (-1, 1))
+PAWN_DIRECTIONS = {'white': -1, 'black': 1}
+
+
+def require_numpy():
+    """Проверяет, что NumPy установлен.
+
+    Raises:
+        ImportError: Если NumPy не установлен.
+    """
+    if np is None:
+        raise ImportError("Для пакетной оценки нужен NumPy: pip install numpy")
+
+def figure_codes(figure_type, side):
+    """Возвращает коды фигуры типа figure_type стороны side (для пешки - оба варианта флага первого хода).
+
+    Args:
+        figure_type (type): Класс фигуры.
+        side (str): Сторона ('white' или 'black').
+
+    Returns:
+        tuple: Коды из figure.encode_figure.
+    """
+    black = side == 'black'
+    if figure_type is Pawn:
+        return FIGURE_CODES[Pawn] + black, PAWN_FIRST_MOVE_CODE + black
+    return (FIGURE_CODES[figure_type] + black,)
+
+def material_table():
+    """Возвращает массив ценности фигуры по коду (белые со знаком плюс, черные - минус)."""
+    require_numpy()
+    table = np.zeros(PAWN_FIRST_MOVE_CODE + 2, dtype=np.int32)
+    for figure_type, value in PIECE_VALUES.items():
+        for side, sign in (('white', 1), ('black', -1)):
+            table[list(figure_codes(figure_type, side))] = sign * value
+    return table
+
+def stack_positions(games):
+    """Собирает позиции в массив кодов фигур.
+
+    Args:
+        games (iterable): Позиции (Game).
+
+    Returns:
+        numpy.ndarray: Массив K x 8 x 8 типа uint8 с кодами encode_figure.
+    """
+    require_numpy()
+    data = b''.join(pack_board(game) for game in games)
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, 8, 8)
+
+def codes_from_records(buffer):
+    """Распаковывает буфер двоичных записей notation.encode_positions в массив кодов.
+
+    5-битные коды всех записей распаковываются сразу, без цикла по позициям.
+
+    Args:
+        buffer (bytes, memoryview или mmap): Буфер записей.
+
+    Returns:
+        numpy.ndarray: Массив K x 8 x 8 типа uint8.
+    """
+    require_numpy()
+    records = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, POSITION_STRUCT.size)
+    bits = np.unpackbits(records[:, :40], axis=1, bitorder='little').reshape(-1, 64, CODE_BITS)
+    weights = (1 << np.arange(CODE_BITS)).astype(np.uint8)
+    return (bits * weights).sum(axis=2).astype(np.uint8).reshape(-1, 8, 8)
+
+def shift(planes, d_row, d_col):
+    """Сдвигает все клетки масок на (d_row, d_col), отбрасывая ушедшие за край доски.
+
+    Args:
+        planes (numpy.ndarray): Маски K x 8 x 8.
+        d_row (int): Смещение по строкам.
+        d_col (int): Смещение по столбцам.
+
+    Returns:
+        numpy.ndarray: Сдвинутые маски.
+    """
+    result = np.zeros_like(planes)
+    if abs(d_row) > 7 or abs(d_col) > 7:
+        return result
+    result[:, max(d_row, 0):8 + min(d_row, 0), max(d_col, 0):8 + min(d_col, 0)] = \
+        planes[:, max(-d_row, 0):8 + min(-d_row, 0), max(-d_col, 0):8 + min(-d_col, 0)]
+    return result
+
+def piece_mask(codes, figure_type, side):
+    """Возвращает маски клеток с фигурами типа figure_type стороны side."""
+    return np.isin(codes, figure_codes(figure_type, side))
+
+def side_mask(codes, side):
+    """Возвращает маски клеток с фигурами стороны side (черные коды четные, белые - нечетные)."""
+    return (codes != EMPTY_CODE) & ((codes % 2 == 0) == (side == 'black'))
+
+def slide(pieces, empty, d_row, d_col, limit=7):
+    """Строит клетки, которые бьют дальнобойные фигуры в одном направлении (до первой занятой включительно).
+
+    Args:
+        pieces (numpy.ndarray): Маски фигур.
+        empty (numpy.ndarray): Маски пустых клеток.
+        d_row (int): Направление по строкам.
+        d_col (int): Направление по столбцам.
+        limit (int): Наибольшая дальность хода.
+
+    Returns:
+        numpy.ndarray: Маски атакованных клеток.
+    """
+    attacks = np.zeros_like(pieces)
+    frontier = shift(pieces, d_row, d_col)
+    for _ in range(limit):
+        attacks |= frontier
+        frontier = shift(frontier & empty, d_row, d_col)
+    return attacks
+
+def pawn_attack_masks(codes, side):
+    """Возвращает маски клеток, которые бьют пешки стороны (обе диагонали вперед)."""
+    pawns = piece_mask(codes, Pawn, side)
+    return shift(pawns, PAWN_DIRECTIONS[side], -1) | shift(pawns, PAWN_DIRECTIONS[side], 1)
+
+def piece_attack_masks(codes, side, empty, own):
+    """Возвращает маски клеток, которые бьют шахматные фигуры стороны, кроме пешек.
+
+    Args:
+        codes (numpy.ndarray): Коды фигур K x 8 x 8.
+        side (str): Сторона ('white' или 'black').
+        empty (numpy.ndarray): Маски пустых клеток.
+        own (numpy.ndarray): Маски клеток с фигурами стороны.
+
+    Returns:
+        numpy.ndarray: Маски K x 8 x 8 типа bool.
+    """
+    attacks = np.zeros(codes.shape, dtype=bool)
+    kings = piece_mask(codes, King, side)
+    for d_row, d_col in KING_OFFSETS:
+        attacks |= shift(kings, d_row, d_col)
+    for figure_type, offsets in ((Night, NIGHT_OFFSETS), (Jumpman, JUMPMAN_OFFSETS)):
+        pieces = piece_mask(codes, figure_type, side)
+        for d_row, d_col in offsets:
+            attacks |= shift(pieces, d_row, d_col) & ~own
+
+    rooks = piece_mask(codes, Rook, side) | piece_mask(codes, Queen, side)
+    bishops = piece_mask(codes, Bishop, side) | piece_mask(codes, Queen, side)
+    lite_rooks = piece_mask(codes, LiteRook, side)
+    for d_row, d_col in ROOK_DIRECTIONS:
+        attacks |= slide(rooks, empty, d_row, d_col)
+        attacks |= slide(lite_rooks, empty, d_row, d_col, limit=2)
+    for d_row, d_col in BISHOP_DIRECTIONS:
+        attacks |= slide(bishops, empty, d_row, d_col)
+    return attacks
+
+def attack_masks(codes, side):
+    """Строит маски клеток, которые бьют шахматные фигуры стороны (как ChessBoard.build_attack_map).
+
+    Конь и Прыгун не бьют клетки со своими фигурами, лайт-ладья бьет не дальше 2 клеток,
+    Оборотень ничего не бьет.
+
+    Args:
+        codes (numpy.ndarray): Коды фигур K x 8 x 8.
+        side (str): Сторона ('white' или 'black').
+
+    Returns:
+        numpy.ndarray: Маски K x 8 x 8 типа bool.
+    """
+    require_numpy()
+    empty = codes == EMPTY_CODE
+    return pawn_attack_masks(codes, side) | piece_attack_masks(codes, side, empty, side_mask(codes, side))
+
+def destination_masks(codes, side):
+    """Строит маски клеток, куда может пойти хотя бы одна фигура стороны (без проверки шаха).
+
+    Шахматные фигуры ходят на атакованные клетки без своих фигур (пешка - на взятие и
+    вперед), Оборотень - на клетки соседних своих фигур (обмен). Шашки ходят вперед и бьют
+    прыжком в обе стороны, дамки ходят по диагоналям и бьют с приземлением сразу за фигурой.
+
+    Args:
+        codes (numpy.ndarray): Коды фигур K x 8 x 8.
+        side (str): Сторона ('white' или 'black').
+
+    Returns:
+        numpy.ndarray: Маски K x 8 x 8 типа bool.
+    """
+    require_numpy()
+    empty = codes == EMPTY_CODE
+    own = side_mask(codes, side)
+    enemy = side_mask(codes, 'black' if side == 'white' else 'white')
+    direction = PAWN_DIRECTIONS[side]
+
+    destinations = (piece_attack_masks(codes, side, empty, own) & ~own) | (pawn_attack_masks(codes, side) & enemy)
+    pawns = piece_mask(codes, Pawn, side)
+    first_pawns = codes == figure_codes(Pawn, side)[1]
+    destinations |= shift(pawns, direction, 0) & empty
+    destinations |= shift(shift(first_pawns, direction, 0) & empty, direction, 0) & empty
+
+    werewolves = piece_mask(codes, WereWolf, side)
+    for d_row, d_col in KING_OFFSETS:
+        destinations |= shift(werewolves, d_row, d_col) & own
+
+    men = piece_mask(codes, PawnCheckers, side)
+    for d_col in (-1, 1):
+        destinations |= shift(men, direction, d_col) & empty
+        for d_row in (-1, 1):
+            over_enemy = shift(men, d_row, d_col) & enemy
+            destinations |= shift(over_enemy, d_row, d_col) & empty
+
+    kings = piece_mask(codes, KingCheckers, side)
+    for d_row, d_col in BISHOP_DIRECTIONS:
+        reach = slide(kings, empty, d_row, d_col)
+        destinations |= reach & empty
+        destinations |= shift(reach & enemy, d_row, d_col) & empty
+    return destinations
+
+def material(codes):
+    """Считает материал всех позиций.
+
+    Args:
+        codes (numpy.ndarray): Коды фигур K x 8 x 8.
+
+    Returns:
+        numpy.ndarray: Массив длины K: материал белых минус материал черных.
+    """
+    require_numpy()
+    return material_table()[codes].sum(axis=(1, 2))
+
+def mobility(codes, side):
+    """Считает подвижность стороны во всех позициях.
+
+    Args:
+        codes (numpy.ndarray): Коды фигур K x 8 x 8.
+        side (str): Сторона ('white' или 'black').
+
+    Returns:
+        numpy.ndarray: Массив длины K: число клеток, куда может пойти хотя бы одна фигура.
+    """
+    return destination_masks(codes, side).sum(axis=(1, 2))
+
+def evaluate_batch(codes, black_to_move=None):
+    """Оценивает все позиции материалом и подвижностью.
+
+    Args:
+        codes (numpy.ndarray): Коды фигур K x 8 x 8.
+        black_to_move (numpy.ndarray or None): Массив длины K с очередью хода; если задан,
+            оценка дается с точки зрения стороны, чей ход, иначе - с точки зрения белых.
+
+    Returns:
+        numpy.ndarray: Массив оценок длины K.
+    """
+    scores = material(codes) + MOBILITY_WEIGHT * (mobility(codes, 'white') - mobility(codes, 'black'))
+    if black_to_move is not None:
+        scores = np.where(black_to_move, -scores, scores)
+    return scores
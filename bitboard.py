@@ -0,0 +1,417 @@
+from figure import *
+
+FULL_MASK = (1 << 64) - 1  # Все 64 клетки доски
+FILE_MASKS = [sum(1 << (row * 8 + col) for row in range(8)) for col in range(8)]  # Маски столбцов a-h
+# Для сдвига по столбцам на d_col: клетки, которые после сдвига остаются на доске
+SHIFT_KEEP_MASKS = {d_col: sum(FILE_MASKS[col] for col in range(8) if 0 <= col + d_col < 8) for d_col in range(-7, 8)}
+
+
+def square_mask(cells):
+    """Переводит набор клеток (row, col) в 64-битную маску.
+
+    Args:
+        cells (iterable): Клетки (row, col).
+
+    Returns:
+        int: Маска, в которой бит row * 8 + col установлен для каждой клетки.
+    """
+    mask = 0
+    for row, col in cells:
+        mask |= 1 << (row * 8 + col)
+    return mask
+
+def iter_bits(mask):
+    """Перебирает номера установленных битов маски (номера клеток row * 8 + col).
+
+    Args:
+        mask (int): Маска клеток.
+
+    Yields:
+        int: Номер клетки.
+    """
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+def shift(mask, d_row, d_col):
+    """Сдвигает все клетки маски на (d_row, d_col), отбрасывая клетки, ушедшие за край доски.
+
+    Args:
+        mask (int): Маска клеток.
+        d_row (int): Смещение по строкам.
+        d_col (int): Смещение по столбцам.
+
+    Returns:
+        int: Сдвинутая маска.
+    """
+    mask &= SHIFT_KEEP_MASKS[d_col]
+    offset = d_row * 8 + d_col
+    if offset >= 0:
+        return (mask << offset) & FULL_MASK
+    return mask >> -offset
+
+def mask_cells(mask):
+    """Переводит маску в множество клеток (row, col).
+
+    Args:
+        mask (int): Маска клеток.
+
+    Returns:
+        set: Клетки (row, col).
+    """
+    return {(square >> 3, square & 7) for square in iter_bits(mask)}
+
+def build_ray_masks(ray_table):
+    """Переводит таблицу лучей из figure.py в маски лучей.
+
+    Args:
+        ray_table (tuple): Таблица лучей (кортеж длины 64 из кортежей лучей).
+
+    Returns:
+        tuple: Для каждой клетки кортеж пар (маска луча, True если номера клеток луча возрастают).
+    """
+    table = []
+    for square, rays in enumerate(ray_table):
+        table.append(tuple((square_mask(ray), ray[0][0] * 8 + ray[0][1] > square) for ray in rays))
+    return tuple(table)
+
+# Маски прыжков и лучей для всех клеток, построенные из таблиц ходов фигур
+KING_MASKS = tuple(square_mask(cells) for cells in KING_MOVES)
+NIGHT_MASKS = tuple(square_mask(cells) for cells in NIGHT_MOVES)
+JUMPMAN_MASKS = tuple(square_mask(cells) for cells in JUMPMAN_MOVES)
+BISHOP_RAY_MASKS = build_ray_masks(BISHOP_RAYS)
+ROOK_RAY_MASKS = build_ray_masks(ROOK_RAYS)
+LITE_ROOK_RAY_MASKS = build_ray_masks(LITE_ROOK_RAYS)
+KING_CHECKERS_RAY_MASKS = build_ray_masks(KING_CHECKERS_RAYS)
+# Обратные маски: откуда фигура стороны бьет клетку (см. PAWN_ATTACKERS и JUMPMAN_ATTACKERS в figure.py)
+PAWN_ATTACKER_MASKS = {side: tuple(square_mask(cells) for cells in table) for side, table in PAWN_ATTACKERS.items()}
+JUMPMAN_ATTACKER_MASKS = tuple(square_mask(cells) for cells in JUMPMAN_ATTACKERS)
+# Взятия шашки: для каждой клетки пары (маска перепрыгиваемой клетки, маска клетки приземления)
+CHECKERS_JUMP_MASKS = tuple(
+    tuple((1 << ((row + d_row) * 8 + col + d_col), 1 << ((row + 2 * d_row) * 8 + col + 2 * d_col))
+          for d_row in (-1, 1) for d_col in (-1, 1) if 0 <= row + 2 * d_row < 8 and 0 <= col + 2 * d_col < 8)
+    for row, col in (divmod(square, 8) for square in range(64)))
+
+class BitBoard:
+    """Представление доски 64-битными масками занятости по сторонам и типам фигур.
+
+    Игра с backend='bitboard' хранит маски рядом с клетками доски (Game.bitboard) и
+    обновляет их в set_figure, поэтому фигуры читают клетки как у обычной доски, а
+    проверки атак, шахов, связок и взятий шашек считаются операциями над масками.
+    """
+
+    def __init__(self):
+        """Создает пустую доску."""
+        self.squares = [None] * 64
+        self.occupancy = {'white': 0, 'black': 0}  # Маски занятости по сторонам
+        self.pieces = {}  # (сторона, класс фигуры) -> маска
+
+    def put(self, square, figure):
+        """Ставит фигуру на клетку (или очищает клетку) и обновляет маски.
+
+        Args:
+            square (int): Номер клетки row * 8 + col.
+            figure (Figure or None): Фигура или None для пустой клетки.
+        """
+        bit = 1 << square
+        squares = self.squares
+        occupancy = self.occupancy
+        pieces = self.pieces
+        old_figure = squares[square]
+        # Бит снятой фигуры заведомо установлен, поэтому он снимается исключающим или
+        if old_figure is not None:
+            occupancy[old_figure.side] ^= bit
+            pieces[old_figure.side, type(old_figure)] ^= bit
+        squares[square] = figure
+        if figure is not None:
+            occupancy[figure.side] |= bit
+            key = (figure.side, type(figure))
+            pieces[key] = pieces.get(key, 0) | bit
+
+    def get_pieces(self, side, figure_type):
+        """Возвращает маску фигур указанной стороны и типа.
+
+        Args:
+            side (str): Сторона ('white' или 'black').
+            figure_type (type): Класс фигуры.
+
+        Returns:
+            int: Маска клеток.
+        """
+        return self.pieces.get((side, figure_type), 0)
+
+    def occupied(self):
+        """Возвращает маску всех занятых клеток."""
+        return self.occupancy['white'] | self.occupancy['black']
+
+    def sliding_attacks(self, square, ray_masks, occupied):
+        """Считает клетки, которые бьет дальнобойная фигура с учетом блокирующих фигур.
+
+        Args:
+            square (int): Клетка фигуры.
+            ray_masks (tuple): Таблица масок лучей (например, ROOK_RAY_MASKS).
+            occupied (int): Маска занятых клеток.
+
+        Returns:
+            int: Маска атакуемых клеток (первая блокирующая фигура на луче включается).
+        """
+        attacks = 0
+        for ray_mask, ascending in ray_masks[square]:
+            blockers = ray_mask & occupied
+            if blockers:
+                if ascending:
+                    blocker = blockers & -blockers
+                    ray_mask &= (blocker << 1) - 1
+                else:
+                    blocker = 1 << (blockers.bit_length() - 1)
+                    ray_mask &= ~(blocker - 1)
+            attacks |= ray_mask
+        return attacks
+
+    def is_attacked(self, square, by_side):
+        """Проверяет, бьет ли сторона клетку (обратный поиск по маскам, как ChessBoard.is_square_attacked).
+
+        Дальнобойные фигуры ищутся лучами от самой клетки: фигура бьет клетку, если она
+        первая занятая клетка своего луча. Конь и Прыгун не бьют клетки со своими фигурами.
+
+        Args:
+            square (int): Номер клетки row * 8 + col.
+            by_side (str): Атакующая сторона ('white' или 'black').
+
+        Returns:
+            bool: True, если клетку бьет хотя бы одна фигура стороны.
+        """
+        pieces = self.pieces
+        if PAWN_ATTACKER_MASKS[by_side][square] & pieces.get((by_side, Pawn), 0):
+            return True
+        if KING_MASKS[square] & pieces.get((by_side, King), 0):
+            return True
+        if not self.occupancy[by_side] >> square & 1:
+            if NIGHT_MASKS[square] & pieces.get((by_side, Night), 0):
+                return True
+            if JUMPMAN_ATTACKER_MASKS[square] & pieces.get((by_side, Jumpman), 0):
+                return True
+
+        occupied = self.occupancy['white'] | self.occupancy['black']
+        queens = pieces.get((by_side, Queen), 0)
+        rooks = pieces.get((by_side, Rook), 0) | queens
+        if rooks and self.sliding_attacks(square, ROOK_RAY_MASKS, occupied) & rooks:
+            return True
+        lite_rooks = pieces.get((by_side, LiteRook), 0)
+        if lite_rooks and self.sliding_attacks(square, LITE_ROOK_RAY_MASKS, occupied) & lite_rooks:
+            return True
+        bishops = pieces.get((by_side, Bishop), 0) | queens
+        return bool(bishops and self.sliding_attacks(square, BISHOP_RAY_MASKS, occupied) & bishops)
+
+    def check_info(self, square, side):
+        """Находит шахи и связки короля стороны на клетке square по маскам (как ChessBoard.check_info).
+
+        Args:
+            square (int): Клетка короля row * 8 + col.
+            side (str): Сторона короля ('white' или 'black').
+
+        Returns:
+            tuple: Кортеж (checks, pins) в формате ChessBoard.check_info: список множеств клеток,
+            снимающих каждый шах, и словарь {клетка связанной фигуры: множество клеток линии связки}.
+        """
+        enemy_side = 'black' if side == 'white' else 'white'
+        pieces = self.pieces
+        own = self.occupancy[side]
+        enemy = self.occupancy[enemy_side]
+        occupied = own | enemy
+        checks = []
+        pins = {}
+
+        leapers = ((PAWN_ATTACKER_MASKS[enemy_side][square] & pieces.get((enemy_side, Pawn), 0))
+                   | (KING_MASKS[square] & pieces.get((enemy_side, King), 0))
+                   | (NIGHT_MASKS[square] & pieces.get((enemy_side, Night), 0))
+                   | (JUMPMAN_ATTACKER_MASKS[square] & pieces.get((enemy_side, Jumpman), 0)))
+        for attacker in iter_bits(leapers):
+            checks.append({(attacker >> 3, attacker & 7)})
+
+        queens = pieces.get((enemy_side, Queen), 0)
+        lite_rooks = pieces.get((enemy_side, LiteRook), 0)
+        for ray_masks, sliders in ((ROOK_RAY_MASKS, pieces.get((enemy_side, Rook), 0) | queens),
+                                   (BISHOP_RAY_MASKS, pieces.get((enemy_side, Bishop), 0) | queens)):
+            line_lite_rooks = lite_rooks if ray_masks is ROOK_RAY_MASKS else 0
+            attackers = sliders | line_lite_rooks
+            if not attackers:
+                continue
+            for ray_mask, ascending in ray_masks[square]:
+                # Шах или связка возможны только на луче, где есть дальнобойная фигура противника
+                if not ray_mask & attackers:
+                    continue
+                blockers = ray_mask & occupied
+                first = blockers & -blockers if ascending else 1 << (blockers.bit_length() - 1)
+                pinned = 0
+                if first & own:
+                    blockers ^= first
+                    if not blockers:
+                        continue
+                    pinned = first
+                    first = blockers & -blockers if ascending else 1 << (blockers.bit_length() - 1)
+                # Клетки луча от короля до фигуры включительно
+                line = ray_mask & ((first << 1) - 1) if ascending else ray_mask & ~(first - 1)
+                # Лайт-ладья бьет вдоль линии не дальше 2 клеток
+                if not (first & sliders or (first & line_lite_rooks and bin(line).count('1') <= 2)):
+                    continue
+                if pinned:
+                    pinned_square = pinned.bit_length() - 1
+                    pins[(pinned_square >> 3, pinned_square & 7)] = mask_cells(line & ~pinned)
+                else:
+                    checks.append(mask_cells(line))
+        return checks, pins
+
+    def pawn_attacks(self, side):
+        """Возвращает клетки, которые бьют пешки указанной стороны.
+
+        Args:
+            side (str): Сторона ('white' или 'black').
+
+        Returns:
+            int: Маска атакуемых клеток.
+        """
+        pawns = self.get_pieces(side, Pawn)
+        direction = -1 if side == 'white' else 1
+        return shift(pawns, direction, -1) | shift(pawns, direction, 1)
+
+    def king_jumps(self, square, enemy, occupied):
+        """Возвращает фигуры противника, которые может перепрыгнуть дамка с клетки square.
+
+        Args:
+            square (int): Клетка дамки.
+            enemy (int): Маска фигур противника.
+            occupied (int): Маска занятых клеток.
+
+        Returns:
+            int: Маска перепрыгиваемых фигур противника.
+        """
+        targets = 0
+        for ray_mask, ascending in KING_CHECKERS_RAY_MASKS[square]:
+            blockers = ray_mask & occupied
+            if not blockers:
+                continue
+            blocker = blockers & -blockers if ascending else 1 << (blockers.bit_length() - 1)
+            if not blocker & enemy:
+                continue
+            # Клетка за первой фигурой на луче должна быть свободна
+            after = ray_mask & ~((blocker << 1) - 1) if ascending else ray_mask & (blocker - 1)
+            if after:
+                next_square = after & -after if ascending else 1 << (after.bit_length() - 1)
+                if not next_square & occupied:
+                    targets |= blocker
+        return targets
+
+    def can_jump(self, square):
+        """Проверяет, может ли шашка или дамка на клетке square взять фигуру противника.
+
+        Args:
+            square (int): Клетка шашки или дамки.
+
+        Returns:
+            bool: True, если у фигуры есть прыжок со взятием.
+        """
+        figure = self.squares[square]
+        enemy = self.occupancy['black' if figure.side == 'white' else 'white']
+        occupied = self.occupancy['white'] | self.occupancy['black']
+        if isinstance(figure, KingCheckers):
+            return bool(self.king_jumps(square, enemy, occupied))
+        for middle, landing in CHECKERS_JUMP_MASKS[square]:
+            if middle & enemy and not landing & occupied:
+                return True
+        return False
+
+    def checkers_men_moves(self, side):
+        """Возвращает ходы и одиночные прыжки всех шашек стороны (без дамок), посчитанные сдвигами масок.
+
+        Шашка ходит на свободную клетку по диагонали вперед и бьет в любую из четырех
+        диагоналей соседнюю фигуру противника, если клетка за ней свободна.
+
+        Args:
+            side (str): Сторона ('white' или 'black').
+
+        Returns:
+            tuple: Кортеж (ходы, маска): список кортежей (start_row, start_col, end_row, end_col)
+            и маска шашек, у которых есть взятие.
+        """
+        men = self.pieces.get((side, PawnCheckers), 0)
+        enemy = self.occupancy['black' if side == 'white' else 'white']
+        empty = ~(self.occupancy['white'] | self.occupancy['black']) & FULL_MASK
+        forward = -1 if side == 'white' else 1
+        moves = []
+        jumpers = 0
+        for d_col in (-1, 1):
+            offset = forward * 8 + d_col
+            for target in iter_bits(shift(men, forward, d_col) & empty):
+                start = target - offset
+                moves.append((start >> 3, start & 7, target >> 3, target & 7))
+        for d_row in (-1, 1):
+            for d_col in (-1, 1):
+                offset = 2 * (d_row * 8 + d_col)
+                for target in iter_bits(shift(shift(men, d_row, d_col) & enemy, d_row, d_col) & empty):
+                    start = target - offset
+                    moves.append((start >> 3, start & 7, target >> 3, target & 7))
+                    jumpers |= 1 << start
+        return moves, jumpers
+
+    def checkers_jumps(self, side):
+        """Возвращает фигуры противника, которые могут быть взяты шашками и дамками стороны.
+
+        Args:
+            side (str): Сторона ('white' или 'black').
+
+        Returns:
+            int: Маска взятых (перепрыгиваемых) фигур противника.
+        """
+        enemy = self.occupancy['black' if side == 'white' else 'white']
+        occupied = self.occupied()
+        empty = ~occupied & FULL_MASK
+        men = self.get_pieces(side, PawnCheckers)
+        targets = 0
+        for d_row in (-1, 1):
+            for d_col in (-1, 1):
+                # Шашка бьет соседнюю фигуру противника, если клетка за ней пуста
+                targets |= shift(men, d_row, d_col) & enemy & shift(empty, -d_row, -d_col)
+        for square in iter_bits(self.get_pieces(side, KingCheckers)):
+            targets |= self.king_jumps(square, enemy, occupied)
+        return targets
+
+    def attack_mask(self, side):
+        """Возвращает все клетки, которые бьют фигуры указанной стороны.
+
+        Оборотень ничего не бьет; для шашек учитываются фигуры противника, которые можно взять.
+
+        Args:
+            side (str): Сторона ('white' или 'black').
+
+        Returns:
+            int: Маска атакуемых клеток.
+        """
+        occupied = self.occupied()
+        attacks = self.pawn_attacks(side)
+        for square in iter_bits(self.get_pieces(side, King)):
+            attacks |= KING_MASKS[square]
+        for square in iter_bits(self.get_pieces(side, Night)):
+            attacks |= NIGHT_MASKS[square]
+        for square in iter_bits(self.get_pieces(side, Jumpman)):
+            attacks |= JUMPMAN_MASKS[square]
+        for square in iter_bits(self.get_pieces(side, Bishop) | self.get_pieces(side, Queen)):
+            attacks |= self.sliding_attacks(square, BISHOP_RAY_MASKS, occupied)
+        for square in iter_bits(self.get_pieces(side, Rook) | self.get_pieces(side, Queen)):
+            attacks |= self.sliding_attacks(square, ROOK_RAY_MASKS, occupied)
+        for square in iter_bits(self.get_pieces(side, LiteRook)):
+            attacks |= self.sliding_attacks(square, LITE_ROOK_RAY_MASKS, occupied)
+        attacks |= self.checkers_jumps(side)
+        return attacks
+
+    def capture_mask(self, side):
+        """Возвращает фигуры противника, находящиеся под боем фигур указанной стороны.
+
+        Args:
+            side (str): Сторона ('white' или 'black').
+
+        Returns:
+            int: Маска фигур противника под боем.
+        """
+        return self.attack_mask(side) & self.occupancy['black' if side == 'white' else 'white']
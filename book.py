@@ -0,0 +1,213 @@
+import argparse
+import mmap
+import struct
+from collections import namedtuple
+
+from main_game import GAMES, MOVE_MADE
+from records import parse_move, read_records, record_moves
+
+# Файл книги: заголовок (сигнатура, число записей) и записи фиксированной длины,
+# отсортированные по ключу позиции. Запись: ключ Зобриста, лучший ход (номера клеток
+# row * 8 + col, дополненные MOVE_END), оценка лучшего хода с точки зрения ходящего
+# (от -1000 до 1000), число партий через позицию и их итоги
+BOOK_MAGIC = b'OBK1'
+HEADER_STRUCT = struct.Struct('<4sI')
+ENTRY_STRUCT = struct.Struct('<Q16shIIII')
+KEY_STRUCT = struct.Struct('<Q')
+MOVE_END = 0xFF
+MAX_MOVE_SQUARES = 16
+
+BookEntry = namedtuple('BookEntry', ['key', 'move', 'score', 'games', 'white_wins', 'black_wins', 'draws'])
+
+
+def encode_book_move(move):
+    """Кодирует ход в поле записи книги.
+
+    Args:
+        move (tuple): Кортеж координат (row, col, row1, col1, ...).
+
+    Returns:
+        bytes: MAX_MOVE_SQUARES байт с номерами клеток, дополненные MOVE_END.
+    """
+    squares = bytes(move[i] * 8 + move[i + 1] for i in range(0, len(move), 2))
+    return squares.ljust(MAX_MOVE_SQUARES, bytes((MOVE_END,)))
+
+def decode_book_move(data):
+    """Переводит поле записи книги обратно в ход.
+
+    Args:
+        data (bytes): Поле хода.
+
+    Returns:
+        tuple: Кортеж координат (row, col, row1, col1, ...).
+    """
+    move = []
+    for square in data:
+        if square == MOVE_END:
+            break
+        move.extend(divmod(square, 8))
+    return tuple(move)
+
+def collect_statistics(game_name, records, max_plies=20):
+    """Собирает статистику ходов в позициях начала партий.
+
+    Ходы каждой партии разбираются так же, как в validator.py (records.record_moves и
+    parse_move), и проверяются в тихом режиме; испорченная запись пропускается, а партия
+    обрывается на первом неразборчивом или недопустимом ходе.
+
+    Args:
+        game_name (str): 'chess' или 'checkers'.
+        records (iterable): Записи партий (records.read_records).
+        max_plies (int): Сколько первых полуходов партии учитывать.
+
+    Returns:
+        dict: {ключ позиции: (сторона, чей ход, {ход: [партии, победы белых, победы черных, ничьи]})}.
+    """
+    statistics = {}
+    results = {'white': 1, 'black': 2, 'draw': 3}
+    for record in records:
+        if not isinstance(record, dict) or record.get('game') != game_name or record.get('winner') not in results:
+            continue
+        try:
+            texts = record_moves(record)
+        except ValueError:
+            continue
+        result_index = results[record['winner']]
+        game = GAMES[game_name](quiet=True)
+        for text in texts[:max_plies]:
+            try:
+                move = parse_move(text, game_name)
+            except ValueError:
+                break
+            key, side = game.position_key(), game.white_turn_active
+            if game.try_move(*move).status != MOVE_MADE:
+                break
+            game.white_turn_active = 'black' if side == 'white' else 'white'
+            counts = statistics.setdefault(key, (side, {}))[1].setdefault(move, [0, 0, 0, 0])
+            counts[0] += 1
+            counts[result_index] += 1
+    return statistics
+
+def build_book(game_name, records, path, max_plies=20, min_games=1):
+    """Строит файл книги дебютов из записей партий.
+
+    Лучшим ходом позиции считается самый частый ход (при равенстве - с лучшим результатом).
+
+    Args:
+        game_name (str): 'chess' или 'checkers'.
+        records (iterable): Записи партий.
+        path (str): Путь к файлу книги.
+        max_plies (int): Сколько первых полуходов партии учитывать.
+        min_games (int): Минимальное число партий с лучшим ходом для записи позиции.
+
+    Returns:
+        int: Число записей в книге.
+    """
+    statistics = collect_statistics(game_name, records, max_plies)
+    entries = []
+    for key, (side, moves) in statistics.items():
+        totals = [sum(counts[i] for counts in moves.values()) for i in range(4)]
+        best_move = None
+        best_rank = None
+        for move, (games, white_wins, black_wins, draws) in moves.items():
+            if len(move) // 2 > MAX_MOVE_SQUARES:
+                continue
+            score = (white_wins - black_wins) * 1000 // games
+            if side == 'black':
+                score = -score
+            rank = (games, score)
+            if best_rank is None or rank > best_rank:
+                best_move, best_rank = move, rank
+        if best_move is None or best_rank[0] < min_games:
+            continue
+        entries.append((key, best_move, best_rank[1], totals))
+
+    entries.sort()
+    with open(path, 'wb') as stream:
+        stream.write(HEADER_STRUCT.pack(BOOK_MAGIC, len(entries)))
+        for key, move, score, (games, white_wins, black_wins, draws) in entries:
+            stream.write(ENTRY_STRUCT.pack(key, encode_book_move(move), score, games, white_wins, black_wins, draws))
+    return len(entries)
+
+class OpeningBook:
+    """Книга дебютов, отображенная в память: поиск - двоичный поиск по ключу прямо в файле.
+
+    Файл не загружается целиком, а страницы отображения разделяются всеми процессами,
+    открывшими одну и ту же книгу.
+    """
+
+    def __init__(self, path):
+        """Открывает файл книги.
+
+        Args:
+            path (str): Путь к файлу книги.
+
+        Raises:
+            ValueError: Если файл не является книгой.
+        """
+        with open(path, 'rb') as stream:
+            self.data = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size = HEADER_STRUCT.unpack_from(self.data, 0)
+        if magic != BOOK_MAGIC or len(self.data) != HEADER_STRUCT.size + self.size * ENTRY_STRUCT.size:
+            self.data.close()
+            raise ValueError(f"Файл не является книгой дебютов: {path}")
+
+    def __len__(self):
+        """Возвращает число записей книги."""
+        return self.size
+
+    def close(self):
+        """Закрывает отображение файла."""
+        self.data.close()
+
+    def find(self, key):
+        """Ищет номер записи позиции двоичным поиском.
+
+        Args:
+            key (int): Ключ позиции (Game.position_key).
+
+        Returns:
+            int: Номер записи или -1, если позиции нет в книге.
+        """
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            middle_key = KEY_STRUCT.unpack_from(self.data, HEADER_STRUCT.size + middle * ENTRY_STRUCT.size)[0]
+            if middle_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.size and KEY_STRUCT.unpack_from(self.data, HEADER_STRUCT.size + low * ENTRY_STRUCT.size)[0] == key:
+            return low
+        return -1
+
+    def probe(self, key):
+        """Возвращает запись книги для позиции.
+
+        Args:
+            key (int): Ключ позиции (Game.position_key).
+
+        Returns:
+            BookEntry or None: Запись или None, если позиции нет в книге.
+        """
+        index = self.find(key)
+        if index < 0:
+            return None
+        key, move, score, games, white_wins, black_wins, draws = ENTRY_STRUCT.unpack_from(
+            self.data, HEADER_STRUCT.size + index * ENTRY_STRUCT.size)
+        return BookEntry(key, decode_book_move(move), score, games, white_wins, black_wins, draws)
+
+def main():
+    """Разбирает аргументы командной строки и строит книгу дебютов из записей партий."""
+    parser = argparse.ArgumentParser(description='Построение книги дебютов из записей партий')
+    parser.add_argument('game', choices=sorted(GAMES), help='игра')
+    parser.add_argument('records', help='файл записей партий (.jsonl или .jsonl.gz)')
+    parser.add_argument('output', help='файл книги')
+    parser.add_argument('--max-plies', type=int, default=20, help='сколько первых полуходов партии учитывать')
+    parser.add_argument('--min-games', type=int, default=1, help='минимальное число партий с лучшим ходом')
+    args = parser.parse_args()
+    count = build_book(args.game, read_records(args.records), args.output, args.max_plies, args.min_games)
+    print(f'Записей в книге: {count}')
+
+if __name__ == "__main__":
+    main()
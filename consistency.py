@@ -0,0 +1,141 @@
+import argparse
+import random
+
+from evaluation import evaluate_position
+from figure import WereWolf
+from main_game import ChessBoard, CheckersBoard
+from zobrist import compute_key
+
+BACKENDS = ('list', 'bitboard')
+
+
+def random_positions(game_class, games=60, plies=80, seed=0, backend='list'):
+    """Перебирает позиции случайных партий; часть ходов отменяется, чтобы проверить и unmake_move.
+
+    Args:
+        game_class (type): ChessBoard или CheckersBoard.
+        games (int): Число партий.
+        plies (int): Наибольшее число полуходов партии.
+        seed (int): Начальное зерно; партия i играется с зерном seed + i.
+        backend (str): Представление доски: 'list' или 'bitboard'.
+
+    Yields:
+        Game: Очередная позиция (один и тот же объект игры, измененный ходом).
+    """
+    for index in range(games):
+        rng = random.Random(seed + index)
+        game = game_class(backend=backend, quiet=True)
+        yield game
+        for _ in range(plies):
+            moves = game.generate_legal_moves(game.white_turn_active)
+            if not moves:
+                break
+            game.make_move(*rng.choice(moves))
+            yield game
+            if rng.random() < 0.2:
+                game.unmake_move()
+                yield game
+
+def attacked_squares(game, side):
+    """Возвращает клетки, которые бьет сторона, по определению Figure.get_attacks."""
+    squares = set()
+    for figure in game.pieces[side].values():
+        squares.update(figure.get_attacks())
+    return squares
+
+def legality_errors(game):
+    """Сверяет генератор допустимых ходов (шахи и связки без пробных ходов) с пробными ходами.
+
+    Эталон: каждый возможный ход фигуры делается через make_move, и ход допустим, если
+    после него клетку своего короля не бьет ни одна фигура соперника (Figure.get_attacks).
+
+    Args:
+        game (ChessBoard): Позиция.
+
+    Returns:
+        int: Число расхождений (лишние и пропущенные ходы, неверный признак шаха).
+    """
+    side = game.white_turn_active
+    enemy = 'black' if side == 'white' else 'white'
+    expected = set()
+    for (row, col), figure in list(game.pieces[side].items()):
+        for end_row, end_col in figure.get_actions():
+            target_figure = game.board[end_row][end_col]
+            if not isinstance(figure, WereWolf) and target_figure is not None and target_figure.side == side:
+                continue
+            game.make_move(row, col, end_row, end_col)
+            if game.find_king(side) not in attacked_squares(game, enemy):
+                expected.add((row, col, end_row, end_col))
+            game.unmake_move()
+    errors = len(expected.symmetric_difference(game.generate_legal_moves(side)))
+    in_check = game.find_king(side) in attacked_squares(game, enemy)
+    return errors + (game.king_in_check(side) != in_check)
+
+def zobrist_errors(game):
+    """Сверяет инкрементальный ключ Зобриста (set_figure, make_move/unmake_move) с пересчетом с нуля."""
+    return int(game.position_key() != compute_key(game))
+
+def evaluation_errors(game):
+    """Сверяет инкрементальную оценку Game.evaluation (в том числе у копии clone) с пересчетом с нуля."""
+    expected = evaluate_position(game)
+    return int(game.evaluation != expected) + int(game.clone().evaluation != expected)
+
+def attack_map_errors(game):
+    """Сверяет карты атак ChessBoard.attack_maps (обновляются в set_figure, в том числе у копии clone) с построением с нуля."""
+    errors = 0
+    for position in (game, game.clone()):
+        for side in ('white', 'black'):
+            errors += position.attack_maps[side] != position.build_attack_map(side)
+    return errors
+
+# Проверки: имя -> (функция числа расхождений в позиции, классы игр)
+CHECKS = {
+    'legality': (legality_errors, (ChessBoard,)),
+    'zobrist': (zobrist_errors, (ChessBoard, CheckersBoard)),
+    'evaluation': (evaluation_errors, (ChessBoard, CheckersBoard)),
+    'attack_maps': (attack_map_errors, (ChessBoard,)),
+}
+
+
+def run_check(name, games=60, plies=80, seed=0):
+    """Выполняет проверку на позициях случайных партий во всех представлениях доски.
+
+    Args:
+        name (str): Имя проверки из CHECKS.
+        games (int): Число партий на класс игры и представление доски.
+        plies (int): Наибольшее число полуходов партии.
+        seed (int): Начальное зерно.
+
+    Returns:
+        tuple: Кортеж (число позиций, число расхождений).
+    """
+    check, game_classes = CHECKS[name]
+    positions = errors = 0
+    for game_class in game_classes:
+        for backend in BACKENDS:
+            for game in random_positions(game_class, games, plies, seed, backend):
+                positions += 1
+                errors += check(game)
+    return positions, errors
+
+def main():
+    """Разбирает аргументы командной строки и выполняет проверки согласованности."""
+    parser = argparse.ArgumentParser(description='Сверка быстрых алгоритмов с медленными эталонами на случайных партиях')
+    parser.add_argument('checks', nargs='*', help=f"проверки: {', '.join(sorted(CHECKS))} (по умолчанию все)")
+    parser.add_argument('--games', type=int, default=60, help='число партий')
+    parser.add_argument('--plies', type=int, default=80, help='наибольшее число полуходов партии')
+    parser.add_argument('--seed', type=int, default=0, help='начальное зерно')
+    args = parser.parse_args()
+    for name in args.checks:
+        if name not in CHECKS:
+            parser.error(f'неизвестная проверка: {name}')
+
+    all_ok = True
+    for name in args.checks or sorted(CHECKS):
+        positions, errors = run_check(name, args.games, args.plies, args.seed)
+        print(f'{name}: позиций {positions}, расхождений {errors}')
+        all_ok = all_ok and not errors
+    raise SystemExit(0 if all_ok else 1)
+
+if __name__ == "__main__":
+    main()
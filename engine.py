@@ -0,0 +1,397 @@
+import time
+
+from figure import *
+from evaluation import PIECE_VALUES
+from zobrist import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+
+MATE_SCORE = 100000  # Оценка мата (уменьшается на число полуходов до него)
+MATE_THRESHOLD = MATE_SCORE - 1000  # Оценки выше этого порога означают мат
+INFINITY = 1000000
+MAX_PLY = 128  # Максимальная глубина дерева (с учетом форсированных вариантов)
+
+
+class SearchTimeout(Exception):
+    """Исключение для прерывания поиска по времени или числу узлов."""
+
+class SearchEngine:
+    """Базовый поиск negamax с альфа-бета отсечением, итеративным углублением и форсированным поиском.
+
+    Дочерние классы задают генерацию ходов, оценку позиции и признак взятия.
+    Поиск выполняется прямо на переданной игре через make_move/unmake_move,
+    после поиска позиция остается прежней.
+    """
+
+    def __init__(self, game, max_depth=64, time_limit=None, node_limit=None, tt_size=1 << 18, book=None,
+                 tablebase=None):
+        """Инициализирует движок.
+
+        Args:
+            game (Game): Игра, для которой ищется ход.
+            max_depth (int): Максимальная глубина итеративного углубления.
+            time_limit (float or None): Ограничение времени на ход в секундах.
+            node_limit (int or None): Ограничение числа узлов на ход.
+            tt_size (int): Размер таблицы транспозиций.
+            book (OpeningBook or None): Книга дебютов; ход из книги делается без поиска.
+            tablebase (Tablebase or None): Таблицы эндшпиля; позиции из них не просчитываются.
+        """
+        self.game = game
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.tt = TranspositionTable(tt_size)
+        self.book = book
+        self.tablebase = tablebase
+        self.killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        self.history = {}
+        self.nodes = 0
+        self.deadline = None
+        self.path_keys = []
+        self.best_score = None
+        self.elapsed = 0
+        self.info = []  # Итоги завершенных итераций: (глубина, оценка, ход, узлы, время)
+
+    def generate_moves(self):
+        """Возвращает допустимые ходы стороны, чей сейчас ход."""
+        return self.game.generate_legal_moves(self.game.white_turn_active)
+
+    def is_capture(self, move):
+        """Проверяет, является ли ход взятием (такие ходы смотрятся в форсированном поиске)."""
+        raise NotImplementedError
+
+    def capture_order(self, move):
+        """Возвращает приоритет взятия для сортировки (MVV-LVA: ценная жертва, дешевый нападающий)."""
+        raise NotImplementedError
+
+    def evaluate(self):
+        """Возвращает оценку позиции с точки зрения стороны, чей сейчас ход."""
+        raise NotImplementedError
+
+    def no_moves_score(self, ply):
+        """Возвращает оценку позиции без допустимых ходов."""
+        return -MATE_SCORE + ply
+
+    def endgame_score(self, ply):
+        """Возвращает оценку позиции по таблицам эндшпиля.
+
+        Args:
+            ply (int): Расстояние от корня в полуходах.
+
+        Returns:
+            int or None: Оценка (выигрыш за d полуходов оценивается как мат через d) или None,
+            если таблиц нет или позиции в них нет.
+        """
+        if self.tablebase is None:
+            return None
+        result = self.tablebase.probe(self.game)
+        if result is None:
+            return None
+        outcome, distance = result
+        if distance is None:
+            return 0
+        if outcome == 'win':
+            return MATE_SCORE - ply - distance
+        return -MATE_SCORE + ply + distance
+
+    def search(self):
+        """Ищет лучший ход итеративным углублением в пределах ограничений.
+
+        Returns:
+            tuple or None: Лучший ход или None, если ходов нет.
+        """
+        start = time.perf_counter()
+        self.deadline = start + self.time_limit if self.time_limit is not None else None
+        self.nodes = 0
+        self.info = []
+        self.tt.new_search()
+        self.history = {}
+        self.killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        self.path_keys = []
+
+        if self.book is not None:
+            book_move = self.game.book_move(self.book)
+            if book_move is not None:
+                self.best_score = None
+                self.elapsed = time.perf_counter() - start
+                return book_move
+        if self.tablebase is not None:
+            tablebase_move = self.tablebase.best_move(self.game)
+            if tablebase_move is not None:
+                self.best_score = self.endgame_score(0)
+                self.elapsed = time.perf_counter() - start
+                return tablebase_move
+
+        root_moves = self.generate_moves()
+        if not root_moves:
+            return None
+        best_move = root_moves[0]
+        self.best_score = None
+
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self.search_root(root_moves, depth, best_move)
+            except SearchTimeout:
+                break
+            best_move = move
+            self.best_score = score
+            self.info.append((depth, score, move, self.nodes, time.perf_counter() - start))
+            if abs(score) >= MATE_THRESHOLD:
+                break
+        self.elapsed = time.perf_counter() - start
+        return best_move
+
+    def search_root(self, root_moves, depth, previous_best):
+        """Выполняет одну итерацию поиска в корне.
+
+        Args:
+            root_moves (list): Допустимые ходы в корне.
+            depth (int): Глубина итерации.
+            previous_best (tuple): Лучший ход прошлой итерации (смотрится первым).
+
+        Returns:
+            tuple: Кортеж (оценка, лучший ход).
+        """
+        alpha, beta = -INFINITY, INFINITY
+        best_move = previous_best
+        self.path_keys.append(self.game.position_key())
+        try:
+            for move in self.order_moves(root_moves, previous_best, 0):
+                self.game.make_move(*move)
+                try:
+                    score = -self.negamax(depth - 1, -beta, -alpha, 1)
+                finally:
+                    self.game.unmake_move()
+                if score > alpha:
+                    alpha = score
+                    best_move = move
+        finally:
+            self.path_keys.pop()
+        self.tt.store(self.game.position_key(), depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def negamax(self, depth, alpha, beta, ply):
+        """Поиск negamax с альфа-бета отсечением.
+
+        Args:
+            depth (int): Оставшаяся глубина.
+            alpha (int): Нижняя граница.
+            beta (int): Верхняя граница.
+            ply (int): Расстояние от корня в полуходах.
+
+        Returns:
+            int: Оценка позиции с точки зрения стороны, чей ход.
+        """
+        if depth <= 0 or ply >= MAX_PLY:
+            return self.quiescence(alpha, beta, ply)
+        self.count_node()
+        key = self.game.position_key()
+        if key in self.path_keys:
+            return 0  # Повторение позиции считается ничьей
+        score = self.endgame_score(ply)
+        if score is not None:
+            return score
+
+        original_alpha = alpha
+        tt_move = None
+        entry = self.tt.probe(key)
+        if entry is not None:
+            tt_move = entry[4]
+            if entry[1] >= depth:
+                score = self.score_from_tt(entry[2], ply)
+                if entry[3] == EXACT:
+                    return score
+                if entry[3] == LOWER_BOUND and score >= beta:
+                    return score
+                if entry[3] == UPPER_BOUND and score <= alpha:
+                    return score
+
+        moves = self.generate_moves()
+        if not moves:
+            return self.no_moves_score(ply)
+
+        best_score = -INFINITY
+        best_move = None
+        self.path_keys.append(key)
+        try:
+            for move in self.order_moves(moves, tt_move, ply):
+                self.game.make_move(*move)
+                try:
+                    score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+                finally:
+                    self.game.unmake_move()
+                if score > best_score:
+                    best_score = score
+                    best_move = move
+                if score > alpha:
+                    alpha = score
+                if alpha >= beta:
+                    if not self.is_capture(move):
+                        self.store_killer(move, ply)
+                        self.history[move] = self.history.get(move, 0) + depth * depth
+                    break
+        finally:
+            self.path_keys.pop()
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.tt.store(key, depth, self.score_to_tt(best_score, ply), bound, best_move)
+        return best_score
+
+    def quiescence(self, alpha, beta, ply):
+        """Форсированный поиск: смотрятся только взятия, пока позиция не станет спокойной.
+
+        Args:
+            alpha (int): Нижняя граница.
+            beta (int): Верхняя граница.
+            ply (int): Расстояние от корня в полуходах.
+
+        Returns:
+            int: Оценка позиции.
+        """
+        self.count_node()
+        stand_pat = self.evaluate()
+        if stand_pat >= beta or ply >= MAX_PLY:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        captures = [move for move in self.generate_moves() if self.is_capture(move)]
+        captures.sort(key=self.capture_order, reverse=True)
+        for move in captures:
+            self.game.make_move(*move)
+            try:
+                score = -self.quiescence(-beta, -alpha, ply + 1)
+            finally:
+                self.game.unmake_move()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def order_moves(self, moves, tt_move, ply):
+        """Сортирует ходы: ход из таблицы транспозиций, взятия, ходы-убийцы, затем по истории.
+
+        Args:
+            moves (list): Ходы.
+            tt_move (tuple or None): Лучший ход из таблицы транспозиций.
+            ply (int): Расстояние от корня.
+
+        Returns:
+            list: Отсортированные ходы.
+        """
+        killers = self.killers[ply]
+
+        def move_priority(move):
+            if move == tt_move:
+                return 3000000
+            if self.is_capture(move):
+                return 2000000 + self.capture_order(move)
+            if move == killers[0]:
+                return 1000001
+            if move == killers[1]:
+                return 1000000
+            return self.history.get(move, 0)
+
+        return sorted(moves, key=move_priority, reverse=True)
+
+    def store_killer(self, move, ply):
+        """Запоминает тихий ход, вызвавший отсечение, как ход-убийцу для этой глубины."""
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+    def count_node(self):
+        """Считает узел и проверяет ограничения по узлам и времени.
+
+        Raises:
+            SearchTimeout: Если ограничение исчерпано.
+        """
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchTimeout()
+        if self.deadline is not None and self.nodes & 255 == 0 and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+
+    def score_to_tt(self, score, ply):
+        """Переводит оценку мата в расстояние от текущего узла для таблицы транспозиций."""
+        if score >= MATE_THRESHOLD:
+            return score + ply
+        if score <= -MATE_THRESHOLD:
+            return score - ply
+        return score
+
+    def score_from_tt(self, score, ply):
+        """Переводит оценку мата из таблицы транспозиций в расстояние от корня."""
+        if score >= MATE_THRESHOLD:
+            return score - ply
+        if score <= -MATE_THRESHOLD:
+            return score + ply
+        return score
+
+    def nodes_per_second(self):
+        """Возвращает скорость последнего поиска в узлах в секунду."""
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0
+
+class ChessEngine(SearchEngine):
+    """Движок для шахмат с новыми фигурами.
+
+    Превращения пешки и лайт-ладьи, прыжки Прыгуна и обмены Оборотня приходят
+    из generate_legal_moves и выполняются make_move, поэтому учитываются поиском.
+    """
+
+    def is_capture(self, move):
+        """Взятием считается ход на клетку с фигурой противника, а также превращение."""
+        figure = self.game.board[move[0]][move[1]]
+        target_figure = self.game.board[move[2]][move[3]]
+        if target_figure is not None and target_figure.side != figure.side:
+            return True
+        last_row = 0 if figure.side == 'white' else 7
+        return move[2] == last_row and isinstance(figure, (Pawn, LiteRook))
+
+    def capture_order(self, move):
+        """Приоритет взятия по схеме MVV-LVA (превращение ценится как взятие ферзя)."""
+        figure = self.game.board[move[0]][move[1]]
+        target_figure = self.game.board[move[2]][move[3]]
+        victim_value = PIECE_VALUES[type(target_figure)] if target_figure is not None else 0
+        if isinstance(figure, (Pawn, LiteRook)) and move[2] == (0 if figure.side == 'white' else 7):
+            victim_value += PIECE_VALUES[Queen]
+        return victim_value * 10 - PIECE_VALUES[type(figure)] // 10
+
+    def evaluate(self):
+        """Оценка по материалу и таблицам клеток (Game.evaluation) с точки зрения стороны, чей ход."""
+        score = self.game.evaluation
+        return score if self.game.white_turn_active == 'white' else -score
+
+    def no_moves_score(self, ply):
+        """Мат, если король под шахом, иначе пат (ничья)."""
+        if self.game.king_in_check(self.game.white_turn_active):
+            return -MATE_SCORE + ply
+        return 0
+
+class CheckersEngine(SearchEngine):
+    """Движок для шашек.
+
+    Ходы берутся из CheckersBoard.generate_legal_moves: простые ходы, одиночные прыжки
+    и серии взятий. Сторона без допустимых ходов (в том числе без шашек) проигрывает.
+    """
+
+    def is_capture(self, move):
+        """Взятием считается прыжок или серия прыжков."""
+        if len(move) > 4:
+            return True
+        figure = self.game.board[move[0]][move[1]]
+        return self.game.is_jump(figure, move[2], move[3])
+
+    def capture_order(self, move):
+        """Сначала смотрятся серии, снимающие больше фигур."""
+        return len(move) // 2 - 1
+
+    def evaluate(self):
+        """Оценка по материалу и продвижению шашек (Game.evaluation) с точки зрения стороны, чей ход."""
+        score = self.game.evaluation
+        return score if self.game.white_turn_active == 'white' else -score
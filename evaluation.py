@@ -0,0 +1,89 @@
+from figure import *
+
+# Ценность фигур в сантипешках
+PIECE_VALUES = {
+    King: 0,
+    Queen: 900,
+    Rook: 500,
+    LiteRook: 300,
+    Bishop: 330,
+    Night: 320,
+    Jumpman: 280,
+    WereWolf: 200,
+    Pawn: 100,
+    PawnCheckers: 100,
+    KingCheckers: 300,
+}
+
+CHECKERS_ADVANCE_BONUS = 5  # Бонус шашке за каждую пройденную к дамочному полю горизонталь
+
+
+def build_table(square_bonus):
+    """Строит таблицу бонусов по клеткам с точки зрения белых (строка 0 - дальний край для белых).
+
+    Args:
+        square_bonus (callable): Функция (row, col) -> бонус в сантипешках.
+
+    Returns:
+        tuple: Кортеж длины 64 (индекс row * 8 + col).
+    """
+    return tuple(square_bonus(row, col) for row in range(8) for col in range(8))
+
+def center_bonus(row, col):
+    """Близость клетки к центру: от 5 в центре до -1 в углу."""
+    return 6 - int(abs(row - 3.5) + abs(col - 3.5))
+
+# Таблицы клеток для белых; для черных строка отражается (row -> 7 - row)
+PIECE_SQUARE_TABLES = {
+    King: build_table(lambda row, col: (10 if row == 7 else -10 * (7 - row)) - 2 * center_bonus(row, col)),
+    Queen: build_table(lambda row, col: center_bonus(row, col)),
+    Rook: build_table(lambda row, col: 15 if row == 1 else 0),
+    LiteRook: build_table(lambda row, col: 2 * center_bonus(row, col) + (10 if row <= 1 else 0)),
+    Bishop: build_table(lambda row, col: 2 * center_bonus(row, col)),
+    Night: build_table(lambda row, col: 4 * center_bonus(row, col) - 5),
+    Jumpman: build_table(lambda row, col: 3 * center_bonus(row, col) - 5),
+    WereWolf: build_table(lambda row, col: 2 * center_bonus(row, col)),
+    Pawn: build_table(lambda row, col: 5 * (6 - row) + (5 if 2 <= col <= 5 and row <= 4 else 0)),
+    PawnCheckers: build_table(lambda row, col: CHECKERS_ADVANCE_BONUS * (7 - row)),
+    KingCheckers: build_table(lambda row, col: 2 * center_bonus(row, col)),
+}
+
+# Итоговый вклад фигуры на клетке в оценку с точки зрения белых (материал и бонус клетки)
+SQUARE_SCORES = {
+    figure_type: {
+        'white': tuple(PIECE_VALUES[figure_type] + table[square] for square in range(64)),
+        'black': tuple(-PIECE_VALUES[figure_type] - table[(7 - square // 8) * 8 + square % 8] for square in range(64)),
+    }
+    for figure_type, table in PIECE_SQUARE_TABLES.items()
+}
+
+
+def square_score(figure, row, col):
+    """Возвращает вклад фигуры на клетке в оценку позиции.
+
+    Args:
+        figure (Figure): Фигура.
+        row (int): Строка клетки.
+        col (int): Столбец клетки.
+
+    Returns:
+        int: Материал и бонус клетки со знаком плюс для белых и минус для черных.
+    """
+    return SQUARE_SCORES[type(figure)][figure.side][row * 8 + col]
+
+def evaluate_position(game):
+    """Вычисляет оценку позиции с нуля (для проверки инкрементальной Game.evaluation).
+
+    Args:
+        game (Game): Позиция.
+
+    Returns:
+        int: Оценка с точки зрения белых.
+    """
+    score = 0
+    for row in range(8):
+        for col in range(8):
+            figure = game.board[row][col]
+            if figure is not None:
+                score += square_score(figure, row, col)
+    return score
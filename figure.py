@@ -1,6 +1,70 @@
+def build_leaper_table(offsets):
+    """Строит для каждой из 64 клеток список клеток, достижимых одним прыжком.
+    
+    Args:
+        offsets (list): Список смещений (d_row, d_col).
+        
+    Returns:
+        tuple: Кортеж длины 64 (индекс клетки row * 8 + col) из кортежей (row, col) в пределах доски.
+    """
+    table = []
+    for square in range(64):
+        row, col = divmod(square, 8)
+        table.append(tuple((row + d_row, col + d_col) for d_row, d_col in offsets
+                           if 0 <= row + d_row < 8 and 0 <= col + d_col < 8))
+    return tuple(table)
+
+def build_ray_table(directions, limit=7):
+    """Строит для каждой из 64 клеток лучи дальнобойной фигуры.
+    
+    Args:
+        directions (list): Список направлений (d_row, d_col).
+        limit (int): Максимальная длина луча.
+        
+    Returns:
+        tuple: Кортеж длины 64 из кортежей лучей; луч - кортеж клеток (row, col) от ближней к дальней.
+    """
+    table = []
+    for square in range(64):
+        row, col = divmod(square, 8)
+        rays = []
+        for d_row, d_col in directions:
+            ray = []
+            for mul in range(1, limit + 1):
+                row2, col2 = row + d_row * mul, col + d_col * mul
+                if not (0 <= row2 < 8 and 0 <= col2 < 8):
+                    break
+                ray.append((row2, col2))
+            if ray:
+                rays.append(tuple(ray))
+        table.append(tuple(rays))
+    return tuple(table)
+
+# Таблицы ходов строятся один раз при импорте: get_actions только обходит их
+# (порядок направлений совпадает с прежними списками directions в классах фигур)
+KING_MOVES = build_leaper_table([(0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1), (1, 0), (-1, 0)])
+NIGHT_MOVES = build_leaper_table([(-1, 2), (-2, 1), (-2, -1), (-1, -2), (1, -2), (2, -1), (1, 2), (2, 1)])
+JUMPMAN_MOVES = build_leaper_table([(0, 2), (-2, 2), (-2, 0), (-2, -2), (0, -2), (2, -2), (2, 0)])
+WEREWOLF_MOVES = build_leaper_table([(0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)])
+BISHOP_RAYS = build_ray_table([(1, 1), (1, -1), (-1, -1), (-1, 1)])
+ROOK_RAYS = build_ray_table([(1, 0), (0, -1), (-1, 0), (0, 1)])
+QUEEN_RAYS = build_ray_table([(0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1), (1, 0), (-1, 0)])
+LITE_ROOK_RAYS = build_ray_table([(1, 0), (0, -1), (-1, 0), (0, 1)], limit=2)
+KING_CHECKERS_RAYS = build_ray_table([(-1, -1), (-1, 1), (1, -1), (1, 1)])
+
+# Обратные таблицы для проверки атаки клетки: откуда фигура стороны бьет данную клетку.
+# У Прыгуна нет хода (2, 2), поэтому его обратная таблица не совпадает с JUMPMAN_MOVES
+JUMPMAN_ATTACKERS = build_leaper_table([(0, -2), (2, -2), (2, 0), (2, 2), (0, 2), (-2, 2), (-2, 0)])
+PAWN_ATTACKERS = {
+    'white': build_leaper_table([(1, -1), (1, 1)]),
+    'black': build_leaper_table([(-1, -1), (-1, 1)]),
+}
+
 class Figure:
     """Базовый класс для всех шахматных фигур."""
     
+    __slots__ = ('side', 'board', 'row', 'col')  # Без __dict__: фигура занимает несколько слов памяти
+    
     def __init__(self, side, board, row, col):
         """Инициализирует фигуру с указанной стороной, доской и позицией.
         
@@ -26,7 +90,31 @@ class Figure:
             bool: True, если позиция в пределах доски, иначе False.
         """
         return 0 <= row < 8 and 0 <= col < 8
-    
+
+    def copy(self, board):
+        """Создает копию фигуры для другой доски без вызова __init__ (копируются только слоты).
+        
+        Args:
+            board (Board): Доска, к которой привязывается копия.
+            
+        Returns:
+            Figure: Копия фигуры.
+        """
+        figure = object.__new__(type(self))
+        figure.side = self.side
+        figure.board = board
+        figure.row = self.row
+        figure.col = self.col
+        return figure
+
+    def get_attacks(self):
+        """Возвращает клетки, которые фигура бьет (используется картами атак доски).
+
+        Returns:
+            list: Список кортежей (row, col) с атакуемыми клетками в пределах доски.
+        """
+        return self.get_actions()
+
     def __str__(self):
         """Возвращает строковое представление фигуры.
         
@@ -38,6 +126,8 @@ class Figure:
 class King(Figure):
     """Класс, представляющий короля в шахматах."""
     
+    __slots__ = ()
+    
     def __init__(self, side, board, row, col):
         """Инициализирует короля.
         
@@ -55,21 +145,13 @@ class King(Figure):
         Returns:
             list: Список кортежей (row, col) с доступными позициями.
         """
-        result = []
-        directions = [(0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1), (1, 0), (-1, 0)]
-        
-        for move_row, move_col in directions:
-            row2 = self.row + move_row
-            col2 = self.col + move_col
-            
-            if not self.is_valid_pos(row2, col2):
-                continue
-            result.append((row2, col2))
-        return result
+        return list(KING_MOVES[self.row * 8 + self.col])
     
 class Bishop(Figure):
     """Класс, представляющий слона в шахматах."""
     
+    __slots__ = ()
+    
     def __init__(self, side, board, row, col):
         """Инициализирует слона.
         
@@ -88,25 +170,20 @@ class Bishop(Figure):
             list: Список кортежей (row, col) с доступными позициями.
         """
         result = []
-        directions = [(1, 1), (1, -1), (-1, -1), (-1, 1)]
-        
-        for move_row, move_col in directions:
-            mul = 0
-            while True:
-                mul += 1
-                row2 = self.row + move_row * mul
-                col2 = self.col + move_col * mul
-                if not self.is_valid_pos(row2, col2):
-                    break
+        board = self.board.board
+        
+        for ray in BISHOP_RAYS[self.row * 8 + self.col]:
+            for row2, col2 in ray:
                 result.append((row2, col2))
-                
-                if self.board.get_figure(row2, col2) is not None:
+                if board[row2][col2] is not None:
                     break
         return result
                     
 class Rook(Figure):
     """Класс, представляющий ладью в шахматах."""
     
+    __slots__ = ()
+    
     def __init__(self, side, board, row, col):
         """Инициализирует ладью.
         
@@ -125,25 +202,20 @@ class Rook(Figure):
             list: Список кортежей (row, col) с доступными позициями.
         """
         result = []
-        directions = [(1, 0), (0, -1), (-1, 0), (0, 1)]
-        
-        for move_row, move_col in directions:
-            mul = 0
-            while True:
-                mul += 1
-                row2 = self.row + move_row * mul
-                col2 = self.col + move_col * mul
-                if not self.is_valid_pos(row2, col2):
-                    break
+        board = self.board.board
+        
+        for ray in ROOK_RAYS[self.row * 8 + self.col]:
+            for row2, col2 in ray:
                 result.append((row2, col2))
-                
-                if self.board.get_figure(row2, col2) is not None:
+                if board[row2][col2] is not None:
                     break
         return result
     
 class Night(Figure):
     """Класс, представляющий коня в шахматах."""
     
+    __slots__ = ()
+    
     def __init__(self, side, board, row, col):
         """Инициализирует коня.
         
@@ -162,19 +234,19 @@ class Night(Figure):
             list: Список кортежей (row, col) с доступными позициями.
         """
         result = []
-        directions = [(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-1, 2), (-2, 1)]
+        board = self.board.board
         
-        for move_row, move_col in directions:
-            row2 = self.row - move_row
-            col2 = self.col + move_col
-            target_figure = self.board.get_figure(row2, col2)
+        for row2, col2 in NIGHT_MOVES[self.row * 8 + self.col]:
+            target_figure = board[row2][col2]
             if target_figure is None or target_figure.side != self.side:
-                result.append((row2, col2))  
+                result.append((row2, col2))
         return result
     
 class Pawn(Figure):
     """Класс, представляющий пешку в шахматах."""
     
+    __slots__ = ('is_first_move',)
+    
     def __init__(self, side, board, row, col):
         """Инициализирует пешку.
         
@@ -194,31 +266,56 @@ class Pawn(Figure):
             list: Список кортежей (row, col) с доступными позициями.
         """
         result = []
-        if self.side == 'white':
-            self.direction = -1
-        else:
-            self.direction = 1
+        direction = -1 if self.side == 'white' else 1
         
-        row2 = self.row + self.direction
+        row2 = self.row + direction
         col2 = self.col
         if self.is_valid_pos(row2, col2) and self.board.get_figure(row2, col2) is None:
             result.append((row2, col2))
             
             if self.is_first_move:
-                row3 = self.row + self.direction * 2
+                row3 = self.row + direction * 2
                 col3 = self.col
                 if self.is_valid_pos(row3, col3) and self.board.get_figure(row3, col3) is None:
                     result.append((row3, col3))
         
         for diag_cell in [-1, 1]:
-            row2 = self.row + self.direction
+            row2 = self.row + direction
             col2 = self.col + diag_cell   
             if self.is_valid_pos(row2, col2):
                 figure = self.board.get_figure(row2, col2)
                 if figure is not None and figure.side != self.side:
                     result.append((row2, col2))
         return result
+
+    def get_attacks(self):
+        """Возвращает клетки, которые бьет пешка (обе диагонали вперед, независимо от их занятости).
+
+        Returns:
+            list: Список кортежей (row, col) с атакуемыми клетками.
+        """
+        direction = -1 if self.side == 'white' else 1
+        result = []
+        for diag_cell in [-1, 1]:
+            row2 = self.row + direction
+            col2 = self.col + diag_cell
+            if self.is_valid_pos(row2, col2):
+                result.append((row2, col2))
+        return result
+
+    def copy(self, board):
+        """Создает копию пешки для другой доски, сохраняя флаг первого хода.
         
+        Args:
+            board (Board): Доска, к которой привязывается копия.
+            
+        Returns:
+            Pawn: Копия пешки.
+        """
+        figure = Figure.copy(self, board)
+        figure.is_first_move = self.is_first_move
+        return figure
+
     def pawn_move(self, row, col):
         """Перемещает пешку на новую позицию и сбрасывает флаг первого хода.
         
@@ -233,6 +330,8 @@ class Pawn(Figure):
 class Queen(Figure):
     """Класс, представляющий ферзя в шахматах."""
     
+    __slots__ = ()
+    
     def __init__(self, side, board, row, col):
         """Инициализирует ферзя.
         
@@ -251,25 +350,20 @@ class Queen(Figure):
             list: Список кортежей (row, col) с доступными позициями.
         """
         result = []
-        directions = [(0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1), (1, 0), (-1, 0)]
-        
-        for move_row, move_col in directions:
-            mul = 0
-            while True:
-                mul += 1
-                row2 = self.row + move_row * mul
-                col2 = self.col + move_col * mul
-                if not self.is_valid_pos(row2, col2):
-                    break
+        board = self.board.board
+        
+        for ray in QUEEN_RAYS[self.row * 8 + self.col]:
+            for row2, col2 in ray:
                 result.append((row2, col2))
-                
-                if self.board.get_figure(row2, col2) is not None:
+                if board[row2][col2] is not None:
                     break
         return result
     
 class LiteRook(Figure):
     """Класс, представляющий лайт-ладью (облегченную ладью) с ходом максимум на 2 клетки."""
     
+    __slots__ = ()
+    
     def __init__(self, side, board, row, col):
         """Инициализирует облегченную ладью.
         
@@ -288,25 +382,20 @@ class LiteRook(Figure):
             list: Список кортежей (row, col) с доступными позициями (до 2 клеток).
         """
         result = []
-        directions = [(1, 0), (0, -1), (-1, 0), (0, 1)]
-        
-        for move_row, move_col in directions:
-            mul = 0
-            while True:
-                mul += 1
-                row2 = self.row + move_row * mul
-                col2 = self.col + move_col * mul
-                if not self.is_valid_pos(row2, col2):
-                    break
+        board = self.board.board
+        
+        for ray in LITE_ROOK_RAYS[self.row * 8 + self.col]:
+            for row2, col2 in ray:
                 result.append((row2, col2))
-                
-                if self.board.get_figure(row2, col2) is not None or mul >= 2:
+                if board[row2][col2] is not None:
                     break
         return result
     
 class Jumpman(Figure):
     """Класс, представляющий фигуру 'Прыгун', которая прыгает на 2 клетки в любую сторону."""
     
+    __slots__ = ()
+    
     def __init__(self, side, board, row, col):
         """Инициализирует Прыгуна.
         
@@ -325,19 +414,19 @@ class Jumpman(Figure):
             list: Список кортежей (row, col) с доступными позициями.
         """
         result = []
-        directions = [(0, 2), (2, 2), (2, 0), (2, -2), (0, -2), (-2, -2), (-2, 0)]
+        board = self.board.board
         
-        for move_row, move_col in directions:
-            row2 = self.row - move_row
-            col2 = self.col + move_col
-            target_figure = self.board.get_figure(row2, col2)
+        for row2, col2 in JUMPMAN_MOVES[self.row * 8 + self.col]:
+            target_figure = board[row2][col2]
             if target_figure is None or target_figure.side != self.side:
-                result.append((row2, col2))  
+                result.append((row2, col2))
         return result
 
 class WereWolf(Figure):
     """Класс, представляющий Оборотня, который меняется местами с соседней фигурой своей стороны."""
     
+    __slots__ = ()
+    
     def __init__(self, side, board, row, col):
         """Инициализирует Оборотня.
         
@@ -356,20 +445,22 @@ class WereWolf(Figure):
             list: Список кортежей (row, col) с доступными позициями.
         """
         result = []
-        directions = [(0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)]
+        board = self.board.board
         
-        for move_row, move_col in directions:
-            row2 = self.row + move_row  # Исправлено: было '=' вместо '+'
-            col2 = self.col + move_col  # Исправлено: было '=' вместо '+'
-        
-            if not self.is_valid_pos(row2, col2):
-                continue
-            
-            target_figure = self.board.get_figure(row2, col2)
+        for row2, col2 in WEREWOLF_MOVES[self.row * 8 + self.col]:
+            target_figure = board[row2][col2]
             if target_figure is not None and target_figure.side == self.side:
                 result.append((row2, col2))
         return result
-    
+
+    def get_attacks(self):
+        """Оборотень не бьет фигуры, а только меняется местами со своими.
+
+        Returns:
+            list: Пустой список.
+        """
+        return []
+
     def swap(self, row, col):
         """Меняет местами Оборотня с фигурой на указанной позиции.
         
@@ -398,6 +489,8 @@ class WereWolf(Figure):
 class PawnCheckers(Figure):
     """Класс, представляющий шашку в игре шашки."""
     
+    __slots__ = ()
+    
     def __init__(self, side, board, row, col):
         """Инициализирует шашку.
         
@@ -461,6 +554,8 @@ class PawnCheckers(Figure):
 class KingCheckers(Figure):
     """Класс, представляющий дамку в игре шашки."""
     
+    __slots__ = ()
+    
     def __init__(self, side, board, row, col):
         """Инициализирует дамку.
         
@@ -479,17 +574,11 @@ class KingCheckers(Figure):
             list: Список кортежей (row, col) с доступными позициями.
         """
         result = []
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-        for move_row, move_col in directions:
-            mul = 1
+        board = self.board.board
+        for ray in KING_CHECKERS_RAYS[self.row * 8 + self.col]:
             found_enemy = False
-            while True:
-                row2 = self.row + move_row * mul
-                col2 = self.col + move_col * mul
-                if not self.is_valid_pos(row2, col2):
-                    break
-                
-                figure_step = self.board.get_figure(row2, col2)
+            for row2, col2 in ray:
+                figure_step = board[row2][col2]
                 if figure_step is None:
                     if not found_enemy:
                         result.append((row2, col2))
@@ -504,5 +593,95 @@ class KingCheckers(Figure):
                             break
                         else:
                             found_enemy = True
-                mul += 1    
-        return result 
\ No newline at end of file
+        return result
+
+def build_line_table():
+    """Строит для каждой клетки линии, по которым дальнобойные фигуры бьют сквозь нее.
+    
+    Returns:
+        tuple: Кортеж длины 64 из кортежей (луч назад, луч вперед, типы фигур, ходит ли лайт-ладья)
+        по каждому направлению: на луче назад ищется фигура, которая бьет клетку, а клетки луча
+        вперед она бьет, только пока клетка пуста.
+    """
+    directions = [((1, 0), (Rook, Queen), True), ((0, -1), (Rook, Queen), True),
+                  ((-1, 0), (Rook, Queen), True), ((0, 1), (Rook, Queen), True),
+                  ((1, 1), (Bishop, Queen), False), ((1, -1), (Bishop, Queen), False),
+                  ((-1, -1), (Bishop, Queen), False), ((-1, 1), (Bishop, Queen), False)]
+    table = [[] for _ in range(64)]
+    for (d_row, d_col), slider_types, lite_rook in directions:
+        forward_rays = build_ray_table([(d_row, d_col)])
+        back_rays = build_ray_table([(-d_row, -d_col)])
+        for square in range(64):
+            if forward_rays[square] and back_rays[square]:
+                table[square].append((back_rays[square][0], forward_rays[square][0], slider_types, lite_rook))
+    return tuple(tuple(lines) for lines in table)
+
+ATTACK_LINES = build_line_table()
+
+# Все классы фигур обеих игр (порядок задает номер типа фигуры для битбордов)
+FIGURE_TYPES = (King, Queen, Rook, Bishop, Night, Pawn, LiteRook, Jumpman, WereWolf, PawnCheckers, KingCheckers)
+
+# Компактные коды фигур (5 бит): 0 - пустая клетка, 1 + номер типа * 2 + (1 для черных) - фигура,
+# PAWN_FIRST_MOVE_CODE + (1 для черных) - пешка, еще не делавшая первый ход
+EMPTY_CODE = 0
+PAWN_FIRST_MOVE_CODE = 1 + len(FIGURE_TYPES) * 2
+FIGURE_CODES = {figure_type: 1 + index * 2 for index, figure_type in enumerate(FIGURE_TYPES)}
+CODE_TYPES = (None,) + tuple(figure_type for figure_type in FIGURE_TYPES for _ in range(2)) + (Pawn, Pawn)
+
+def encode_figure(figure):
+    """Кодирует фигуру небольшим целым числом (без позиции и ссылки на доску).
+    
+    Args:
+        figure (Figure or None): Фигура или None для пустой клетки.
+        
+    Returns:
+        int: Код от 0 до 24.
+    """
+    if figure is None:
+        return EMPTY_CODE
+    black = figure.side == 'black'
+    if type(figure) is Pawn and figure.is_first_move:
+        return PAWN_FIRST_MOVE_CODE + black
+    return FIGURE_CODES[type(figure)] + black
+
+def decode_figure(code, board, row, col):
+    """Создает фигуру по коду.
+    
+    Args:
+        code (int): Код, полученный от encode_figure.
+        board (Board): Доска, к которой привязывается фигура.
+        row (int): Номер строки.
+        col (int): Номер столбца.
+        
+    Returns:
+        Figure or None: Фигура или None для пустой клетки.
+    """
+    if code == EMPTY_CODE:
+        return None
+    figure = CODE_TYPES[code]('black' if (code - 1) % 2 else 'white', board, row, col)
+    if type(figure) is Pawn:
+        figure.is_first_move = code >= PAWN_FIRST_MOVE_CODE
+    return figure
+
+def pack_board(board):
+    """Упаковывает расстановку в 64 байта (по коду фигуры на клетку).
+    
+    Args:
+        board (Board): Доска (Game), расстановка читается из board.board.
+        
+    Returns:
+        bytes: 64 байта, индекс - row * 8 + col.
+    """
+    grid = board.board
+    return bytes(encode_figure(grid[row][col]) for row in range(8) for col in range(8))
+
+def unpack_board(data, board):
+    """Расставляет на доске фигуры из 64 байт pack_board (через set_figure, с обновлением ключа позиции).
+    
+    Args:
+        data (bytes): Упакованная расстановка.
+        board (Board): Доска (Game), на которую ставятся фигуры.
+    """
+    for square, code in enumerate(data):
+        row, col = divmod(square, 8)
+        board.set_figure(row, col, decode_figure(code, board, row, col))
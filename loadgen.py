@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import random
+import time
+
+
+class LoadClient:
+    """Клиент нагрузки: играет случайными ходами в одной партии за другой и замеряет задержки."""
+
+    def __init__(self, reader, writer, game_name, rng, engine_every, latencies):
+        """Инициализирует клиента.
+
+        Args:
+            reader (asyncio.StreamReader): Поток ответов сервера.
+            writer (asyncio.StreamWriter): Поток команд серверу.
+            game_name (str): 'chess' или 'checkers'.
+            rng (random.Random): Генератор случайных чисел.
+            engine_every (int): Каждый engine_every-й ход делает движок сервера (0 - никогда).
+            latencies (list): Общий список задержек ходов в секундах.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.game_name = game_name
+        self.rng = rng
+        self.engine_every = engine_every
+        self.latencies = latencies
+        self.moves = 0
+        self.requests = 0
+        self.errors = 0
+
+    async def request(self, line):
+        """Отправляет команду и возвращает ответ без 'OK'.
+
+        Raises:
+            RuntimeError: Если сервер ответил ошибкой.
+        """
+        self.writer.write((line + '\n').encode())
+        await self.writer.drain()
+        answer = (await self.reader.readline()).decode().strip()
+        self.requests += 1
+        if not answer.startswith('OK'):
+            raise RuntimeError(answer or 'connection_closed')
+        return answer[3:]
+
+    async def play_move(self, session_id):
+        """Делает один ход и возвращает, продолжается ли партия."""
+        if self.engine_every and (self.moves + 1) % self.engine_every == 0:
+            command = f'ENGINE {session_id} 1'
+        else:
+            moves = (await self.request(f'MOVES {session_id}')).split()
+            if not moves:
+                return False
+            command = f'MOVE {session_id} {self.rng.choice(moves)}'
+        start = time.perf_counter()
+        answer = await self.request(command)
+        self.latencies.append(time.perf_counter() - start)
+        self.moves += 1
+        return 'over' not in answer.split()
+
+    async def run(self, deadline, max_plies):
+        """Играет партии до момента deadline (по time.perf_counter)."""
+        while time.perf_counter() < deadline:
+            session_id = await self.request(f'NEW {self.game_name}')
+            plies = 0
+            try:
+                while plies < max_plies and time.perf_counter() < deadline and await self.play_move(session_id):
+                    plies += 1
+            except RuntimeError:
+                self.errors += 1
+            await self.request(f'CLOSE {session_id}')
+
+def percentile(values, fraction):
+    """Возвращает перцентиль отсортированного списка (fraction от 0 до 1)."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+async def run_load(clients=100, seconds=10.0, game_name='chess', host='127.0.0.1', port=8765, unix_path=None,
+                   engine_every=0, max_plies=200, seed=0):
+    """Запускает клиентов нагрузки и собирает статистику.
+
+    Args:
+        clients (int): Число одновременных соединений (у каждого своя партия).
+        seconds (float): Длительность нагрузки.
+        game_name (str): 'chess' или 'checkers'.
+        host (str): Адрес сервера.
+        port (int): Порт сервера.
+        unix_path (str or None): Путь Unix-сокета (вместо TCP).
+        engine_every (int): Каждый engine_every-й ход клиента делает движок сервера (0 - никогда).
+        max_plies (int): Предел полуходов партии, после которого начинается новая.
+        seed (int): Начальное зерно; клиент i играет с зерном seed + i.
+
+    Returns:
+        dict: Число ходов, запросов и ошибок, ходов в секунду и задержки хода (p50, p99, max) в мс.
+    """
+    latencies = []
+    connections = []
+    for _ in range(clients):
+        if unix_path is not None:
+            connections.append(await asyncio.open_unix_connection(unix_path))
+        else:
+            connections.append(await asyncio.open_connection(host, port))
+    load_clients = [LoadClient(reader, writer, game_name, random.Random(seed + index), engine_every, latencies)
+                    for index, (reader, writer) in enumerate(connections)]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client.run(start + seconds, max_plies) for client in load_clients))
+    elapsed = time.perf_counter() - start
+    for client in load_clients:
+        client.writer.close()
+
+    latencies.sort()
+    moves = sum(client.moves for client in load_clients)
+    return {
+        'clients': clients,
+        'moves': moves,
+        'requests': sum(client.requests for client in load_clients),
+        'errors': sum(client.errors for client in load_clients),
+        'moves_per_second': round(moves / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+def main():
+    """Разбирает аргументы командной строки, нагружает сервер и печатает статистику."""
+    parser = argparse.ArgumentParser(description='Генератор нагрузки для server.py')
+    parser.add_argument('--clients', type=int, default=100, help='число одновременных клиентов')
+    parser.add_argument('--seconds', type=float, default=10.0, help='длительность нагрузки')
+    parser.add_argument('--game', choices=('chess', 'checkers'), default='chess', help='игра')
+    parser.add_argument('--host', default='127.0.0.1', help='адрес сервера')
+    parser.add_argument('--port', type=int, default=8765, help='порт сервера')
+    parser.add_argument('--unix', default=None, help='путь Unix-сокета (вместо TCP)')
+    parser.add_argument('--engine-every', type=int, default=0, help='каждый N-й ход делает движок сервера')
+    parser.add_argument('--max-plies', type=int, default=200, help='предел полуходов партии')
+    parser.add_argument('--seed', type=int, default=0, help='начальное зерно')
+    args = parser.parse_args()
+    stats = asyncio.run(run_load(args.clients, args.seconds, args.game, args.host, args.port, args.unix,
+                                 args.engine_every, args.max_plies, args.seed))
+    print(f"Клиентов: {stats['clients']}  ходов: {stats['moves']}  запросов: {stats['requests']}  "
+          f"ошибок: {stats['errors']}")
+    print(f"Ходов в секунду: {stats['moves_per_second']}  задержка хода p50: {stats['p50_ms']} мс  "
+          f"p99: {stats['p99_ms']} мс  max: {stats['max_ms']} мс")
+
+if __name__ == "__main__":
+    main()
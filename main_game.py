@@ -1,18 +1,69 @@
+from collections import namedtuple
+
 from figure import *
+from bitboard import BitBoard, iter_bits
+from engine import ChessEngine, CheckersEngine
+from evaluation import square_score
+from zobrist import SIDE_KEY, figure_key
+
+# Результат проверки или выполнения хода: status - MOVE_LEGAL, MOVE_MADE или MOVE_ILLEGAL,
+# reason - причина отказа (REASON_*) или None, captured - кортеж взятых фигур,
+# threats - кортеж (row, col, figure) фигур ходящего под боем после хода (собирается только без quiet)
+MoveResult = namedtuple('MoveResult', ['status', 'reason', 'captured', 'threats'])
+
+MOVE_LEGAL = 'legal'  # Ход допустим (позиция не изменена)
+MOVE_MADE = 'made'  # Ход выполнен
+MOVE_ILLEGAL = 'illegal'  # Ход недопустим
+
+REASON_NO_FIGURE = 'no_figure'
+REASON_NOT_YOUR_FIGURE = 'not_your_figure'
+REASON_OWN_FIGURE = 'own_figure'
+REASON_UNREACHABLE = 'unreachable'
+REASON_KING_IN_CHECK = 'king_in_check'
+
+# Готовые результаты, чтобы проверка в тихом режиме не создавала объектов
+ILLEGAL_RESULTS = {reason: MoveResult(MOVE_ILLEGAL, reason, (), ()) for reason in
+                   (REASON_NO_FIGURE, REASON_NOT_YOUR_FIGURE, REASON_OWN_FIGURE, REASON_UNREACHABLE, REASON_KING_IN_CHECK)}
+LEGAL_RESULT = MoveResult(MOVE_LEGAL, None, (), ())
+MADE_RESULT = MoveResult(MOVE_MADE, None, (), ())
+
+REASON_MESSAGES = {REASON_KING_IN_CHECK: 'Король под шахом'}  # Причины, о которых сообщается игроку
 
 # общий класс для двух игр
 class Game:
     """Базовый класс для игр шахматы и шашки."""
     
-    def __init__(self):
-        """Инициализирует игровую доску и начальные параметры игры."""
+    def __init__(self, backend='list', quiet=False):
+        """Инициализирует игровую доску и начальные параметры игры.
+        
+        Args:
+            backend (str): Представление доски: 'list' (список списков) или 'bitboard' (список
+                списков и маски BitBoard, по которым считаются атаки, шахи и взятия шашек).
+            quiet (bool): Тихий режим: проверка и выполнение ходов ничего не выводят в консоль.
+        """
+        if backend not in ('list', 'bitboard'):
+            raise ValueError(f"Неизвестное представление доски: {backend}")
         self.board = [[None for _ in range(8)] for _ in range(8)]
+        self.bitboard = BitBoard() if backend == 'bitboard' else None  # Маски занятости, обновляются в place
+        self.backend = backend
+        self.quiet = quiet  # В тихом режиме ходы только возвращают MoveResult
         self.white_turn_active = 'white'  # Текущий ход за белыми
         self.turn_count = 0  # Счетчик ходов
+        self.move_stack = []  # Стек изменений позиции для отмены ходов (unmake_move)
+        self.zobrist_key = 0  # Ключ Зобриста расстановки фигур, обновляется в set_figure
+        self.evaluation = 0  # Материал и бонусы клеток с точки зрения белых, обновляется в set_figure
+        self.pieces = {'white': {}, 'black': {}}  # Фигуры сторон: (row, col) -> фигура, обновляются в set_figure
+        self.king_squares = {'white': None, 'black': None}  # Клетки шахматных королей
+        self.legal_moves_cache = None  # (ключ позиции, допустимые ходы по клеткам) для текущего хода в play
         self.coordinates_to_numbers = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5, 'g': 6, 'h': 7}  # Словарь для преобразования букв в индексы
 
-    def display_board(self):
-        """Отображает текущее состояние игровой доски в консоли."""
+    def display_board(self, destinations=()):
+        """Отображает текущее состояние игровой доски в консоли.
+        
+        Args:
+            destinations (set): Клетки (row, col), куда может пойти выбранная фигура: пустые
+                отмечаются '*', занятые (взятие или обмен Оборотня) - 'x'.
+        """
         letters_coords = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
         nums_coords = [i for i in range(1, 9)]
         print()
@@ -22,7 +73,10 @@ class Game:
             print(nums_coords[row], end=' | ')  # Вывод числовых координат
             for col in range(8):
                 figure = self.board[row][col]
-                print(figure if figure else '.', end=' ')  # Вывод фигуры или точки
+                if (row, col) in destinations:
+                    print('x' if figure else '*', end=' ')  # Вывод подсказки хода
+                else:
+                    print(figure if figure else '.', end=' ')  # Вывод фигуры или точки
             print('|', nums_coords[row], end='\n')  # Завершение строки
         print('  ', '-' * 17)  # Разделительная линия
         print('   ', *letters_coords, sep=' ', end='')  # Вывод буквенных координат
@@ -42,23 +96,204 @@ class Game:
             return self.board[row][col]
         return None      
     
+    def place(self, row, col, figure):
+        """Ставит фигуру в клетку доски и в маски битборда, без обновления ключа, оценки и списков фигур.
+        
+        Args:
+            row (int): Номер строки (0-7).
+            col (int): Номер столбца (0-7).
+            figure (Figure or None): Фигура или None для пустой клетки.
+        """
+        self.board[row][col] = figure
+        if self.bitboard is not None:
+            self.bitboard.put(row * 8 + col, figure)
+    
     def set_figure(self, row, col, figure):
         """Устанавливает фигуру на указанную позицию.
         
+        Ключ Зобриста, оценка позиции, списки фигур сторон и клетки королей обновляются на
+        разность между снятой и поставленной фигурой, поэтому ходы, обмены, превращения и их
+        отмена не требуют пересчета всей доски.
+        
         Args:
             row (int): Номер строки (0-7).
             col (int): Номер столбца (0-7).
             figure (Figure): Фигура для установки.
         """
         if 0 <= row <= 7 and 0 <= col <= 7:
-            self.board[row][col] = figure
+            square = (row, col)
+            old_figure = self.board[row][col]
+            if old_figure is not None:
+                self.zobrist_key ^= figure_key(old_figure, row, col)
+                self.evaluation -= square_score(old_figure, row, col)
+                del self.pieces[old_figure.side][square]
+                # При обмене с Оборотнем король уже стоит на новой клетке, и ее не нужно сбрасывать
+                if isinstance(old_figure, King) and self.king_squares[old_figure.side] == square:
+                    self.king_squares[old_figure.side] = None
+            self.place(row, col, figure)
+            if figure is not None:
+                self.zobrist_key ^= figure_key(figure, row, col)
+                self.evaluation += square_score(figure, row, col)
+                self.pieces[figure.side][square] = figure
+                if isinstance(figure, King):
+                    self.king_squares[figure.side] = square
+    
+    @classmethod
+    def empty(cls, backend='list', quiet=False):
+        """Создает игру с пустой доской, без начальной расстановки.
+        
+        Args:
+            backend (str): Представление доски: 'list' или 'bitboard'.
+            quiet (bool): Тихий режим без вывода в консоль.
             
-    def play(self):
-        """Запускает игровой цикл с вводом ходов игроками."""
+        Returns:
+            Game: Игра с пустой доской и ходом белых.
+        """
+        game = cls.__new__(cls)
+        Game.__init__(game, backend, quiet)
+        return game
+    
+    def clone(self):
+        """Создает независимую копию позиции без deepcopy.
+        
+        Копируются только клетки доски (фигуры пересоздаются копированием слотов и
+        привязываются к новой игре), очередь хода и счетчик ходов. Стек ходов у копии
+        пустой: отменить ходы, сделанные до копирования, в ней нельзя.
+        
+        Returns:
+            Game: Копия игры того же класса и с тем же представлением доски.
+        """
+        game = self.empty(self.backend, self.quiet)
+        for side_pieces in self.pieces.values():
+            for (row, col), figure in side_pieces.items():
+                game.set_figure(row, col, figure.copy(game))
+        game.white_turn_active = self.white_turn_active
+        game.turn_count = self.turn_count
+        return game
+    
+    def snapshot(self):
+        """Возвращает неизменяемый снимок позиции для многократного создания игр из шаблона.
+        
+        Снимок - 64 байта расстановки (pack_board), очередь хода и счетчик ходов; его можно
+        хранить, передавать в другие процессы и разделять между любым числом игр.
+        
+        Returns:
+            tuple: Кортеж (bytes, white_turn_active, turn_count).
+        """
+        return pack_board(self), self.white_turn_active, self.turn_count
+    
+    @classmethod
+    def from_snapshot(cls, snapshot, backend='list', quiet=False):
+        """Создает игру из снимка snapshot.
+        
+        Args:
+            snapshot (tuple): Снимок, полученный от snapshot.
+            backend (str): Представление доски: 'list' или 'bitboard'.
+            quiet (bool): Тихий режим без вывода в консоль.
+            
+        Returns:
+            Game: Новая игра в позиции снимка.
+        """
+        data, white_turn_active, turn_count = snapshot
+        game = cls.empty(backend, quiet)
+        unpack_board(data, game)
+        game.white_turn_active = white_turn_active
+        game.turn_count = turn_count
+        return game
+    
+    def position_key(self):
+        """Возвращает ключ Зобриста позиции с учетом очереди хода.
+        
+        Returns:
+            int: 64-битный ключ позиции.
+        """
+        return self.zobrist_key ^ SIDE_KEY if self.white_turn_active == 'black' else self.zobrist_key
+    
+    def book_move(self, book):
+        """Ищет текущую позицию в книге дебютов.
+        
+        Args:
+            book (OpeningBook): Открытая книга дебютов.
+            
+        Returns:
+            tuple or None: Допустимый в позиции ход из книги или None.
+        """
+        entry = book.probe(self.position_key())
+        if entry is None or not entry.move or self.validate_move(*entry.move).status != MOVE_LEGAL:
+            return None
+        return entry.move
+    
+    def render_result(self, result):
+        """Выводит в консоль результат проверки или выполнения хода.
+        
+        Args:
+            result (MoveResult): Результат validate_move или try_move.
+        """
+        if result.threats:
+            side = result.threats[0][2].side
+            print(f"\nФигуры {'белых' if side == 'white' else 'черных'} под боем:")
+            for row, col, figure in result.threats:
+                print(f"{figure} на {chr(ord('a') + col)}{row + 1}")
+        if result.reason in REASON_MESSAGES:
+            print(f'\n{REASON_MESSAGES[result.reason]}')
+        if result.status == MOVE_MADE:
+            print('\nХод выполнен успешно!')
+            print(f'Кол-во ходов: {self.turn_count}')
+            
+    def turn_legal_moves(self):
+        """Возвращает допустимые ходы текущего хода, сгруппированные по начальной клетке.
+        
+        Ходы генерируются один раз за ход и хранятся вместе с ключом позиции, поэтому
+        повторный ввод хода в play не проверяет правила заново. Серии взятий из нескольких
+        прыжков не включаются: в play ход вводится двумя клетками.
+        
+        Returns:
+            dict: {(start_row, start_col): {(end_row, end_col), ...}}.
+        """
+        key = self.position_key()
+        if self.legal_moves_cache is None or self.legal_moves_cache[0] != key:
+            destinations = {}
+            for move in self.generate_legal_moves(self.white_turn_active):
+                if len(move) == 4:
+                    destinations.setdefault((move[0], move[1]), set()).add((move[2], move[3]))
+            self.legal_moves_cache = (key, destinations)
+        return self.legal_moves_cache[1]
+    
+    def play(self, engine=None, engine_side='black', book=None, tablebase=None):
+        """Запускает игровой цикл с вводом ходов игроками.
+        
+        Args:
+            engine (SearchEngine or None): Движок, играющий за компьютер, или None для игры двух людей.
+            engine_side (str): Сторона, за которую играет движок ('white' или 'black').
+            book (OpeningBook or None): Книга дебютов для подсказок игроку.
+            tablebase (Tablebase or None): Таблицы эндшпиля для вывода точной оценки позиции.
+        """
         while True:
             self.display_board()
             print(f"\nХод {'белых' if self.white_turn_active == 'white' else 'черных'}")
 
+            if engine is not None and self.white_turn_active == engine_side:
+                move = engine.search()
+                if move is None:
+                    print("\nУ компьютера нет допустимых ходов. Игра окончена")
+                    return
+                print(f"\nХод компьютера: {move_to_text(move)}")
+                self.render_result(self.try_move(*move))
+                self.white_turn_active = 'black' if self.white_turn_active == 'white' else 'white'
+                continue
+
+            if tablebase is not None:
+                result = tablebase.probe(self)
+                if result is not None:
+                    outcome, distance = result
+                    outcomes = {'win': 'выигрыш', 'loss': 'проигрыш', 'draw': 'ничья'}
+                    print(f"Таблица эндшпиля: {outcomes[outcome]}" + (f" через {distance} полуходов" if distance else ''))
+
+            if book is not None:
+                hint = self.book_move(book)
+                if hint is not None:
+                    print(f"Ход из книги дебютов: {move_to_text(hint)}")
+
             try:
                 start_coordinate = input("Введите начальную координату: ")
                 if start_coordinate.lower() in ['stop', 'exit']:
@@ -79,6 +314,13 @@ class Game:
                     print("\nЭта фигура не ваша")
                     continue
 
+                destinations = self.turn_legal_moves().get((start_row, start_col))
+                if not destinations:
+                    print("\nУ этой фигуры нет допустимых ходов")
+                    continue
+                self.display_board(destinations)
+                print("Допустимые ходы:", *sorted(f"{chr(ord('a') + col)}{row + 1}" for row, col in destinations))
+
                 end_coordinate = input("Введите конечную координату: ")
                 if end_coordinate.lower() in ['stop', 'exit']:
                     exit() if end_coordinate.lower() == 'stop' else main()
@@ -97,9 +339,16 @@ class Game:
                 print("\nДанная клетка пустая либо не существует")
                 continue
 
-            result = self.move_actions(start_row, start_col, end_row, end_col)
-            if result:
+            # Недопустимый ход отклоняется по кэшу ходов, без повторной проверки правил
+            if (end_row, end_col) not in destinations:
+                print("\nНедопустимый ход!")
+                continue
+
+            result = self.try_move(start_row, start_col, end_row, end_col)
+            self.render_result(result)
+            if result.status == MOVE_MADE:
                 self.white_turn_active = 'black' if self.white_turn_active == 'white' else 'white'
+                self.legal_moves_cache = None
             else:
                 print("\nНедопустимый ход!")
      
@@ -107,61 +356,190 @@ class Game:
 class ChessBoard(Game):
     """Дочерний класс для игры в шахматы, наследуемый от Game."""
     
-    def __init__(self):
-        """Инициализирует шахматную доску с расстановкой фигур."""
-        Game.__init__(self)
+    def __init__(self, backend='list', quiet=False):
+        """Инициализирует шахматную доску с расстановкой фигур.
+        
+        Args:
+            backend (str): Представление доски: 'list' или 'bitboard'.
+            quiet (bool): Тихий режим без вывода в консоль.
+        """
+        Game.__init__(self, backend, quiet)
+        self.init_attack_maps()
         self.place_figures()
+    
+    @classmethod
+    def empty(cls, backend='list', quiet=False):
+        """Создает шахматную игру с пустой доской.
+        
+        Args:
+            backend (str): Представление доски: 'list' или 'bitboard'.
+            quiet (bool): Тихий режим без вывода в консоль.
+            
+        Returns:
+            ChessBoard: Игра с пустой доской.
+        """
+        game = super().empty(backend, quiet)
+        game.init_attack_maps()
+        return game
+    
+    def init_attack_maps(self):
+        """Создает пустые карты атак сторон (до расстановки фигур)."""
+        # Число фигур стороны, бьющих каждую клетку; обновляется в set_figure
+        self.attack_maps = {'white': [[0] * 8 for _ in range(8)], 'black': [[0] * 8 for _ in range(8)]}
+        self.piece_attacks = {}  # (row, col) -> множество клеток, которые бьет стоящая там фигура
+    
+    def set_figure(self, row, col, figure):
+        """Устанавливает фигуру на указанную позицию и обновляет карты атак сторон.
+        
+        Карты меняются только на разность: снимаются атаки прежней фигуры клетки и
+        добавляются атаки новой, дальнобойные фигуры, чьи лучи проходят через клетку,
+        теряют или получают клетки за ней, когда клетка занимается или освобождается,
+        а кони и Прыгуны, бьющие клетку, учитывают, стоит ли на ней своя фигура.
+        Поэтому ходы, обмены Оборотня, взятия, превращения и их отмена не пересчитывают
+        атаки всех фигур.
+        
+        Args:
+            row (int): Номер строки (0-7).
+            col (int): Номер столбца (0-7).
+            figure (Figure): Фигура для установки.
+        """
+        if not (0 <= row <= 7 and 0 <= col <= 7):
+            return
+        square = (row, col)
+        old_figure = self.board[row][col]
+        if old_figure is not None:
+            attack_map = self.attack_maps[old_figure.side]
+            for attack_row, attack_col in self.piece_attacks.pop(square):
+                attack_map[attack_row][attack_col] -= 1
+        if figure is not None:
+            # При обмене Оборотня и отмене хода фигура ставится раньше, чем обновлены ее координаты
+            figure.row, figure.col = row, col
+        Game.set_figure(self, row, col, figure)
+
+        if (old_figure is None) != (figure is None):
+            self.update_lines(row, col, figure is None)
+        if old_figure is None or figure is None or old_figure.side != figure.side:
+            self.update_leapers(row, col, old_figure, figure)
+        if figure is not None:
+            attacks = set(figure.get_attacks())
+            self.piece_attacks[square] = attacks
+            attack_map = self.attack_maps[figure.side]
+            for attack_row, attack_col in attacks:
+                attack_map[attack_row][attack_col] += 1
+    
+    def update_lines(self, row, col, vacated):
+        """Обновляет атаки дальнобойных фигур, бьющих сквозь клетку, после ее освобождения или занятия.
+        
+        Args:
+            row (int): Строка клетки.
+            col (int): Столбец клетки.
+            vacated (bool): True, если клетка освободилась, False - если занята.
+        """
+        board = self.board
+        for back_ray, forward_ray, slider_types, lite_rook in ATTACK_LINES[row * 8 + col]:
+            for distance, (attacker_row, attacker_col) in enumerate(back_ray, 1):
+                attacker = board[attacker_row][attacker_col]
+                if attacker is not None:
+                    break
+            else:
+                continue
+            if isinstance(attacker, slider_types):
+                reach = 7
+            elif lite_rook and isinstance(attacker, LiteRook) and distance < 2:
+                reach = 2 - distance  # Лайт-ладья бьет не дальше 2 клеток
+            else:
+                continue
+
+            attacks = self.piece_attacks[(attacker_row, attacker_col)]
+            attack_map = self.attack_maps[attacker.side]
+            for square in forward_ray[:reach]:
+                if vacated:
+                    attacks.add(square)
+                    attack_map[square[0]][square[1]] += 1
+                else:
+                    attacks.discard(square)
+                    attack_map[square[0]][square[1]] -= 1
+                if board[square[0]][square[1]] is not None:
+                    break
+    
+    def update_leapers(self, row, col, old_figure, figure):
+        """Обновляет атаки коней и Прыгунов на клетку после смены стороны стоящей на ней фигуры.
+        
+        Конь и Прыгун не бьют клетки со своими фигурами, поэтому атака появляется, когда
+        с клетки уходит своя фигура, и пропадает, когда своя фигура на нее встает.
+        
+        Args:
+            row (int): Строка клетки.
+            col (int): Столбец клетки.
+            old_figure (Figure or None): Фигура, стоявшая на клетке.
+            figure (Figure or None): Фигура, поставленная на клетку.
+        """
+        board = self.board
+        square = (row, col)
+        old_side = old_figure.side if old_figure is not None else None
+        new_side = figure.side if figure is not None else None
+        for leaper_table, figure_type in ((NIGHT_MOVES, Night), (JUMPMAN_ATTACKERS, Jumpman)):
+            for attacker_row, attacker_col in leaper_table[row * 8 + col]:
+                attacker = board[attacker_row][attacker_col]
+                if not isinstance(attacker, figure_type):
+                    continue
+                if attacker.side == old_side:
+                    self.piece_attacks[(attacker_row, attacker_col)].add(square)
+                    self.attack_maps[attacker.side][row][col] += 1
+                elif attacker.side == new_side:
+                    self.piece_attacks[(attacker_row, attacker_col)].discard(square)
+                    self.attack_maps[attacker.side][row][col] -= 1
         
     def place_figures(self):
         """Расставляет шахматные фигуры на доске в начальной позиции."""
         # Ладьи
-        self.board[0][0] = Rook('black', self, 0, 0)
-        self.board[0][7] = Rook('black', self, 0, 7)
-        self.board[7][0] = Rook('white', self, 7, 0)
-        self.board[7][7] = Rook('white', self, 7, 7)
+        self.set_figure(0, 0, Rook('black', self, 0, 0))
+        self.set_figure(0, 7, Rook('black', self, 0, 7))
+        self.set_figure(7, 0, Rook('white', self, 7, 0))
+        self.set_figure(7, 7, Rook('white', self, 7, 7))
         
         # Кони
-        self.board[0][6] = Night('black', self, 0, 6)
-        self.board[0][1] = Night('black', self, 0, 1)
-        self.board[7][1] = Night('white', self, 7, 1)
-        self.board[7][6] = Night('white', self, 7, 6)
+        self.set_figure(0, 6, Night('black', self, 0, 6))
+        self.set_figure(0, 1, Night('black', self, 0, 1))
+        self.set_figure(7, 1, Night('white', self, 7, 1))
+        self.set_figure(7, 6, Night('white', self, 7, 6))
         
         # Слоны
-        self.board[0][2] = Bishop('black', self, 0, 2)
-        self.board[0][5] = Bishop('black', self, 0, 5)
-        self.board[7][2] = Bishop('white', self, 7, 2)
-        self.board[7][5] = Bishop('white', self, 7, 5)
+        self.set_figure(0, 2, Bishop('black', self, 0, 2))
+        self.set_figure(0, 5, Bishop('black', self, 0, 5))
+        self.set_figure(7, 2, Bishop('white', self, 7, 2))
+        self.set_figure(7, 5, Bishop('white', self, 7, 5))
         
         # Ферзи
-        self.board[0][3] = Queen('black', self, 0, 3)
-        self.board[7][3] = Queen('white', self, 7, 3)
+        self.set_figure(0, 3, Queen('black', self, 0, 3))
+        self.set_figure(7, 3, Queen('white', self, 7, 3))
         
         # Короли
-        self.board[0][4] = King('black', self, 0, 4)
-        self.board[7][4] = King('white', self, 7, 4)
+        self.set_figure(0, 4, King('black', self, 0, 4))
+        self.set_figure(7, 4, King('white', self, 7, 4))
         
         # Пешки
         for col in range(8):   
-            self.board[1][col] = Pawn('black', self, 1, col)
-            self.board[6][col] = Pawn('white', self, 6, col)
+            self.set_figure(1, col, Pawn('black', self, 1, col))
+            self.set_figure(6, col, Pawn('white', self, 6, col))
             
         # Новые фигуры
         # Лайт-ладьи
-        self.board[2][1] = LiteRook('black', self, 2, 1)
-        self.board[2][6] = LiteRook('black', self, 2, 6)
-        self.board[5][1] = LiteRook('white', self, 5, 1)
-        self.board[5][6] = LiteRook('white', self, 5, 6)
+        self.set_figure(2, 1, LiteRook('black', self, 2, 1))
+        self.set_figure(2, 6, LiteRook('black', self, 2, 6))
+        self.set_figure(5, 1, LiteRook('white', self, 5, 1))
+        self.set_figure(5, 6, LiteRook('white', self, 5, 6))
         
         # Прыгуны
-        self.board[2][3] = Jumpman('black', self, 2, 3)
-        self.board[5][3] = Jumpman('white', self, 5, 3)
+        self.set_figure(2, 3, Jumpman('black', self, 2, 3))
+        self.set_figure(5, 3, Jumpman('white', self, 5, 3))
         
         # Оборотни
-        self.board[3][7] = WereWolf('black', self, 3, 7)  # Исправлено: row с 2 на 3
-        self.board[4][7] = WereWolf('white', self, 4, 7)  # Исправлено: row с 5 на 4
+        self.set_figure(3, 7, WereWolf('black', self, 3, 7))  # Исправлено: row с 2 на 3
+        self.set_figure(4, 7, WereWolf('white', self, 4, 7))  # Исправлено: row с 5 на 4
         
     def find_king(self, side):
-        """Находит позицию короля указанной стороны.
+        """Находит позицию короля указанной стороны за O(1) (клетка короля обновляется в set_figure).
         
         Args:
             side (str): Сторона ('white' или 'black').
@@ -169,15 +547,100 @@ class ChessBoard(Game):
         Returns:
             tuple or None: Кортеж (row, col) с позицией короля или None, если король не найден.
         """
-        for row in range(8):
-            for col in range(8):
-                figure = self.board[row][col]
-                if isinstance(figure, King) and figure.side == side:
-                    return row, col
-        return None
+        return self.king_squares[side]
     
-    def is_check(self, side):
-        """Проверяет, находится ли король указанной стороны под шахом (а также другие фигуры ходящего игрока под угрозой).
+    def build_attack_map(self, side):
+        """Строит карту атак указанной стороны с нуля (эталон для карт, обновляемых в set_figure).
+        
+        Args:
+            side (str): Сторона ('white' или 'black').
+            
+        Returns:
+            list: Матрица 8x8, где для каждой клетки указано число фигур стороны, которые ее бьют.
+        """
+        attack_map = [[0] * 8 for _ in range(8)]
+        for figure in self.pieces[side].values():
+            for attack_row, attack_col in figure.get_attacks():
+                attack_map[attack_row][attack_col] += 1
+        return attack_map
+    
+    def threatened_figures(self, side):
+        """Возвращает фигуры указанной стороны, находящиеся под боем.
+        
+        Args:
+            side (str): Сторона ('white' или 'black').
+            
+        Returns:
+            list: Список кортежей (row, col, figure) с фигурами под угрозой.
+        """
+        enemy = 'black' if side == 'white' else 'white'
+        if self.bitboard is not None:
+            capture_mask = self.bitboard.attack_mask(enemy) & self.bitboard.occupancy[side]
+            return [(square // 8, square % 8, self.bitboard.squares[square]) for square in iter_bits(capture_mask)]
+
+        enemy_map = self.attack_maps[enemy]
+        return [(row, col, figure) for (row, col), figure in self.pieces[side].items() if enemy_map[row][col]]
+    
+    def is_square_attacked(self, row, col, by_side):
+        """Проверяет, бьет ли сторона клетку, просматривая фигуры от самой клетки наружу.
+        
+        Результат совпадает с картой атак: Оборотень ничего не бьет, лайт-ладья бьет
+        не дальше 2 клеток, а конь и Прыгун не бьют клетки со своими фигурами.
+        Проверка заканчивается на первой найденной атакующей фигуре. В представлении
+        'bitboard' тот же обратный поиск делается по маскам (BitBoard.is_attacked).
+        
+        Args:
+            row (int): Строка клетки.
+            col (int): Столбец клетки.
+            by_side (str): Атакующая сторона ('white' или 'black').
+            
+        Returns:
+            bool: True, если клетку бьет хотя бы одна фигура стороны.
+        """
+        board = self.board
+        square = row * 8 + col
+        if self.bitboard is not None:
+            return self.bitboard.is_attacked(square, by_side)
+        target_figure = board[row][col]
+        own_target = target_figure is not None and target_figure.side == by_side
+
+        for row2, col2 in PAWN_ATTACKERS[by_side][square]:
+            figure = board[row2][col2]
+            if isinstance(figure, Pawn) and figure.side == by_side:
+                return True
+        for row2, col2 in KING_MOVES[square]:
+            figure = board[row2][col2]
+            if isinstance(figure, King) and figure.side == by_side:
+                return True
+        if not own_target:
+            for row2, col2 in NIGHT_MOVES[square]:
+                figure = board[row2][col2]
+                if isinstance(figure, Night) and figure.side == by_side:
+                    return True
+            for row2, col2 in JUMPMAN_ATTACKERS[square]:
+                figure = board[row2][col2]
+                if isinstance(figure, Jumpman) and figure.side == by_side:
+                    return True
+
+        for ray in ROOK_RAYS[square]:
+            for distance, (row2, col2) in enumerate(ray, 1):
+                figure = board[row2][col2]
+                if figure is not None:
+                    if figure.side == by_side and (isinstance(figure, (Rook, Queen))
+                                                   or (isinstance(figure, LiteRook) and distance <= 2)):
+                        return True
+                    break
+        for ray in BISHOP_RAYS[square]:
+            for row2, col2 in ray:
+                figure = board[row2][col2]
+                if figure is not None:
+                    if figure.side == by_side and isinstance(figure, (Bishop, Queen)):
+                        return True
+                    break
+        return False
+    
+    def king_in_check(self, side):
+        """Проверяет, бьет ли противник короля указанной стороны (без вывода в консоль).
         
         Args:
             side (str): Сторона ('white' или 'black').
@@ -188,40 +651,31 @@ class ChessBoard(Game):
         king_pos = self.find_king(side)
         if king_pos is None:
             return False
+        enemy = 'black' if side == 'white' else 'white'
+        return self.attack_maps[enemy][king_pos[0]][king_pos[1]] > 0
+    
+    def is_check(self, side):
+        """Проверяет, находится ли король указанной стороны под шахом (а также другие фигуры ходящего игрока под угрозой).
+        
+        Args:
+            side (str): Сторона ('white' или 'black').
+            
+        Returns:
+            bool: True, если король под шахом, иначе False.
+        """
+        if self.find_king(side) is None:
+            return False
 
-        king_in_check = False
-        threatened_figures = []
-
-        for row in range(8):
-            for col in range(8):
-                figure = self.board[row][col]
-                if figure is not None and figure.side == side:
-                    for other_figure_row in range(8):
-                        for other_figure_col in range(8):
-                            other_figure = self.board[other_figure_row][other_figure_col]
-                            if other_figure is not None and other_figure.side != side:
-                                other_figure_moves = other_figure.get_actions()
-                                if (row, col) in other_figure_moves:
-                                    threatened_figures.append((row, col, figure))
-                                    break
-
-        for row in range(8):
-            for col in range(8):
-                figure = self.board[row][col]
-                if figure is not None and figure.side != side:
-                    figure_valid_moves = figure.get_actions()
-                    if king_pos in figure_valid_moves:
-                        king_in_check = True
-
+        threatened_figures = [] if self.quiet else self.threatened_figures(side)
         if threatened_figures:
             print(f"\nФигуры {'белых' if side == 'white' else 'черных'} под боем:")
             for row, col, figure in threatened_figures:
                 print(f"{figure} на {chr(ord('a') + col)}{row + 1}")
 
-        return king_in_check 
+        return self.king_in_check(side)
     
-    def is_valid_move(self, start_row, start_col, end_row, end_col):
-        """Проверяет корректность хода в шахматах.
+    def validate_move(self, start_row, start_col, end_row, end_col):
+        """Проверяет ход в шахматах без вывода в консоль.
         
         Args:
             start_row (int): Начальная строка.
@@ -230,99 +684,319 @@ class ChessBoard(Game):
             end_col (int): Конечный столбец.
             
         Returns:
-            bool: True, если ход допустим, иначе False.
+            MoveResult: MOVE_LEGAL или MOVE_ILLEGAL с причиной, взятой фигурой и (без quiet) угрозами после хода.
         """
         figure = self.get_figure(start_row, start_col)
-        if figure is None or figure.side != self.white_turn_active:
-            return False
+        if figure is None:
+            return ILLEGAL_RESULTS[REASON_NO_FIGURE]
+        if figure.side != self.white_turn_active:
+            return ILLEGAL_RESULTS[REASON_NOT_YOUR_FIGURE]
 
         figure_step = self.get_figure(end_row, end_col)
 
         if isinstance(figure, WereWolf):
+            # Оборотень меняется местами только с соседней своей фигурой (не с самим собой)
+            if (end_row, end_col) not in figure.get_actions():
+                return ILLEGAL_RESULTS[REASON_UNREACHABLE]
+            captured = ()
+        else:
             if figure_step is not None and figure_step.side == figure.side:
-                return True
-            else:
-                return False
-
-        if figure_step is not None and figure_step.side == figure.side:
-            return False
+                return ILLEGAL_RESULTS[REASON_OWN_FIGURE]
 
-        valid_moves = figure.get_actions()
-        if (end_row, end_col) not in valid_moves:
-            return False
+            valid_moves = figure.get_actions()
+            if (end_row, end_col) not in valid_moves:
+                return ILLEGAL_RESULTS[REASON_UNREACHABLE]
+            captured = () if figure_step is None else (figure_step,)
 
-        original_start_figure = self.board[start_row][start_col]
-        original_end_figure = self.board[end_row][end_col]
+        is_king_in_check = not self.is_legal_move(start_row, start_col, end_row, end_col)
+        threats = ()
+        if not self.quiet:
+            # Угрозы после хода нужны только для вывода, поэтому пробный ход делается лишь без quiet
+            self.make_move(start_row, start_col, end_row, end_col)
+            threats = tuple(self.threatened_figures(figure.side))
+            self.unmake_move()
 
-        self.board[end_row][end_col] = figure
-        self.board[start_row][start_col] = None
-        figure.row, figure.col = end_row, end_col
-
-        is_king_in_check = self.is_check(figure.side)
+        if is_king_in_check:
+            if not threats:
+                return ILLEGAL_RESULTS[REASON_KING_IN_CHECK]
+            return MoveResult(MOVE_ILLEGAL, REASON_KING_IN_CHECK, (), threats)
+        if not captured and not threats:
+            return LEGAL_RESULT
+        return MoveResult(MOVE_LEGAL, None, captured, threats)
+    
+    def is_valid_move(self, start_row, start_col, end_row, end_col):
+        """Проверяет корректность хода в шахматах.
+        
+        Args:
+            start_row (int): Начальная строка.
+            start_col (int): Начальный столбец.
+            end_row (int): Конечная строка.
+            end_col (int): Конечный столбец.
+            
+        Returns:
+            bool: True, если ход допустим, иначе False.
+        """
+        result = self.validate_move(start_row, start_col, end_row, end_col)
+        if not self.quiet:
+            self.render_result(result)
+        return result.status == MOVE_LEGAL
+    
+    def check_info(self, side):
+        """Находит шахующие и связанные фигуры одним просмотром от короля.
+        
+        В представлении 'bitboard' лучи от короля просматриваются по маскам (BitBoard.check_info).
+        
+        Args:
+            side (str): Сторона короля ('white' или 'black').
+            
+        Returns:
+            tuple: Кортеж (king_pos, checks, pins): king_pos - (row, col) короля или None;
+            checks - список множеств клеток, ходом на которые снимается каждый шах (клетка
+            шахующей фигуры и клетки между ней и королем); pins - словарь
+            {(row, col) связанной фигуры: множество клеток линии связки, включая клетку связывающей фигуры}.
+        """
+        king_pos = self.find_king(side)
+        checks = []
+        pins = {}
+        if king_pos is None:
+            return king_pos, checks, pins
 
-        self.board[start_row][start_col] = original_start_figure
-        self.board[end_row][end_col] = original_end_figure
-        figure.row, figure.col = start_row, start_col
+        board = self.board
+        enemy = 'black' if side == 'white' else 'white'
+        square = king_pos[0] * 8 + king_pos[1]
+        if self.bitboard is not None:
+            checks, pins = self.bitboard.check_info(square, side)
+            return king_pos, checks, pins
 
-        if is_king_in_check:
-            print('\nКороль под шахом')
-            return False
+        # По карте атак видно, есть ли шах; без шаха шахующие прыгающие фигуры можно не искать
+        if self.attack_maps[enemy][king_pos[0]][king_pos[1]]:
+            for leaper_table, figure_type in ((PAWN_ATTACKERS[enemy], Pawn), (KING_MOVES, King),
+                                              (NIGHT_MOVES, Night), (JUMPMAN_ATTACKERS, Jumpman)):
+                for row, col in leaper_table[square]:
+                    figure = board[row][col]
+                    if isinstance(figure, figure_type) and figure.side == enemy:
+                        checks.append({(row, col)})
 
-        return True
+        for ray_table, slider_types in ((ROOK_RAYS, (Rook, Queen)), (BISHOP_RAYS, (Bishop, Queen))):
+            for ray in ray_table[square]:
+                pinned = None
+                path = []
+                for distance, (row, col) in enumerate(ray, 1):
+                    figure = board[row][col]
+                    if figure is None:
+                        path.append((row, col))
+                        continue
+                    if figure.side == side:
+                        if pinned is not None:
+                            break
+                        pinned = (row, col)
+                        continue
+                    # Лайт-ладья бьет вдоль линии не дальше 2 клеток
+                    if isinstance(figure, slider_types) or (ray_table is ROOK_RAYS and isinstance(figure, LiteRook) and distance <= 2):
+                        path.append((row, col))
+                        if pinned is None:
+                            checks.append(set(path))
+                        else:
+                            pins[pinned] = set(path)
+                    break
+        return king_pos, checks, pins
     
-    def move_actions(self, start_row, start_col, end_row, end_col):
-        """Выполняет ход в шахматах с учетом всех правил.
+    def is_legal_move(self, start_row, start_col, end_row, end_col, info=None):
+        """Проверяет, не оставляет ли возможный ход короля под шахом, без пробного хода.
+        
+        Обмен Оборотня не меняет занятость клеток, поэтому обмен с некоролевской фигурой
+        допустим, только если короля сейчас не шахуют, а обмен с королем - если клетку
+        Оборотня не бьет противник. Ход короля допустим, если клетку назначения не бьют
+        после снятия короля с прежней клетки. Остальные ходы должны снимать шах
+        (взятием или закрытием линии) и не уводить связанную фигуру с линии связки.
         
         Args:
             start_row (int): Начальная строка.
             start_col (int): Начальный столбец.
             end_row (int): Конечная строка.
             end_col (int): Конечный столбец.
+            info (tuple or None): Результат check_info для стороны фигуры (вычисляется, если не передан).
             
         Returns:
-            bool: True, если ход успешен, иначе False.
+            bool: True, если после хода король не под шахом.
         """
-        if not self.is_valid_move(start_row, start_col, end_row, end_col):
-            return False
+        board = self.board
+        figure = board[start_row][start_col]
+        if info is None:
+            info = self.check_info(figure.side)
+        king_pos, checks, pins = info
+        if king_pos is None:
+            return True
+        enemy = 'black' if figure.side == 'white' else 'white'
+        target_figure = board[end_row][end_col]
 
-        figure = self.get_figure(start_row, start_col)
-        if figure is None:
+        if isinstance(figure, WereWolf) and target_figure is not None and target_figure.side == figure.side:
+            if (end_row, end_col) == king_pos:
+                return not self.is_square_attacked(start_row, start_col, enemy)
+            return not checks
+
+        if (start_row, start_col) == king_pos:
+            # Снятие короля только открывает линии, поэтому клетка, которую уже бьют, остается под боем
+            if self.attack_maps[enemy][end_row][end_col]:
+                return False
+            # Король временно переставляется только в клетках доски (без ключа Зобриста, стека ходов и карт атак)
+            self.place(start_row, start_col, None)
+            self.place(end_row, end_col, figure)
+            is_attacked = self.is_square_attacked(end_row, end_col, enemy)
+            self.place(end_row, end_col, target_figure)
+            self.place(start_row, start_col, figure)
+            return not is_attacked
+
+        if checks and (len(checks) > 1 or (end_row, end_col) not in checks[0]):
             return False
+        pin_line = pins.get((start_row, start_col))
+        return pin_line is None or (end_row, end_col) in pin_line
+    
+    def generate_legal_moves(self, side):
+        """Возвращает все допустимые ходы стороны за один проход по доске.
+        
+        Шахи и связки находятся один раз для позиции (check_info), после чего каждый
+        возможный ход проверяется is_legal_move без пробного хода. Оборотень, как и
+        в is_valid_move, меняется местами только с соседними своими фигурами.
+        
+        Args:
+            side (str): Сторона ('white' или 'black').
+            
+        Returns:
+            list: Список кортежей (start_row, start_col, end_row, end_col).
+        """
+        own_figures = [(row, col, figure) for (row, col), figure in self.pieces[side].items()]
 
-        target_figure = self.get_figure(end_row, end_col)
+        info = self.check_info(side)
+        moves = []
 
-        if isinstance(figure, WereWolf):
-            if target_figure is not None and target_figure.side == figure.side:
-                self.board[start_row][start_col] = target_figure
-                self.board[end_row][end_col] = figure
-                figure.row, figure.col = end_row, end_col
-                target_figure.row, target_figure.col = start_row, start_col
+        for row, col, figure in own_figures:
+            if isinstance(figure, WereWolf):
+                candidates = figure.get_actions()
+            else:
+                candidates = []
+                for end_row, end_col in figure.get_actions():
+                    target_figure = self.board[end_row][end_col]
+                    if target_figure is None or target_figure.side != side:
+                        candidates.append((end_row, end_col))
+
+            for end_row, end_col in candidates:
+                if self.is_legal_move(row, col, end_row, end_col, info):
+                    moves.append((row, col, end_row, end_col))
+        return moves
+    
+    def make_move(self, start_row, start_col, end_row, end_col, switch_turn=True):
+        """Делает ход без проверки правил и кладет в стек данные для его отмены.
+        
+        Запоминаются взятая фигура, обмен Оборотня, превращение пешки и лайт-ладьи,
+        флаг первого хода пешки, очередь хода и счетчик ходов (карты атак обновляются в set_figure).
+        
+        Args:
+            start_row (int): Начальная строка.
+            start_col (int): Начальный столбец.
+            end_row (int): Конечная строка.
+            end_col (int): Конечный столбец.
+            switch_turn (bool): Передавать ли ход другой стороне.
+        """
+        figure = self.board[start_row][start_col]
+        target_figure = self.board[end_row][end_col]
+        swapped = isinstance(figure, WereWolf) and target_figure is not None and target_figure.side == figure.side
+        was_first_move = figure.is_first_move if isinstance(figure, Pawn) else None
+        self.move_stack.append((start_row, start_col, end_row, end_col, figure, target_figure, swapped,
+                                was_first_move, self.white_turn_active, self.turn_count,
+                                self.zobrist_key))
+
+        if swapped:
+            figure.swap(end_row, end_col)
         else:
-            self.board[end_row][end_col] = figure
-            self.board[start_row][start_col] = None
+            # Фигура снимается до смены флага первого хода, чтобы ключ Зобриста обновился верно
+            self.set_figure(start_row, start_col, None)
+            placed_figure = figure
+            last_row = 0 if figure.side == 'white' else 7
+            if isinstance(figure, Pawn):
+                figure.pawn_move(end_row, end_col)
+                if end_row == last_row:
+                    placed_figure = Queen(figure.side, self, end_row, end_col)
+            elif isinstance(figure, LiteRook) and end_row == last_row:
+                placed_figure = Rook(figure.side, self, end_row, end_col)
+            self.set_figure(end_row, end_col, placed_figure)
             figure.row, figure.col = end_row, end_col
 
-        if isinstance(figure, Pawn):
-            figure.pawn_move(end_row, end_col)
-            if (figure.side == 'white' and end_row == 0) or (figure.side == 'black' and end_row == 7):
-                self.board[end_row][end_col] = Queen(figure.side, self, end_row, end_col)
-                
-        if isinstance(figure, LiteRook):
-            if (figure.side == 'white' and end_row == 0) or (figure.side == 'black' and end_row == 7):
-                self.board[end_row][end_col] = Rook(figure.side, self, end_row, end_col)
-                
         self.turn_count += 1
-        print('\nХод выполнен успешно!')
-        print(f'Кол-во ходов: {self.turn_count}')
+        if switch_turn:
+            self.white_turn_active = 'black' if self.white_turn_active == 'white' else 'white'
+    
+    def unmake_move(self):
+        """Отменяет последний ход из стека, восстанавливая позицию за постоянное время."""
+        (start_row, start_col, end_row, end_col, figure, target_figure, swapped,
+         was_first_move, white_turn_active, turn_count, zobrist_key) = self.move_stack.pop()
+
+        self.set_figure(start_row, start_col, figure)
+        self.set_figure(end_row, end_col, target_figure)
+        figure.row, figure.col = start_row, start_col
+        if swapped:
+            target_figure.row, target_figure.col = end_row, end_col
+        if was_first_move is not None:
+            figure.is_first_move = was_first_move
+
+        self.white_turn_active = white_turn_active
+        self.turn_count = turn_count
+        self.zobrist_key = zobrist_key
+    
+    def try_move(self, start_row, start_col, end_row, end_col):
+        """Проверяет и, если он допустим, выполняет ход в шахматах без вывода в консоль.
+        
+        Очередь хода не передается: ее переключает вызывающий код (play).
+        
+        Args:
+            start_row (int): Начальная строка.
+            start_col (int): Начальный столбец.
+            end_row (int): Конечная строка.
+            end_col (int): Конечный столбец.
+            
+        Returns:
+            MoveResult: MOVE_MADE или MOVE_ILLEGAL с причиной.
+        """
+        result = self.validate_move(start_row, start_col, end_row, end_col)
+        if result.status != MOVE_LEGAL:
+            return result
+        self.make_move(start_row, start_col, end_row, end_col, switch_turn=False)
+        if result is LEGAL_RESULT:
+            return MADE_RESULT
+        return result._replace(status=MOVE_MADE)
+    
+    def move_actions(self, start_row, start_col, end_row, end_col):
+        """Выполняет ход в шахматах с учетом всех правил.
+        
+        Args:
+            start_row (int): Начальная строка.
+            start_col (int): Начальный столбец.
+            end_row (int): Конечная строка.
+            end_col (int): Конечный столбец.
+            
+        Returns:
+            bool: True, если ход успешен, иначе False.
+        """
+        result = self.try_move(start_row, start_col, end_row, end_col)
+        if not self.quiet:
+            self.render_result(result)
+        if result.status != MOVE_MADE:
+            return False
+        self.legal_moves_cache = None
         return True
     
 # класс шашек
 class CheckersBoard(Game):
     """Дочерний класс для игры в шашки, наследуемый от Game."""
     
-    def __init__(self):
-        """Инициализирует доску для шашек с расстановкой фигур."""
-        Game.__init__(self)
+    def __init__(self, backend='list', quiet=False):
+        """Инициализирует доску для шашек с расстановкой фигур.
+        
+        Args:
+            backend (str): Представление доски: 'list' или 'bitboard'.
+            quiet (bool): Тихий режим без вывода в консоль.
+        """
+        Game.__init__(self, backend, quiet)
         self.place_figures()
         
     def place_figures(self):
@@ -330,106 +1004,398 @@ class CheckersBoard(Game):
         for row in range(3):
             for col in range(8):
                 if (row + col) % 2 == 1:
-                    self.board[row][col] = PawnCheckers('black', self, row, col)
+                    self.set_figure(row, col, PawnCheckers('black', self, row, col))
         for row in range(5, 8):
             for col in range(8):
                 if (row + col) % 2 == 1:
-                    self.board[row][col] = PawnCheckers('white', self, row, col)
+                    self.set_figure(row, col, PawnCheckers('white', self, row, col))
     
-    def is_valid_move(self, start_row, start_col, end_row, end_col):
-        """Проверяет корректность хода в шашках.
+    def validate_move(self, start_row, start_col, end_row, end_col, *path):
+        """Проверяет ход в шашках без вывода в консоль.
         
         Args:
             start_row (int): Начальная строка.
             start_col (int): Начальный столбец.
             end_row (int): Конечная строка.
             end_col (int): Конечный столбец.
+            *path (int): Координаты следующих клеток приземления (row, col, ...) для серии взятий.
             
         Returns:
-            bool: True, если ход допустим, иначе False.
+            MoveResult: MOVE_LEGAL или MOVE_ILLEGAL с причиной.
         """
         figure = self.get_figure(start_row, start_col)
-        if figure is None or figure.side != self.white_turn_active:
-            return False
+        if figure is None:
+            return ILLEGAL_RESULTS[REASON_NO_FIGURE]
+        if figure.side != self.white_turn_active:
+            return ILLEGAL_RESULTS[REASON_NOT_YOUR_FIGURE]
+
+        if path:
+            move = (start_row, start_col, end_row, end_col) + path
+            if any(chain[:len(move)] == move for chain in self.capture_chains(start_row, start_col)):
+                return LEGAL_RESULT
+            return ILLEGAL_RESULTS[REASON_UNREACHABLE]
 
         figure_step = self.get_figure(end_row, end_col)
         if figure_step is not None and figure_step.side == figure.side:
-            return False
+            return ILLEGAL_RESULTS[REASON_OWN_FIGURE]
 
         valid_moves = figure.get_actions()
         if (end_row, end_col) not in valid_moves:
-            return False
+            return ILLEGAL_RESULTS[REASON_UNREACHABLE]
 
-        return True
+        return LEGAL_RESULT
     
-    def move_actions(self, start_row, start_col, end_row, end_col):
-        """Выполняет ход в шашках с учетом всех правил.
+    def is_valid_move(self, start_row, start_col, end_row, end_col, *path):
+        """Проверяет корректность хода в шашках.
         
         Args:
             start_row (int): Начальная строка.
             start_col (int): Начальный столбец.
             end_row (int): Конечная строка.
             end_col (int): Конечный столбец.
+            *path (int): Координаты следующих клеток приземления (row, col, ...) для серии взятий.
             
         Returns:
-            bool: True, если ход успешен, иначе False.
+            bool: True, если ход допустим, иначе False.
         """
-        if not self.is_valid_move(start_row, start_col, end_row, end_col):
-            return False
-
-        figure = self.get_figure(start_row, start_col)
-        if figure is None:
-            return False
+        return self.validate_move(start_row, start_col, end_row, end_col, *path).status == MOVE_LEGAL
+    
+    def is_jump(self, figure, end_row, end_col):
+        """Проверяет, является ли ход фигуры на клетку прыжком со взятием.
+        
+        Args:
+            figure (Figure): Шашка или дамка.
+            end_row (int): Конечная строка.
+            end_col (int): Конечный столбец.
+            
+        Returns:
+            bool: True, если при ходе снимается фигура противника.
+        """
+        if isinstance(figure, PawnCheckers):
+            return abs(end_row - figure.row) == 2
+        direction_row = 1 if end_row > figure.row else -1
+        direction_col = 1 if end_col > figure.col else -1
+        row, col = figure.row + direction_row, figure.col + direction_col
+        while row != end_row:
+            if self.board[row][col] is not None:
+                return True
+            row += direction_row
+            col += direction_col
+        return False
+    
+    def capture_chains(self, row, col):
+        """Возвращает все полные серии взятий фигуры (после которых бить больше нечего).
+        
+        Серия строится поиском в глубину: каждый прыжок делается make_step и отменяется
+        unmake_step, снятые фигуры сразу убираются с доски, а шашка, дошедшая до края,
+        продолжает бить как дамка. Продолжения запоминаются по состоянию приземления
+        (клетка, тип фигуры, множество снятых фигур), поэтому одинаковые состояния,
+        достигнутые разным порядком прыжков, перебираются один раз.
+        
+        Args:
+            row (int): Строка фигуры.
+            col (int): Столбец фигуры.
+            
+        Returns:
+            list: Кортежи (row, col, row1, col1, row2, col2, ...) от начальной клетки до последнего приземления.
+        """
+        # Состояние однозначно задает доску только для одной начальной клетки, поэтому словарь свой для каждой фигуры
+        memo = {}
+        return [(row, col) + continuation for continuation in self.capture_continuations(row, col, frozenset(), memo)]
+    
+    def capture_continuations(self, row, col, captured, memo):
+        """Перебирает продолжения серии взятий из текущего состояния приземления.
+        
+        Args:
+            row (int): Строка фигуры.
+            col (int): Столбец фигуры.
+            captured (frozenset): Клетки уже снятых в серии фигур.
+            memo (dict): Словарь запомненных продолжений.
+            
+        Returns:
+            list: Кортежи координат клеток приземления (пустой список, если бить нечего).
+        """
+        figure = self.board[row][col]
+        state = (row, col, type(figure), captured)
+        if state in memo:
+            return memo[state]
+        if self.bitboard is not None and not self.bitboard.can_jump(row * 8 + col):
+            # На битборде конец серии виден по маскам, без перебора ходов фигуры
+            memo[state] = []
+            return []
 
-        self.board[end_row][end_col] = figure
-        self.board[start_row][start_col] = None
-        figure.row, figure.col = end_row, end_col
+        continuations = []
+        for end_row, end_col in figure.get_actions():
+            if not self.is_jump(figure, end_row, end_col):
+                continue
+            step = self.make_step(row, col, end_row, end_col)
+            taken = step[5]
+            next_continuations = self.capture_continuations(end_row, end_col, captured | {(taken[0], taken[1])}, memo)
+            self.unmake_step(step)
+            if next_continuations:
+                continuations.extend((end_row, end_col) + continuation for continuation in next_continuations)
+            else:
+                continuations.append((end_row, end_col))
+        memo[state] = continuations
+        return continuations
+    
+    def generate_capture_sequences(self, side):
+        """Возвращает все полные серии взятий стороны.
+        
+        Args:
+            side (str): Сторона ('white' или 'black').
+            
+        Returns:
+            list: Кортежи (row, col, row1, col1, ...) с полными сериями взятий.
+        """
+        sequences = []
+        # Серии взятий строятся пробными прыжками, поэтому обходится копия списка фигур
+        for row, col in list(self.pieces[side]):
+            sequences.extend(self.capture_chains(row, col))
+        return sequences
+    
+    def generate_legal_moves(self, side):
+        """Возвращает все допустимые ходы стороны за один проход.
+        
+        Взятие необязательно, поэтому кроме полных серий взятий допустима и
+        остановка после любого прыжка серии.
+        
+        Args:
+            side (str): Сторона ('white' или 'black').
+            
+        Returns:
+            list: Кортежи (start_row, start_col, end_row, end_col) для простых ходов и одиночных
+            прыжков и (start_row, start_col, row1, col1, row2, col2, ...) для серий взятий.
+        """
+        moves = []
+        jumpers = []  # Клетки фигур, у которых есть взятие
+        if self.bitboard is not None:
+            # Ходы и взятия шашек считаются масками для всех шашек сразу, ходы дамок - обходом лучей
+            moves, jumper_mask = self.bitboard.checkers_men_moves(side)
+            for (row, col), figure in self.pieces[side].items():
+                if isinstance(figure, KingCheckers):
+                    moves.extend((row, col, end_row, end_col) for end_row, end_col in figure.get_actions())
+                    if self.bitboard.can_jump(row * 8 + col):
+                        jumper_mask |= 1 << (row * 8 + col)
+            jumpers = [divmod(square, 8) for square in iter_bits(jumper_mask)]
+        else:
+            for (row, col), figure in self.pieces[side].items():
+                has_jump = False
+                for end_row, end_col in figure.get_actions():
+                    moves.append((row, col, end_row, end_col))
+                    has_jump = has_jump or self.is_jump(figure, end_row, end_col)
+                if has_jump:
+                    jumpers.append((row, col))
 
-        if abs(start_row - end_row) == 2 and abs(start_col - end_col) == 2:
-            middle_row = (start_row + end_row) // 2
-            middle_col = (start_col + end_col) // 2
-            self.board[middle_row][middle_col] = None
+        # Серии взятий строятся пробными прыжками, поэтому строятся после обхода списка фигур
+        chains = set()
+        for row, col in jumpers:
+            for chain in self.capture_chains(row, col):
+                for length in range(6, len(chain) + 1, 2):
+                    if chain[:length] not in chains:
+                        chains.add(chain[:length])
+                        moves.append(chain[:length])
+        return moves
+    
+    def make_step(self, start_row, start_col, end_row, end_col):
+        """Перемещает фигуру на одну клетку приземления, снимая взятую фигуру и превращая шашку в дамку.
+        
+        Args:
+            start_row (int): Начальная строка.
+            start_col (int): Начальный столбец.
+            end_row (int): Конечная строка.
+            end_col (int): Конечный столбец.
             
+        Returns:
+            tuple: Данные для отмены (start_row, start_col, end_row, end_col, figure, captured),
+            где captured - (row, col, figure) снятой фигуры или None.
+        """
+        figure = self.board[start_row][start_col]
+        captured = None
+
         if isinstance(figure, KingCheckers):
             direction_row = 1 if end_row > start_row else -1
             direction_col = 1 if end_col > start_col else -1
             row, col = start_row + direction_row, start_col + direction_col
             while row != end_row or col != end_col:
-                target_figure = self.get_figure(row, col)
+                target_figure = self.board[row][col]
                 if target_figure is not None and target_figure.side != figure.side:
-                    self.board[row][col] = None
+                    captured = (row, col, target_figure)
                     break
                 row += direction_row
                 col += direction_col
+        elif abs(start_row - end_row) == 2 and abs(start_col - end_col) == 2:
+            middle_row = (start_row + end_row) // 2
+            middle_col = (start_col + end_col) // 2
+            captured = (middle_row, middle_col, self.board[middle_row][middle_col])
 
+        self.set_figure(start_row, start_col, None)
+        placed_figure = figure
         if isinstance(figure, PawnCheckers):
             figure.pawn_checkers_move(end_row, end_col)
             if (figure.side == 'white' and end_row == 0) or (figure.side == 'black' and end_row == 7):
-                self.board[end_row][end_col] = KingCheckers(figure.side, self, end_row, end_col)
+                placed_figure = KingCheckers(figure.side, self, end_row, end_col)
+        self.set_figure(end_row, end_col, placed_figure)
+        figure.row, figure.col = end_row, end_col
+        if captured is not None:
+            self.set_figure(captured[0], captured[1], None)
+        return (start_row, start_col, end_row, end_col, figure, captured)
+    
+    def unmake_step(self, step):
+        """Отменяет один шаг, сделанный make_step.
         
+        Args:
+            step (tuple): Данные, возвращенные make_step.
+        """
+        start_row, start_col, end_row, end_col, figure, captured = step
+        if captured is not None:
+            self.set_figure(captured[0], captured[1], captured[2])
+        self.set_figure(end_row, end_col, None)
+        self.set_figure(start_row, start_col, figure)
+        figure.row, figure.col = start_row, start_col
+    
+    def make_move(self, start_row, start_col, end_row, end_col, *path, switch_turn=True):
+        """Делает ход (или серию взятий) без проверки правил и кладет в стек данные для его отмены.
+        
+        Запоминаются снятые при прыжках фигуры, превращение шашки в дамку,
+        очередь хода и счетчик ходов.
+        
+        Args:
+            start_row (int): Начальная строка.
+            start_col (int): Начальный столбец.
+            end_row (int): Конечная строка.
+            end_col (int): Конечный столбец.
+            *path (int): Координаты следующих клеток приземления (row, col, ...) для серии взятий.
+            switch_turn (bool): Передавать ли ход другой стороне.
+        """
+        record = (self.white_turn_active, self.turn_count, self.zobrist_key)
+        squares = (start_row, start_col, end_row, end_col) + path
+        steps = tuple(self.make_step(*squares[i:i + 4]) for i in range(0, len(squares) - 2, 2))
+        self.move_stack.append((steps,) + record)
+
         self.turn_count += 1
-        print('\nХод выполнен успешно!')
-        print(f'Кол-во ходов: {self.turn_count}')
+        if switch_turn:
+            self.white_turn_active = 'black' if self.white_turn_active == 'white' else 'white'
+    
+    def unmake_move(self):
+        """Отменяет последний ход из стека, восстанавливая позицию за время, пропорциональное числу прыжков."""
+        steps, white_turn_active, turn_count, zobrist_key = self.move_stack.pop()
+
+        for step in reversed(steps):
+            self.unmake_step(step)
+
+        self.white_turn_active = white_turn_active
+        self.turn_count = turn_count
+        self.zobrist_key = zobrist_key
+    
+    def try_move(self, start_row, start_col, end_row, end_col, *path):
+        """Проверяет и, если он допустим, выполняет ход в шашках без вывода в консоль.
+        
+        Очередь хода не передается: ее переключает вызывающий код (play).
+        
+        Args:
+            start_row (int): Начальная строка.
+            start_col (int): Начальный столбец.
+            end_row (int): Конечная строка.
+            end_col (int): Конечный столбец.
+            *path (int): Координаты следующих клеток приземления (row, col, ...) для серии взятий.
+            
+        Returns:
+            MoveResult: MOVE_MADE со взятыми фигурами или MOVE_ILLEGAL с причиной.
+        """
+        result = self.validate_move(start_row, start_col, end_row, end_col, *path)
+        if result.status != MOVE_LEGAL:
+            return result
+        self.make_move(start_row, start_col, end_row, end_col, *path, switch_turn=False)
+        captured = tuple(step[5][2] for step in self.move_stack[-1][0] if step[5] is not None)
+        if not captured:
+            return MADE_RESULT
+        return MoveResult(MOVE_MADE, None, captured, ())
+    
+    def move_actions(self, start_row, start_col, end_row, end_col, *path):
+        """Выполняет ход в шашках с учетом всех правил.
+        
+        Args:
+            start_row (int): Начальная строка.
+            start_col (int): Начальный столбец.
+            end_row (int): Конечная строка.
+            end_col (int): Конечный столбец.
+            *path (int): Координаты следующих клеток приземления (row, col, ...) для серии взятий.
+            
+        Returns:
+            bool: True, если ход успешен, иначе False.
+        """
+        result = self.try_move(start_row, start_col, end_row, end_col, *path)
+        if not self.quiet:
+            self.render_result(result)
+        if result.status != MOVE_MADE:
+            return False
+        self.legal_moves_cache = None
         return True
     
+GAMES = {'chess': ChessBoard, 'checkers': CheckersBoard}  # Классы игр по имени в записях партий, протоколе и командной строке
+
+def move_to_text(move):
+    """Переводит ход в текстовую запись из координат клеток, например (6, 4, 4, 4) -> 'e7e5'.
+    
+    Args:
+        move (tuple): Кортеж координат (start_row, start_col, end_row, end_col, ...).
+        
+    Returns:
+        str: Запись хода в координатах, которые вводятся в play.
+    """
+    return ''.join(chr(ord('a') + move[i + 1]) + str(move[i] + 1) for i in range(0, len(move), 2))
+
+def text_to_move(text):
+    """Переводит текстовую запись хода ('e7e5') обратно в кортеж координат.
+    
+    Args:
+        text (str): Запись хода.
+        
+    Returns:
+        tuple: Кортеж координат (start_row, start_col, end_row, end_col, ...).
+        
+    Raises:
+        ValueError: Если запись некорректна.
+    """
+    if len(text) < 4 or len(text) % 2:
+        raise ValueError(f"Некорректная запись хода: {text}")
+    move = []
+    for i in range(0, len(text), 2):
+        col = ord(text[i].lower()) - ord('a')
+        row = int(text[i + 1]) - 1
+        if not (0 <= row < 8 and 0 <= col < 8):
+            raise ValueError(f"Некорректная запись хода: {text}")
+        move.extend((row, col))
+    return tuple(move)
+
 def main():
     """Запускает выбор игры и инициализирует игровой процесс."""
     print("Выберите игру:")
     print("1. Шахматы")
     print("2. Шашки")
+    print("3. Шахматы против компьютера")
+    print("4. Шашки против компьютера")
     choice = input("Введите номер: ")
 
+    engine = None
     if choice == '1':
         game = ChessBoard()
     elif choice == '2':
         game = CheckersBoard()
+    elif choice == '3':
+        game = ChessBoard()
+        engine = ChessEngine(game, time_limit=3)
+    elif choice == '4':
+        game = CheckersBoard()
+        engine = CheckersEngine(game, time_limit=3)
     elif choice.lower() == 'exit':
         exit()
     else:
         print("Некорректный ввод!")
         return
         
-    game.play()
+    game.play(engine)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,203 @@
+import struct
+
+from figure import *
+from main_game import ChessBoard, CheckersBoard
+
+# Буквы фигур в текстовой записи (заглавные - белые, строчные - черные)
+FEN_LETTERS = {King: 'k', Queen: 'q', Rook: 'r', Bishop: 'b', Night: 'n', Pawn: 'p', LiteRook: 'l',
+               Jumpman: 'j', WereWolf: 'w', PawnCheckers: 'm', KingCheckers: 'd'}
+FEN_TYPES = {letter: figure_type for figure_type, letter in FEN_LETTERS.items()}
+PAWN_START_ROWS = {'white': 6, 'black': 1}  # Пешка на этой строке по умолчанию еще не ходила
+
+# Двоичная запись позиции: 64 кода фигур по 5 бит (40 байт), флаги (бит 0 - ход черных,
+# бит 1 - шашки) и счетчик ходов - всего 43 байта
+POSITION_STRUCT = struct.Struct('<40sBH')
+POSITION_SIZE = POSITION_STRUCT.size
+BLACK_TO_MOVE_FLAG = 1
+CHECKERS_FLAG = 2
+CODE_BITS = 5
+CODE_MASK = (1 << CODE_BITS) - 1
+
+
+def square_name(row, col):
+    """Возвращает имя клетки, например (6, 4) -> 'e7'."""
+    return chr(ord('a') + col) + str(row + 1)
+
+def to_fen(game):
+    """Записывает позицию в текстовом виде, похожем на FEN.
+
+    Запись состоит из четырех полей через пробел: расстановка (строки доски от 1 до 8
+    через '/', цифра - число пустых клеток подряд), очередь хода ('w' или 'b'), пешки,
+    у которых флаг первого хода отличается от умолчания (по умолчанию не ходила только
+    пешка на своей начальной строке), или '-', и счетчик ходов.
+
+    Args:
+        game (Game): Позиция.
+
+    Returns:
+        str: Текстовая запись позиции.
+    """
+    rows = []
+    exceptions = []
+    for row in range(8):
+        text = ''
+        empty = 0
+        for col in range(8):
+            figure = game.board[row][col]
+            if figure is None:
+                empty += 1
+                continue
+            if empty:
+                text += str(empty)
+                empty = 0
+            letter = FEN_LETTERS[type(figure)]
+            text += letter.upper() if figure.side == 'white' else letter
+            if isinstance(figure, Pawn) and figure.is_first_move != (row == PAWN_START_ROWS[figure.side]):
+                exceptions.append(square_name(row, col))
+        if empty:
+            text += str(empty)
+        rows.append(text)
+    side = 'w' if game.white_turn_active == 'white' else 'b'
+    return f"{'/'.join(rows)} {side} {''.join(exceptions) or '-'} {game.turn_count}"
+
+def from_fen(text, game_class=ChessBoard, backend='list', quiet=False):
+    """Создает игру по текстовой записи to_fen.
+
+    Args:
+        text (str): Текстовая запись позиции.
+        game_class (type): ChessBoard или CheckersBoard.
+        backend (str): Представление доски: 'list' или 'bitboard'.
+        quiet (bool): Тихий режим без вывода в консоль.
+
+    Returns:
+        Game: Игра в указанной позиции.
+
+    Raises:
+        ValueError: Если запись некорректна.
+    """
+    fields = text.split()
+    if len(fields) != 4 or fields[1] not in ('w', 'b'):
+        raise ValueError(f"Некорректная запись позиции: {text}")
+    rows = fields[0].split('/')
+    if len(rows) != 8:
+        raise ValueError(f"Некорректная запись позиции: {text}")
+
+    game = game_class.empty(backend, quiet)
+    for row, row_text in enumerate(rows):
+        col = 0
+        for char in row_text:
+            if char.isdigit():
+                col += int(char)
+                continue
+            figure_type = FEN_TYPES.get(char.lower())
+            if figure_type is None or col > 7:
+                raise ValueError(f"Некорректная запись позиции: {text}")
+            figure = figure_type('white' if char.isupper() else 'black', game, row, col)
+            if isinstance(figure, Pawn):
+                figure.is_first_move = row == PAWN_START_ROWS[figure.side]
+            game.set_figure(row, col, figure)
+            col += 1
+        if col != 8:
+            raise ValueError(f"Некорректная запись позиции: {text}")
+
+    if fields[2] != '-':
+        # Поле исключений - пары клеток вида 'e2'; его форма проверяется до разбора клеток
+        squares = [fields[2][i:i + 2] for i in range(0, len(fields[2]), 2)]
+        if len(fields[2]) % 2 or any(square[0] not in 'abcdefgh' or square[1] not in '12345678' for square in squares):
+            raise ValueError(f"Некорректная запись позиции: {text}")
+        for square in squares:
+            row, col = int(square[1]) - 1, ord(square[0]) - ord('a')
+            figure = game.get_figure(row, col)
+            if not isinstance(figure, Pawn):
+                raise ValueError(f"Некорректная запись позиции: {text}")
+            # Фигура снимается и ставится заново, чтобы ключ Зобриста учел новый флаг
+            game.set_figure(row, col, None)
+            figure.is_first_move = not figure.is_first_move
+            game.set_figure(row, col, figure)
+
+    game.white_turn_active = 'white' if fields[1] == 'w' else 'black'
+    game.turn_count = int(fields[3])
+    return game
+
+def encode_position(game):
+    """Кодирует позицию в POSITION_SIZE байт.
+
+    Args:
+        game (Game): Позиция.
+
+    Returns:
+        bytes: Двоичная запись позиции.
+    """
+    packed = 0
+    for square, code in enumerate(pack_board(game)):
+        packed |= code << (square * CODE_BITS)
+    flags = (BLACK_TO_MOVE_FLAG if game.white_turn_active == 'black' else 0) | \
+            (CHECKERS_FLAG if isinstance(game, CheckersBoard) else 0)
+    return POSITION_STRUCT.pack(packed.to_bytes(40, 'little'), flags, game.turn_count)
+
+def unpack_codes(board_bytes):
+    """Распаковывает 40 байт расстановки в 64 кода фигур (в формате pack_board).
+
+    Args:
+        board_bytes (bytes): Поле расстановки двоичной записи.
+
+    Returns:
+        bytes: 64 кода фигур, индекс - row * 8 + col.
+    """
+    packed = int.from_bytes(board_bytes, 'little')
+    return bytes((packed >> (square * CODE_BITS)) & CODE_MASK for square in range(64))
+
+def decode_position(data, offset=0, backend='list', quiet=False):
+    """Создает игру по двоичной записи encode_position.
+
+    Args:
+        data (bytes or memoryview): Буфер с записью.
+        offset (int): Смещение записи в буфере.
+        backend (str): Представление доски: 'list' или 'bitboard'.
+        quiet (bool): Тихий режим без вывода в консоль.
+
+    Returns:
+        Game: ChessBoard или CheckersBoard (по флагу записи).
+    """
+    board_bytes, flags, turn_count = POSITION_STRUCT.unpack_from(data, offset)
+    game_class = CheckersBoard if flags & CHECKERS_FLAG else ChessBoard
+    return game_class.from_snapshot((unpack_codes(board_bytes), 'black' if flags & BLACK_TO_MOVE_FLAG else 'white',
+                                     turn_count), backend, quiet)
+
+def encode_positions(games):
+    """Кодирует много позиций в один буфер записей фиксированной длины.
+
+    Args:
+        games (iterable): Позиции.
+
+    Returns:
+        bytes: Записи подряд, по POSITION_SIZE байт каждая.
+    """
+    return b''.join(encode_position(game) for game in games)
+
+def iter_position_records(buffer):
+    """Перебирает записи буфера без создания игр.
+
+    Args:
+        buffer (bytes, memoryview или mmap): Буфер записей encode_positions.
+
+    Yields:
+        tuple: Кортеж (codes, black_to_move, is_checkers, turn_count), где codes - 64 кода фигур.
+    """
+    for board_bytes, flags, turn_count in POSITION_STRUCT.iter_unpack(memoryview(buffer)):
+        yield unpack_codes(board_bytes), bool(flags & BLACK_TO_MOVE_FLAG), bool(flags & CHECKERS_FLAG), turn_count
+
+def decode_positions(buffer, backend='list', quiet=False):
+    """Лениво создает игры из буфера записей.
+
+    Args:
+        buffer (bytes, memoryview или mmap): Буфер записей encode_positions.
+        backend (str): Представление доски: 'list' или 'bitboard'.
+        quiet (bool): Тихий режим без вывода в консоль.
+
+    Yields:
+        Game: Очередная позиция.
+    """
+    view = memoryview(buffer)
+    for offset in range(0, len(view) - len(view) % POSITION_SIZE, POSITION_SIZE):
+        yield decode_position(view, offset, backend, quiet)
@@ -0,0 +1,140 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from main_game import GAMES, move_to_text
+from notation import from_fen
+
+# Эталонные числа листьев из начальных позиций place_figures (ход белых)
+REFERENCE_COUNTS = {
+    'chess': {1: 27, 2: 698, 3: 19275, 4: 507463},
+    'checkers': {1: 7, 2: 49, 3: 379, 4: 2900, 5: 24029, 6: 197410},
+}
+
+
+def perft(game, depth):
+    """Считает число листьев дерева допустимых ходов заданной глубины.
+
+    Args:
+        game (Game): Позиция (ход стороны game.white_turn_active).
+        depth (int): Глубина в полуходах.
+
+    Returns:
+        int: Число позиций на глубине depth.
+    """
+    if depth == 0:
+        return 1
+    moves = game.generate_legal_moves(game.white_turn_active)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        game.make_move(*move)
+        nodes += perft(game, depth - 1)
+        game.unmake_move()
+    return nodes
+
+def perft_root_move(task):
+    """Считает perft после одного корневого хода (задача для пула процессов).
+
+    Args:
+        task (tuple): Кортеж (game, move, depth).
+
+    Returns:
+        tuple: Кортеж (move, nodes).
+    """
+    game, move, depth = task
+    game.make_move(*move)
+    return move, perft(game, depth - 1)
+
+def divide(game, depth, processes=1):
+    """Считает perft отдельно для каждого корневого хода.
+
+    Args:
+        game (Game): Позиция.
+        depth (int): Глубина в полуходах (не меньше 1).
+        processes (int): Число процессов; при значении больше 1 корневые ходы делятся между ними.
+
+    Returns:
+        dict: Словарь {ход: число листьев} в порядке генерации ходов.
+    """
+    moves = game.generate_legal_moves(game.white_turn_active)
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = dict(executor.map(perft_root_move, [(game, move, depth) for move in moves]))
+        return {move: results[move] for move in moves}
+
+    results = {}
+    for move in moves:
+        game.make_move(*move)
+        results[move] = perft(game, depth - 1)
+        game.unmake_move()
+    return results
+
+def run_perft(game, depth, processes=1, show_divide=False):
+    """Запускает perft, печатает результат и скорость в узлах в секунду.
+
+    Args:
+        game (Game): Позиция.
+        depth (int): Глубина в полуходах.
+        processes (int): Число процессов.
+        show_divide (bool): Печатать ли число листьев для каждого корневого хода.
+
+    Returns:
+        int: Число листьев.
+    """
+    start = time.perf_counter()
+    if depth == 0:
+        nodes = 1
+    else:
+        results = divide(game, depth, processes)
+        nodes = sum(results.values())
+        if show_divide:
+            for move, count in results.items():
+                print(f'{move_to_text(move)}: {count}')
+    elapsed = time.perf_counter() - start
+    speed = nodes / elapsed if elapsed > 0 else 0
+    print(f'perft({depth}) = {nodes}  время: {elapsed:.3f} с  скорость: {speed:.0f} узлов/с')
+    return nodes
+
+def check_reference(game_name, max_depth=None, processes=1):
+    """Сверяет perft из начальной позиции с эталонными значениями.
+
+    Args:
+        game_name (str): 'chess' или 'checkers'.
+        max_depth (int or None): Максимальная проверяемая глубина.
+        processes (int): Число процессов.
+
+    Returns:
+        bool: True, если все числа совпали с эталоном.
+    """
+    all_ok = True
+    for depth, expected in sorted(REFERENCE_COUNTS[game_name].items()):
+        if max_depth is not None and depth > max_depth:
+            break
+        nodes = run_perft(GAMES[game_name](), depth, processes)
+        if nodes != expected:
+            print(f'Ошибка: ожидалось {expected}, получено {nodes}')
+            all_ok = False
+    return all_ok
+
+def main():
+    """Разбирает аргументы командной строки и запускает perft."""
+    parser = argparse.ArgumentParser(description='Perft: подсчет позиций дерева ходов и скорости генерации ходов')
+    parser.add_argument('game', choices=sorted(GAMES), help='игра')
+    parser.add_argument('depth', type=int, nargs='?', default=3, help='глубина в полуходах')
+    parser.add_argument('--divide', action='store_true', help='вывести число листьев для каждого корневого хода')
+    parser.add_argument('--processes', type=int, default=1, help='число процессов для корневых ходов')
+    parser.add_argument('--check', action='store_true', help='сверить с эталонными значениями до указанной глубины')
+    parser.add_argument('--fen', default=None, help='позиция в записи notation.to_fen (по умолчанию начальная)')
+    args = parser.parse_args()
+
+    if args.check:
+        ok = check_reference(args.game, args.depth, args.processes)
+        print('Эталон совпадает' if ok else 'Эталон НЕ совпадает')
+        raise SystemExit(0 if ok else 1)
+    game = from_fen(args.fen, GAMES[args.game]) if args.fen else GAMES[args.game]()
+    run_perft(game, args.depth, args.processes, args.divide)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import argparse
+import threading
+import time
+from functools import wraps
+
+from figure import FIGURE_TYPES
+from engine import ChessEngine, CheckersEngine, SearchEngine
+from main_game import ChessBoard, CheckersBoard
+from records import open_records, write_record
+from selfplay import play_game
+
+# Замеряемые методы: (класс, имя метода, метка в снимке). Для фигур метка содержит класс,
+# чтобы было видно, какая фигура дороже всего обходится генерации ходов. Самоигра и поиск
+# проходят через make_move/unmake_move и generate_legal_moves, а те - через check_info,
+# is_legal_move и capture_chains; время вложенных вызовов входит и во внешние метки
+TIMED_METHODS = [(figure_type, 'get_actions', f'get_actions:{figure_type.__name__}')
+                 for figure_type in FIGURE_TYPES] + [
+    (ChessBoard, 'king_in_check', 'king_in_check'),
+    (ChessBoard, 'find_king', 'find_king'),
+    (ChessBoard, 'check_info', 'check_info'),
+    (ChessBoard, 'is_legal_move', 'is_legal_move'),
+    (ChessBoard, 'is_square_attacked', 'is_square_attacked'),
+    (CheckersBoard, 'capture_chains', 'capture_chains'),
+    (ChessBoard, 'generate_legal_moves', 'generate_legal_moves:chess'),
+    (CheckersBoard, 'generate_legal_moves', 'generate_legal_moves:checkers'),
+    (ChessBoard, 'make_move', 'make_move:chess'),
+    (CheckersBoard, 'make_move', 'make_move:checkers'),
+    (ChessBoard, 'unmake_move', 'unmake_move:chess'),
+    (CheckersBoard, 'unmake_move', 'unmake_move:checkers'),
+    (ChessBoard, 'is_valid_move', 'is_valid_move:chess'),
+    (CheckersBoard, 'is_valid_move', 'is_valid_move:checkers'),
+    (ChessBoard, 'move_actions', 'move_actions:chess'),
+    (CheckersBoard, 'move_actions', 'move_actions:checkers'),
+]
+SEARCH_ENGINES = (ChessEngine, CheckersEngine)
+
+
+class Profiler:
+    """Счетчики вызовов и таймеры горячих методов игры.
+
+    Пока профилировщик выключен, методы классов не тронуты и замеры ничего не стоят;
+    enable подменяет их обертками, disable возвращает исходные. Счетчики узлов поиска
+    пополняются после каждого SearchEngine.search.
+    """
+
+    def __init__(self, methods=None):
+        """Инициализирует профилировщик.
+
+        Args:
+            methods (list or None): Замеряемые методы (класс, имя, метка); по умолчанию TIMED_METHODS.
+        """
+        self.methods = TIMED_METHODS if methods is None else methods
+        self.timers = {label: [0, 0.0] for _, _, label in self.methods}  # метка -> [вызовы, секунды]
+        self.counters = {f'nodes:{engine.__name__}': 0 for engine in SEARCH_ENGINES}
+        self.originals = []
+        self.dump_thread = None
+        self.dump_stop = None
+
+    @property
+    def enabled(self):
+        """Включен ли профилировщик."""
+        return bool(self.originals)
+
+    def timed(self, function, stats):
+        """Оборачивает функцию подсчетом вызовов и времени в stats."""
+        perf_counter = time.perf_counter
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stats[0] += 1
+                stats[1] += perf_counter() - start
+        return wrapper
+
+    def counted_search(self, function):
+        """Оборачивает SearchEngine.search подсчетом узлов."""
+        counters = self.counters
+
+        @wraps(function)
+        def wrapper(engine, *args, **kwargs):
+            try:
+                return function(engine, *args, **kwargs)
+            finally:
+                label = f'nodes:{type(engine).__name__}'
+                if label in counters:
+                    counters[label] += engine.nodes
+        return wrapper
+
+    def enable(self):
+        """Подменяет замеряемые методы обертками (повторный вызов ничего не делает)."""
+        if self.enabled:
+            return
+        for owner, name, label in self.methods:
+            function = owner.__dict__.get(name)
+            if function is None:
+                continue
+            self.originals.append((owner, name, function))
+            setattr(owner, name, self.timed(function, self.timers[label]))
+        self.originals.append((SearchEngine, 'search', SearchEngine.search))
+        SearchEngine.search = self.counted_search(SearchEngine.search)
+
+    def disable(self):
+        """Возвращает исходные методы."""
+        for owner, name, function in reversed(self.originals):
+            setattr(owner, name, function)
+        self.originals = []
+
+    def reset(self):
+        """Обнуляет счетчики и таймеры."""
+        for stats in self.timers.values():
+            stats[0], stats[1] = 0, 0.0
+        for label in self.counters:
+            self.counters[label] = 0
+
+    def snapshot(self):
+        """Возвращает текущие значения счетчиков и таймеров.
+
+        Returns:
+            dict: {'time': время снимка, 'timers': {метка: {'calls', 'seconds', 'mean_us'}},
+            'counters': {метка: значение}}; таймеры без вызовов не включаются.
+        """
+        timers = {}
+        for label, (calls, seconds) in self.timers.items():
+            if calls:
+                timers[label] = {'calls': calls, 'seconds': round(seconds, 6),
+                                 'mean_us': round(seconds / calls * 1e6, 3)}
+        return {'time': time.time(), 'timers': timers, 'counters': dict(self.counters)}
+
+    def start_dump(self, path, interval=10.0):
+        """Начинает периодически дописывать снимки строками JSON в файл (в фоновом потоке).
+
+        Args:
+            path (str): Файл снимков (.jsonl или .jsonl.gz).
+            interval (float): Период в секундах.
+        """
+        self.stop_dump()
+        self.dump_stop = threading.Event()
+        self.dump_thread = threading.Thread(target=self.dump_loop, args=(path, interval, self.dump_stop), daemon=True)
+        self.dump_thread.start()
+
+    def dump_loop(self, path, interval, stop):
+        """Цикл фонового потока: снимок каждые interval секунд и последний снимок при остановке."""
+        with open_records(path, 'a') as stream:
+            while not stop.wait(interval):
+                write_record(stream, self.snapshot())
+                stream.flush()
+            write_record(stream, self.snapshot())
+
+    def stop_dump(self):
+        """Останавливает периодическую запись снимков."""
+        if self.dump_thread is not None:
+            self.dump_stop.set()
+            self.dump_thread.join()
+            self.dump_thread = None
+            self.dump_stop = None
+
+    def report(self):
+        """Возвращает текстовую таблицу таймеров по убыванию общего времени и счетчики."""
+        snapshot = self.snapshot()
+        lines = [f"{'метка':<32} {'вызовы':>10} {'секунды':>10} {'мкс/вызов':>10}"]
+        for label, stats in sorted(snapshot['timers'].items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f"{label:<32} {stats['calls']:>10} {stats['seconds']:>10.3f} {stats['mean_us']:>10.2f}")
+        for label, value in snapshot['counters'].items():
+            if value:
+                lines.append(f'{label:<32} {value:>10}')
+        return '\n'.join(lines)
+
+    def __enter__(self):
+        """Включает профилировщик на время блока with."""
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Выключает профилировщик и останавливает запись снимков."""
+        self.stop_dump()
+        self.disable()
+
+def main():
+    """Профилирует партии самоигры в одном процессе и печатает таблицу замеров."""
+    parser = argparse.ArgumentParser(description='Профилирование партий самоигры')
+    parser.add_argument('game', choices=('chess', 'checkers'), help='игра')
+    parser.add_argument('games', type=int, help='число партий')
+    parser.add_argument('--white', default='random', help="стратегия белых: random, greedy, engine[:depth=N,nodes=N,seconds=S]")
+    parser.add_argument('--black', default='random', help='стратегия черных')
+    parser.add_argument('--seed', type=int, default=0, help='начальное зерно')
+    parser.add_argument('--max-plies', type=int, default=200, help='предел полуходов')
+    parser.add_argument('--dump', default=None, help='файл периодических снимков (.jsonl)')
+    parser.add_argument('--interval', type=float, default=10.0, help='период снимков в секундах')
+    args = parser.parse_args()
+
+    with Profiler() as profiler:
+        if args.dump is not None:
+            profiler.start_dump(args.dump, args.interval)
+        for index in range(args.games):
+            play_game((index, args.game, args.white, args.black, args.seed + index, args.max_plies))
+    print(profiler.report())
+
+if __name__ == "__main__":
+    main()
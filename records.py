@@ -0,0 +1,100 @@
+import gzip
+import json
+
+from main_game import text_to_move
+
+
+def open_records(path, mode='r'):
+    """Открывает файл записей партий (со сжатием gzip, если имя оканчивается на .gz).
+
+    Args:
+        path (str): Путь к файлу.
+        mode (str): 'r' для чтения, 'w' для записи, 'a' для дозаписи.
+
+    Returns:
+        file: Текстовый файловый объект.
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+def write_record(stream, record):
+    """Записывает одну партию строкой JSON.
+
+    Args:
+        stream (file): Открытый на запись файл.
+        record (dict): Запись партии (game, moves, winner, plies и т.д.); ходы - строка
+            записей вида 'e7e5', разделенных пробелами.
+    """
+    stream.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+    stream.write('\n')
+
+def read_records(path):
+    """Лениво читает записи партий по одной, не загружая файл целиком.
+
+    Строка, которая не разбирается как JSON или содержит не объект, не обрывает чтение:
+    вместо нее выдается None, чтобы номера следующих записей не сдвигались.
+
+    Args:
+        path (str): Путь к файлу.
+
+    Yields:
+        dict or None: Запись партии или None для испорченной строки.
+    """
+    with open_records(path) as stream:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield record if isinstance(record, dict) else None
+
+def record_moves(record):
+    """Возвращает ходы записи партии в текстовом виде.
+
+    Ходы могут быть строкой через пробел ('e7e5 e2e4'), списком строк или списком пар
+    клеток (['e7', 'e5']), как их вводят в play.
+
+    Args:
+        record (dict): Запись партии.
+
+    Returns:
+        list: Записи ходов вида 'e7e5'.
+
+    Raises:
+        ValueError: Если поле 'moves' не строка и не список строк или списков клеток.
+    """
+    moves = record.get('moves', '')
+    if isinstance(moves, str):
+        return moves.split()
+    if not isinstance(moves, list):
+        raise ValueError(f"Некорректное поле ходов: {moves!r}")
+    texts = []
+    for move in moves:
+        if isinstance(move, list) and all(isinstance(square, str) for square in move):
+            move = ''.join(move)
+        if not isinstance(move, str):
+            raise ValueError(f"Некорректный ход: {move!r}")
+        texts.append(move)
+    return texts
+
+def parse_move(text, game_name):
+    """Переводит запись хода в кортеж координат и проверяет, что ход подходит игре.
+
+    Args:
+        text (str): Запись хода вида 'e7e5' (в шашках - и серия взятий 'c3e5g7').
+        game_name (str): 'chess' или 'checkers'.
+
+    Returns:
+        tuple: Кортеж координат (start_row, start_col, end_row, end_col, ...).
+
+    Raises:
+        ValueError: Если запись некорректна или шахматный ход состоит не из двух клеток.
+    """
+    move = text_to_move(text)
+    if game_name == 'chess' and len(move) != 4:
+        raise ValueError(f"Шахматный ход должен состоять из двух клеток: {text}")
+    return move
@@ -0,0 +1,209 @@
+import argparse
+import os
+import random
+import time
+from multiprocessing import Pool
+
+from engine import ChessEngine, CheckersEngine
+from main_game import GAMES, ChessBoard, move_to_text
+from records import open_records, write_record
+
+ENGINES = {'chess': ChessEngine, 'checkers': CheckersEngine}
+
+
+class RandomPolicy:
+    """Стратегия, выбирающая случайный допустимый ход."""
+
+    def __init__(self, game, rng):
+        """Инициализирует стратегию.
+
+        Args:
+            game (Game): Игра.
+            rng (random.Random): Генератор случайных чисел.
+        """
+        self.game = game
+        self.rng = rng
+
+    def choose(self, moves):
+        """Выбирает ход из списка допустимых."""
+        return self.rng.choice(moves)
+
+class GreedyPolicy(RandomPolicy):
+    """Стратегия, выбирающая ход с лучшей оценкой позиции после него (глубина 1)."""
+
+    def __init__(self, game, rng):
+        """Инициализирует стратегию и оценщик позиции."""
+        RandomPolicy.__init__(self, game, rng)
+        self.evaluator = ENGINES['chess' if isinstance(game, ChessBoard) else 'checkers'](game)
+
+    def choose(self, moves):
+        """Выбирает ход с лучшей оценкой (при равенстве - случайный из лучших)."""
+        best_score = None
+        best_moves = []
+        for move in moves:
+            self.game.make_move(*move)
+            score = -self.evaluator.evaluate()
+            self.game.unmake_move()
+            if best_score is None or score > best_score:
+                best_score = score
+                best_moves = [move]
+            elif score == best_score:
+                best_moves.append(move)
+        return self.rng.choice(best_moves)
+
+class EnginePolicy(RandomPolicy):
+    """Стратегия, выбирающая ход поиском движка."""
+
+    def __init__(self, game, rng, depth=3, nodes=None, seconds=None):
+        """Инициализирует стратегию.
+
+        Args:
+            game (Game): Игра.
+            rng (random.Random): Генератор случайных чисел.
+            depth (int): Максимальная глубина поиска.
+            nodes (int or None): Ограничение узлов на ход.
+            seconds (float or None): Ограничение времени на ход.
+        """
+        RandomPolicy.__init__(self, game, rng)
+        engine_class = ENGINES['chess' if isinstance(game, ChessBoard) else 'checkers']
+        self.engine = engine_class(game, max_depth=depth, node_limit=nodes, time_limit=seconds, tt_size=1 << 16)
+
+    def choose(self, moves):
+        """Выбирает ход поиском."""
+        return self.engine.search()
+
+def make_policy(spec, game, rng):
+    """Создает стратегию по описанию.
+
+    Args:
+        spec (str): 'random', 'greedy' или 'engine[:depth=N,nodes=N,seconds=S]'.
+        game (Game): Игра.
+        rng (random.Random): Генератор случайных чисел.
+
+    Returns:
+        RandomPolicy: Стратегия.
+
+    Raises:
+        ValueError: Если описание некорректно.
+    """
+    name, _, options = spec.partition(':')
+    if name == 'random':
+        return RandomPolicy(game, rng)
+    if name == 'greedy':
+        return GreedyPolicy(game, rng)
+    if name == 'engine':
+        kwargs = {}
+        for option in filter(None, options.split(',')):
+            key, _, value = option.partition('=')
+            if key not in ('depth', 'nodes', 'seconds'):
+                raise ValueError(f"Неизвестный параметр движка: {key}")
+            kwargs[key] = float(value) if key == 'seconds' else int(value)
+        return EnginePolicy(game, rng, **kwargs)
+    raise ValueError(f"Неизвестная стратегия: {spec}")
+
+def game_over(game, moves):
+    """Определяет результат позиции без допустимых ходов.
+
+    Args:
+        game (Game): Позиция.
+        moves (list): Допустимые ходы стороны, чей ход.
+
+    Returns:
+        tuple or None: (победитель или 'draw', причина) или None, если игра продолжается.
+    """
+    if moves:
+        return None
+    side = game.white_turn_active
+    winner = 'black' if side == 'white' else 'white'
+    if isinstance(game, ChessBoard):
+        if game.king_in_check(side):
+            return winner, 'checkmate'
+        return 'draw', 'stalemate'
+    return winner, 'no_moves'
+
+def play_game(task):
+    """Играет одну партию без ввода-вывода (задача для пула процессов).
+
+    Args:
+        task (tuple): Кортеж (номер партии, игра, стратегия белых, стратегия черных, зерно, предел полуходов).
+
+    Returns:
+        dict: Запись партии.
+    """
+    game_id, game_name, white_spec, black_spec, seed, max_plies = task
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    game = GAMES[game_name]()
+    policies = {'white': make_policy(white_spec, game, rng), 'black': make_policy(black_spec, game, rng)}
+    played = []
+    seen = {}
+    winner, reason = 'draw', 'max_plies'
+
+    while len(played) < max_plies:
+        key = game.position_key()
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] >= 3:
+            winner, reason = 'draw', 'repetition'
+            break
+        moves = game.generate_legal_moves(game.white_turn_active)
+        result = game_over(game, moves)
+        if result is not None:
+            winner, reason = result
+            break
+        move = policies[game.white_turn_active].choose(moves)
+        game.make_move(*move)
+        played.append(move_to_text(move))
+
+    return {
+        'id': game_id,
+        'game': game_name,
+        'white': white_spec,
+        'black': black_spec,
+        'seed': seed,
+        'winner': winner,
+        'reason': reason,
+        'plies': len(played),
+        'seconds': round(time.perf_counter() - start, 4),
+        'moves': ' '.join(played),
+    }
+
+def run_selfplay(game_name, games, output, white='random', black='random', processes=None, seed=0, max_plies=200):
+    """Играет партии на пуле процессов и по мере завершения дописывает их в файл.
+
+    Args:
+        game_name (str): 'chess' или 'checkers'.
+        games (int): Число партий.
+        output (str): Файл результатов (JSON Lines, со сжатием gzip для имени .gz).
+        white (str): Стратегия белых.
+        black (str): Стратегия черных.
+        processes (int or None): Число процессов (по умолчанию - все ядра).
+        seed (int): Начальное зерно; партия i играется с зерном seed + i.
+        max_plies (int): Предел полуходов, после которого партия считается ничьей.
+
+    Returns:
+        dict: Счет {'white': n, 'black': n, 'draw': n}.
+    """
+    tasks = [(index, game_name, white, black, seed + index, max_plies) for index in range(games)]
+    score = {'white': 0, 'black': 0, 'draw': 0}
+    with Pool(processes or os.cpu_count()) as pool, open_records(output, 'w') as stream:
+        for record in pool.imap_unordered(play_game, tasks, chunksize=max(1, games // (64 * (processes or os.cpu_count())))):
+            write_record(stream, record)
+            score[record['winner']] += 1
+    return score
+
+def main():
+    """Разбирает аргументы командной строки и запускает самоигру."""
+    parser = argparse.ArgumentParser(description='Самоигра: много партий параллельно без вывода в консоль')
+    parser.add_argument('game', choices=sorted(GAMES), help='игра')
+    parser.add_argument('games', type=int, help='число партий')
+    parser.add_argument('output', help='файл результатов (.jsonl или .jsonl.gz)')
+    parser.add_argument('--white', default='random', help="стратегия белых: random, greedy, engine[:depth=N,nodes=N,seconds=S]")
+    parser.add_argument('--black', default='random', help='стратегия черных')
+    parser.add_argument('--processes', type=int, default=None, help='число процессов (по умолчанию все ядра)')
+    parser.add_argument('--seed', type=int, default=0, help='начальное зерно')
+    parser.add_argument('--max-plies', type=int, default=200, help='предел полуходов')
+    args = parser.parse_args()
+    run_selfplay(args.game, args.games, args.output, args.white, args.black, args.processes, args.seed, args.max_plies)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+import argparse
+import asyncio
+import itertools
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from main_game import GAMES, MOVE_MADE, move_to_text, text_to_move
+from notation import to_fen
+from selfplay import ENGINES, game_over
+
+# Строчный протокол: одна команда - одна строка ответа, начинающаяся с OK или ERR.
+#   NEW chess|checkers       -> OK <id>
+#   BOARD <id>               -> OK <позиция в записи notation.to_fen>
+#   MOVES <id>               -> OK <ход> <ход> ...
+#   MOVE <id> <ход>          -> OK <состояние>
+#   ENGINE <id> [глубина]    -> OK <ход> <состояние>
+#   CLOSE <id>               -> OK
+#   QUIT                     -> OK (соединение закрывается)
+# Состояние: 'play white|black' или 'over white|black|draw <причина>'.
+# Партия доступна только соединению, которое ее создало, и удаляется после его закрытия.
+MAX_LINE = 4096
+
+
+class ProtocolError(Exception):
+    """Ошибка команды клиента; текст уходит клиенту в ответе ERR."""
+
+class Session:
+    """Партия на сервере: игра в тихом режиме и кэш допустимых ходов текущего хода."""
+
+    def __init__(self, game_name):
+        """Создает партию в начальной позиции.
+
+        Args:
+            game_name (str): 'chess' или 'checkers'.
+        """
+        self.game_name = game_name
+        self.game = GAMES[game_name](quiet=True)
+        self.lock = asyncio.Lock()  # Ход клиента не выполняется, пока для партии считает движок
+        self.moves = None  # Допустимые ходы текущего хода; None - нужно пересчитать
+        self.result = None  # (победитель, причина) после окончания партии
+
+    def legal_moves(self):
+        """Возвращает допустимые ходы стороны, чей ход (один раз за ход)."""
+        if self.moves is None:
+            self.moves = self.game.generate_legal_moves(self.game.white_turn_active)
+        return self.moves
+
+    def play(self, move):
+        """Проверяет и выполняет ход, передает очередь и проверяет окончание партии.
+
+        Args:
+            move (tuple): Кортеж координат хода.
+
+        Raises:
+            ProtocolError: Если партия окончена или ход недопустим.
+        """
+        if self.result is not None:
+            raise ProtocolError('game_over')
+        side = self.game.white_turn_active
+        result = self.game.try_move(*move)
+        if result.status != MOVE_MADE:
+            raise ProtocolError(f'illegal {result.reason}')
+        self.game.white_turn_active = 'black' if side == 'white' else 'white'
+        self.moves = None
+        self.result = game_over(self.game, self.legal_moves())
+
+    def status(self):
+        """Возвращает состояние партии в формате протокола."""
+        if self.result is not None:
+            return f'over {self.result[0]} {self.result[1]}'
+        return f'play {self.game.white_turn_active}'
+
+def engine_move(task):
+    """Ищет ход движком (задача для пула процессов).
+
+    Args:
+        task (tuple): Кортеж (игра, снимок позиции Game.snapshot, глубина, предел времени).
+
+    Returns:
+        tuple or None: Лучший ход или None, если ходов нет.
+    """
+    game_name, snapshot, depth, seconds = task
+    game = GAMES[game_name].from_snapshot(snapshot, quiet=True)
+    return ENGINES[game_name](game, max_depth=depth, time_limit=seconds, tt_size=1 << 16).search()
+
+class GameServer:
+    """Асинхронный сервер многих партий.
+
+    Все партии живут в одном цикле событий; проверка и выполнение ходов занимают
+    доли миллисекунды и делаются прямо в нем, а поиск движка уходит в пул процессов,
+    чтобы не останавливать обслуживание остальных клиентов.
+    """
+
+    def __init__(self, workers=None, engine_depth=3, engine_seconds=1.0):
+        """Инициализирует сервер.
+
+        Args:
+            workers (int or None): Число процессов движка (по умолчанию - все ядра).
+            engine_depth (int): Наибольшая глубина поиска, которую может запросить клиент.
+            engine_seconds (float): Предел времени поиска на ход.
+        """
+        self.executor = ProcessPoolExecutor(workers)
+        self.engine_depth = engine_depth
+        self.engine_seconds = engine_seconds
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+        self.commands = {
+            'NEW': self.command_new,
+            'BOARD': self.command_board,
+            'MOVES': self.command_moves,
+            'MOVE': self.command_move,
+            'ENGINE': self.command_engine,
+            'CLOSE': self.command_close,
+        }
+
+    def session(self, args, owned):
+        """Возвращает партию по первому аргументу команды.
+
+        Соединение видит только созданные им партии, поэтому чужую партию нельзя
+        изменить или закрыть, подобрав ее номер.
+
+        Raises:
+            ProtocolError: Если аргумента нет или у соединения нет партии с таким номером.
+        """
+        if not args:
+            raise ProtocolError('missing_session')
+        if args[0] not in owned:
+            raise ProtocolError('unknown_session')
+        return self.sessions[args[0]]
+
+    async def command_new(self, args, owned):
+        """NEW chess|checkers: создает партию."""
+        if len(args) != 1 or args[0] not in GAMES:
+            raise ProtocolError('unknown_game')
+        session_id = str(next(self.session_ids))
+        self.sessions[session_id] = Session(args[0])
+        owned.add(session_id)
+        return session_id
+
+    async def command_board(self, args, owned):
+        """BOARD <id>: позиция в текстовой записи."""
+        return to_fen(self.session(args, owned).game)
+
+    async def command_moves(self, args, owned):
+        """MOVES <id>: допустимые ходы стороны, чей ход."""
+        session = self.session(args, owned)
+        if session.result is not None:
+            return ''
+        return ' '.join(move_to_text(move) for move in session.legal_moves())
+
+    async def command_move(self, args, owned):
+        """MOVE <id> <ход>: ход клиента."""
+        session = self.session(args, owned)
+        if len(args) != 2:
+            raise ProtocolError('missing_move')
+        try:
+            move = text_to_move(args[1])
+        except ValueError:
+            raise ProtocolError('bad_move')
+        # Шахматный ход - ровно две клетки; серии из нескольких клеток бывают только в шашках
+        if session.game_name == 'chess' and len(move) != 4:
+            raise ProtocolError('bad_move')
+        async with session.lock:
+            session.play(move)
+        return session.status()
+
+    async def command_engine(self, args, owned):
+        """ENGINE <id> [глубина]: ход движка (поиск - в пуле процессов)."""
+        session = self.session(args, owned)
+        try:
+            depth = min(int(args[1]), self.engine_depth) if len(args) > 1 else self.engine_depth
+        except ValueError:
+            raise ProtocolError('bad_depth')
+        async with session.lock:
+            if session.result is not None:
+                raise ProtocolError('game_over')
+            task = (session.game_name, session.game.snapshot(), max(depth, 1), self.engine_seconds)
+            move = await asyncio.get_running_loop().run_in_executor(self.executor, engine_move, task)
+            if move is None:
+                raise ProtocolError('no_moves')
+            session.play(move)
+        return f'{move_to_text(move)} {session.status()}'
+
+    async def command_close(self, args, owned):
+        """CLOSE <id>: удаляет партию."""
+        self.session(args, owned)
+        del self.sessions[args[0]]
+        owned.discard(args[0])
+        return ''
+
+    async def execute(self, line, owned):
+        """Выполняет одну команду.
+
+        Args:
+            line (str): Строка команды.
+            owned (set): Номера партий, созданных этим соединением.
+
+        Returns:
+            str: Строка ответа без перевода строки; непредвиденная ошибка команды дает 'ERR internal'.
+        """
+        words = line.split()
+        if not words:
+            return 'ERR empty_command'
+        command = self.commands.get(words[0].upper())
+        if command is None:
+            return 'ERR unknown_command'
+        try:
+            answer = await command(words[1:], owned)
+        except ProtocolError as error:
+            return f'ERR {error}'
+        except Exception:
+            # Сбой одной команды не должен обрывать соединение и остальные партии
+            traceback.print_exc()
+            return 'ERR internal'
+        return f'OK {answer}' if answer else 'OK'
+
+    async def handle_client(self, reader, writer):
+        """Обслуживает одно соединение; партии соединения удаляются после его закрытия."""
+        owned = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break
+                if not line:
+                    break
+                text = line.decode('utf-8', 'replace').strip()
+                if text.upper() == 'QUIT':
+                    writer.write(b'OK\n')
+                    await writer.drain()
+                    break
+                writer.write((await self.execute(text, owned) + '\n').encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session_id in owned:
+                self.sessions.pop(session_id, None)
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, unix_path=None, ready=None):
+        """Запускает сервер и обслуживает клиентов до отмены задачи.
+
+        Args:
+            host (str): Адрес TCP.
+            port (int): Порт TCP.
+            unix_path (str or None): Путь Unix-сокета (вместо TCP).
+            ready (asyncio.Event or None): Событие, которое устанавливается, когда сервер слушает.
+        """
+        if unix_path is not None:
+            server = await asyncio.start_unix_server(self.handle_client, unix_path, limit=MAX_LINE)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE)
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+def main():
+    """Разбирает аргументы командной строки и запускает сервер."""
+    parser = argparse.ArgumentParser(description='Сервер многих партий со строчным протоколом')
+    parser.add_argument('--host', default='127.0.0.1', help='адрес TCP')
+    parser.add_argument('--port', type=int, default=8765, help='порт TCP')
+    parser.add_argument('--unix', default=None, help='путь Unix-сокета (вместо TCP)')
+    parser.add_argument('--workers', type=int, default=None, help='число процессов движка (по умолчанию все ядра)')
+    parser.add_argument('--engine-depth', type=int, default=3, help='наибольшая глубина поиска движка')
+    parser.add_argument('--engine-seconds', type=float, default=1.0, help='предел времени поиска на ход')
+    args = parser.parse_args()
+    server = GameServer(args.workers, args.engine_depth, args.engine_seconds)
+    print(f'Сервер слушает {args.unix or f"{args.host}:{args.port}"}')
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+import argparse
+import mmap
+import os
+import struct
+from array import array
+from itertools import combinations
+from math import comb, prod
+from multiprocessing import Pool
+
+from figure import KingCheckers, PawnCheckers
+from main_game import CheckersBoard
+
+# Поля, на которых стоят шашки (номер поля 0-31 - индекс в кортеже)
+DARK_SQUARES = tuple((row, col) for row in range(8) for col in range(8) if (row + col) % 2 == 1)
+DARK_SQUARE_INDEX = {square: index for index, square in enumerate(DARK_SQUARES)}
+PROMOTION_ROWS = {'white': 0, 'black': 7}  # Шашка на этой строке уже была бы дамкой
+
+# Значение позиции - один байт с точки зрения стороны, чей ход: 0 - ничья, d + 1 - результат
+# через d полуходов (при нечетном d - выигрыш, при четном - проигрыш, d = 0 - ходов нет)
+DRAW_VALUE = 0
+INVALID_VALUE = 255
+MAX_DISTANCE = 253
+
+WIN = 'win'
+LOSS = 'loss'
+DRAW = 'draw'
+
+# Файл таблиц: заголовок (сигнатура, наибольшее число фигур, число таблиц), каталог таблиц
+# (число белых шашек, белых дамок, черных шашек, черных дамок, смещение, размер) и сами таблицы
+TABLEBASE_MAGIC = b'CTB1'
+HEADER_STRUCT = struct.Struct('<4sBI')
+DIRECTORY_STRUCT = struct.Struct('<4BQI')
+
+_solved_tables = {}  # Уже решенные таблицы в процессе-обработчике
+
+
+def rank_combination(squares):
+    """Возвращает номер возрастающего набора полей в комбинаторной системе счисления."""
+    return sum(comb(square, i + 1) for i, square in enumerate(squares))
+
+# Наборы полей по номеру для каждого числа фигур одной группы
+UNRANK_TABLES = {}
+
+def unrank_table(count):
+    """Возвращает список наборов из count полей, упорядоченный по rank_combination."""
+    table = UNRANK_TABLES.get(count)
+    if table is None:
+        table = [None] * comb(32, count)
+        for squares in combinations(range(32), count):
+            table[rank_combination(squares)] = squares
+        UNRANK_TABLES[count] = table
+    return table
+
+def table_size(signature):
+    """Возвращает число позиций таблицы (с учетом очереди хода).
+
+    Args:
+        signature (tuple): Число (белых шашек, белых дамок, черных шашек, черных дамок).
+
+    Returns:
+        int: Размер таблицы в байтах.
+    """
+    return prod(comb(32, count) for count in signature) * 2
+
+def position_index(game, max_pieces=None):
+    """Находит таблицу и номер позиции в ней.
+
+    Args:
+        game (CheckersBoard): Позиция.
+        max_pieces (int or None): Если фигур больше, возвращается None без подсчета номера.
+
+    Returns:
+        tuple or None: Кортеж (signature, index) или None, если фигур больше max_pieces
+        или какая-то фигура стоит на светлом поле (такой позиции в таблицах нет).
+    """
+    if max_pieces is not None and len(game.pieces['white']) + len(game.pieces['black']) > max_pieces:
+        return None
+    groups = ([], [], [], [])
+    for side, offset in (('white', 0), ('black', 2)):
+        for square, figure in game.pieces[side].items():
+            square_index = DARK_SQUARE_INDEX.get(square)
+            if square_index is None:
+                return None
+            groups[offset + isinstance(figure, KingCheckers)].append(square_index)
+    signature = tuple(len(group) for group in groups)
+    index = 0
+    for group, count in zip(groups, signature):
+        index = index * comb(32, count) + rank_combination(sorted(group))
+    return signature, index * 2 + (game.white_turn_active == 'black')
+
+def place_position(game, signature, index):
+    """Расставляет на пустой доске позицию с номером index.
+
+    Args:
+        game (CheckersBoard): Игра с пустой доской.
+        signature (tuple): Состав фигур.
+        index (int): Номер позиции в таблице.
+
+    Returns:
+        list or None: Поставленные клетки (row, col) или None, если номер не соответствует
+        возможной позиции (фигуры на одном поле или шашка на дамочном поле); доска тогда не меняется.
+    """
+    game.white_turn_active = 'black' if index % 2 else 'white'
+    index //= 2
+    group_squares = []
+    for count in reversed(signature):
+        index, rank = divmod(index, comb(32, count))
+        group_squares.append(unrank_table(count)[rank])
+    group_squares.reverse()
+
+    occupied = set()
+    for group, squares in enumerate(group_squares):
+        side = 'black' if group >= 2 else 'white'
+        for square in squares:
+            if square in occupied or (group % 2 == 0 and DARK_SQUARES[square][0] == PROMOTION_ROWS[side]):
+                return None
+            occupied.add(square)
+
+    placed = []
+    for group, squares in enumerate(group_squares):
+        side = 'black' if group >= 2 else 'white'
+        figure_type = KingCheckers if group % 2 else PawnCheckers
+        for square in squares:
+            row, col = DARK_SQUARES[square]
+            game.set_figure(row, col, figure_type(side, game, row, col))
+            placed.append((row, col))
+    return placed
+
+def signature_levels(max_pieces):
+    """Группирует составы фигур по порядку решения.
+
+    Взятие уменьшает число фигур, а превращение - число шашек, поэтому составы одного
+    уровня (число фигур, число шашек) не зависят друг от друга и решаются параллельно.
+
+    Args:
+        max_pieces (int): Наибольшее число фигур.
+
+    Returns:
+        list: Списки составов фигур по уровням в порядке решения.
+    """
+    levels = {}
+    for total in range(1, max_pieces + 1):
+        for white_men in range(total + 1):
+            for white_kings in range(total - white_men + 1):
+                for black_men in range(total - white_men - white_kings + 1):
+                    signature = (white_men, white_kings, black_men, total - white_men - white_kings - black_men)
+                    levels.setdefault((total, white_men + black_men), []).append(signature)
+    return [levels[level] for level in sorted(levels)]
+
+def init_worker(solved_tables):
+    """Передает процессу-обработчику уже решенные таблицы."""
+    _solved_tables.clear()
+    _solved_tables.update(solved_tables)
+
+def solve_signature(signature):
+    """Решает таблицу одного состава фигур по уровням расстояния.
+
+    Ходы всех позиций строятся один раз. Переходы в таблицы с меньшим числом фигур или
+    шашек берутся из решенных таблиц, переходы внутри таблицы уточняются по кругам:
+    на круге d позиция выигрывает, если есть ход в проигрыш за d - 1, и проигрывает,
+    если все ходы ведут к выигрышу соперника не дальше d - 1. Нерешенные позиции - ничья.
+
+    Args:
+        signature (tuple): Состав фигур.
+
+    Returns:
+        tuple: Кортеж (signature, bytes) с таблицей.
+    """
+    size = table_size(signature)
+    values = bytearray(size)
+    game = CheckersBoard.empty(quiet=True)
+    # Нерешенные позиции хранятся в плоских массивах, а не в списках Python: номер позиции,
+    # границы ее ходов внутри таблицы в internal_moves и сводка ходов в решенные таблицы
+    # (наименьший проигрыш соперника, 0 - нет; наибольший выигрыш соперника,
+    # INVALID_VALUE - есть ход в ничью или проигрыш соперника)
+    positions = array('I')
+    move_offsets = array('I', [0])
+    internal_moves = array('I')
+    external_losses = bytearray()
+    external_wins = bytearray()
+    max_external = 0
+
+    for index in range(size):
+        placed = place_position(game, signature, index)
+        if placed is None:
+            values[index] = INVALID_VALUE
+            continue
+        moves = game.generate_legal_moves(game.white_turn_active)
+        if not moves:
+            values[index] = 1  # Ходов нет - проигрыш сразу
+        else:
+            external_loss = 0
+            external_win = 0
+            for move in moves:
+                game.make_move(*move)
+                next_signature, next_index = position_index(game)
+                game.unmake_move()
+                if next_signature == signature:
+                    internal_moves.append(next_index)
+                    continue
+                value = _solved_tables[next_signature][next_index]
+                max_external = max(max_external, value)
+                if value % 2:
+                    external_loss = value if not external_loss else min(external_loss, value)
+                    external_win = INVALID_VALUE
+                elif value == DRAW_VALUE:
+                    external_win = INVALID_VALUE
+                else:
+                    external_win = max(external_win, value)
+            positions.append(index)
+            move_offsets.append(len(internal_moves))
+            external_losses.append(external_loss)
+            external_wins.append(external_win)
+        for row, col in placed:
+            game.set_figure(row, col, None)
+
+    remaining = len(positions)
+    solved = bytearray(len(positions))
+    distance = 1
+    idle_rounds = 0
+    while remaining and (idle_rounds < 2 or distance <= max_external + 1):
+        resolved = []
+        for slot, index in enumerate(positions):
+            if solved[slot]:
+                continue
+            successors = internal_moves[move_offsets[slot]:move_offsets[slot + 1]]
+            # Значения ходов - с точки зрения соперника: на нечетном круге ищется ход в его
+            # проигрыш за distance - 1, на четном - все ходы должны вести к его выигрышу
+            if distance % 2:
+                if external_losses[slot] == distance or any(values[next_index] == distance for next_index in successors):
+                    resolved.append(slot)
+            elif external_wins[slot] <= distance and all(
+                    values[next_index] and values[next_index] % 2 == 0 and values[next_index] <= distance
+                    for next_index in successors):
+                resolved.append(slot)
+        if distance > MAX_DISTANCE and resolved:
+            raise ValueError(f"Слишком длинный выигрыш в таблице {signature}")
+        for slot in resolved:
+            values[positions[slot]] = distance + 1
+            solved[slot] = 1
+        remaining -= len(resolved)
+        idle_rounds = 0 if resolved else idle_rounds + 1
+        distance += 1
+    return signature, bytes(values)
+
+def generate_tablebase(path, max_pieces=3, processes=None):
+    """Строит таблицы всех составов до max_pieces фигур и записывает их в файл.
+
+    Args:
+        path (str): Путь к файлу таблиц.
+        max_pieces (int): Наибольшее число фигур на доске.
+        processes (int or None): Число процессов (по умолчанию - все ядра).
+
+    Returns:
+        int: Число позиций во всех таблицах.
+    """
+    solved_tables = {}
+    for signatures in signature_levels(max_pieces):
+        with Pool(processes or os.cpu_count(), initializer=init_worker, initargs=(solved_tables,)) as pool:
+            solved_tables.update(pool.map(solve_signature, signatures, chunksize=1))
+
+    signatures = sorted(solved_tables)
+    offset = HEADER_STRUCT.size + DIRECTORY_STRUCT.size * len(signatures)
+    with open(path, 'wb') as stream:
+        stream.write(HEADER_STRUCT.pack(TABLEBASE_MAGIC, max_pieces, len(signatures)))
+        for signature in signatures:
+            stream.write(DIRECTORY_STRUCT.pack(*signature, offset, len(solved_tables[signature])))
+            offset += len(solved_tables[signature])
+        for signature in signatures:
+            stream.write(solved_tables[signature])
+    return sum(len(table) for table in solved_tables.values())
+
+class Tablebase:
+    """Таблицы эндшпиля шашек, отображенные в память: запрос - подсчет номера позиции и чтение одного байта."""
+
+    def __init__(self, path):
+        """Открывает файл таблиц.
+
+        Args:
+            path (str): Путь к файлу таблиц.
+
+        Raises:
+            ValueError: Если файл не является файлом таблиц.
+        """
+        with open(path, 'rb') as stream:
+            self.data = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.max_pieces, count = HEADER_STRUCT.unpack_from(self.data, 0)
+        if magic != TABLEBASE_MAGIC:
+            self.data.close()
+            raise ValueError(f"Файл не является таблицами эндшпиля: {path}")
+        self.offsets = {}
+        for i in range(count):
+            *signature, offset, size = DIRECTORY_STRUCT.unpack_from(self.data, HEADER_STRUCT.size + i * DIRECTORY_STRUCT.size)
+            self.offsets[tuple(signature)] = offset
+
+    def close(self):
+        """Закрывает отображение файла."""
+        self.data.close()
+
+    def probe(self, game):
+        """Возвращает результат позиции по таблицам.
+
+        Args:
+            game (Game): Позиция (для шахмат и позиций с большим числом фигур результата нет).
+
+        Returns:
+            tuple or None: Кортеж (WIN, LOSS или DRAW для стороны, чей ход; число полуходов
+            до результата или None для ничьей) или None, если позиции нет в таблицах.
+        """
+        if not isinstance(game, CheckersBoard):
+            return None
+        position = position_index(game, self.max_pieces)
+        if position is None or position[0] not in self.offsets:
+            return None
+        value = self.data[self.offsets[position[0]] + position[1]]
+        if value == DRAW_VALUE or value == INVALID_VALUE:
+            return DRAW, None
+        return (WIN if (value - 1) % 2 else LOSS), value - 1
+
+    def best_move(self, game):
+        """Выбирает ход по таблицам: быстрейший выигрыш, иначе ничью, иначе самый долгий проигрыш.
+
+        Args:
+            game (Game): Позиция.
+
+        Returns:
+            tuple or None: Ход или None, если позиции нет в таблицах или ходов нет.
+        """
+        if self.probe(game) is None:
+            return None
+        best_move = None
+        best_rank = None
+        for move in game.generate_legal_moves(game.white_turn_active):
+            game.make_move(*move)
+            result = self.probe(game)
+            game.unmake_move()
+            if result is None:
+                continue
+            outcome, distance = result
+            if outcome == LOSS:
+                rank = (2, -distance)
+            elif outcome == DRAW:
+                rank = (1, 0)
+            else:
+                rank = (0, distance)
+            if best_rank is None or rank > best_rank:
+                best_move, best_rank = move, rank
+        return best_move
+
+def main():
+    """Разбирает аргументы командной строки и строит таблицы эндшпиля."""
+    parser = argparse.ArgumentParser(description='Построение таблиц эндшпиля шашек ретроградным анализом')
+    parser.add_argument('output', help='файл таблиц')
+    parser.add_argument('--pieces', type=int, default=3,
+                        help='наибольшее число фигур на доске (на практике до 4: 22 млн позиций, ~100 МБ на процесс)')
+    parser.add_argument('--processes', type=int, default=None, help='число процессов (по умолчанию все ядра)')
+    args = parser.parse_args()
+    positions = generate_tablebase(args.output, args.pieces, args.processes)
+    print(f'Позиций в таблицах: {positions}')
+
+if __name__ == "__main__":
+    main()
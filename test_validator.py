@@ -0,0 +1,44 @@
+import json
+import os
+import tempfile
+import unittest
+
+from records import read_records
+from validator import summarize, validate_record
+
+
+class ValidatorBadRecordsTest(unittest.TestCase):
+    """Испорченные записи попадают в итог проверки с причиной и номером, а не обрывают ее."""
+
+    def write_lines(self, lines):
+        """Записывает строки во временный файл записей и возвращает путь к нему."""
+        handle, path = tempfile.mkstemp(suffix='.jsonl')
+        with os.fdopen(handle, 'w', encoding='utf-8') as stream:
+            stream.write('\n'.join(lines) + '\n')
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_chess_move_with_extra_squares_is_bad_notation(self):
+        report = validate_record(3, {'game': 'chess', 'moves': 'e7e5 e2e4e3'})
+        self.assertEqual(report['index'], 3)
+        self.assertEqual(report['plies'], 1)
+        self.assertEqual(report['illegal'], {'ply': 1, 'move': 'e2e4e3', 'reason': 'bad_notation'})
+
+    def test_record_that_is_not_an_object_is_bad_record(self):
+        for record in (['e7e5'], 'e7e5', 42, None):
+            report = validate_record(5, record)
+            self.assertEqual(report['index'], 5)
+            self.assertEqual(report['illegal']['reason'], 'bad_record')
+
+    def test_malformed_json_line_is_bad_record(self):
+        good = json.dumps({'game': 'chess', 'moves': 'e7e5'})
+        path = self.write_lines([good, '{"game": "chess", "moves": ', '[1, 2]', good])
+        reports = [validate_record(index, record) for index, record in enumerate(read_records(path))]
+        self.assertEqual([report['index'] for report in reports], [0, 1, 2, 3])
+        self.assertEqual([report['illegal'] and report['illegal']['reason'] for report in reports],
+                         [None, 'bad_record', 'bad_record', None])
+        summary = summarize(reports)
+        self.assertEqual((summary['games'], summary['illegal']), (4, 2))
+
+if __name__ == "__main__":
+    unittest.main()
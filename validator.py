@@ -0,0 +1,174 @@
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+from main_game import GAMES
+from records import open_records, parse_move, read_records, record_moves, write_record
+from selfplay import game_over
+
+
+def validate_record(index, record, default_game='chess'):
+    """Переигрывает партию через move_actions в тихом режиме.
+
+    Испорченная запись не прерывает проверку потока, а попадает в итог с причиной:
+    bad_record - запись не объект JSON (None из records.read_records) или поле ходов
+    неверного вида, unknown_game - неизвестная игра, bad_notation - ход не разбирается
+    или шахматный ход состоит не из двух клеток.
+
+    Args:
+        index (int): Номер записи в потоке.
+        record (dict or None): Запись партии.
+        default_game (str): Игра для записей без поля 'game'.
+
+    Returns:
+        dict: Итог проверки: номер и id записи, игра, число сыгранных полуходов, первый
+        недопустимый ход (полуход, ход, причина) или None, результат позиции после последнего
+        хода (победитель, причина) или None и расхождение с заявленным победителем.
+    """
+    report = {'index': index, 'id': None, 'game': None, 'plies': 0, 'illegal': None,
+              'result': None, 'mismatch': False}
+    if not isinstance(record, dict):
+        report['illegal'] = {'ply': 0, 'move': None, 'reason': 'bad_record'}
+        return report
+    game_name = record.get('game', default_game)
+    report['id'] = record.get('id')
+    report['game'] = game_name
+    if not isinstance(game_name, str) or game_name not in GAMES:
+        report['illegal'] = {'ply': 0, 'move': None, 'reason': 'unknown_game'}
+        return report
+    try:
+        texts = record_moves(record)
+    except ValueError:
+        report['illegal'] = {'ply': 0, 'move': None, 'reason': 'bad_record'}
+        return report
+
+    game = GAMES[game_name](quiet=True)
+    for ply, text in enumerate(texts):
+        try:
+            move = parse_move(text, game_name)
+        except ValueError:
+            report['illegal'] = {'ply': ply, 'move': text, 'reason': 'bad_notation'}
+            return report
+        side = game.white_turn_active
+        if not game.move_actions(*move):
+            # Причина нужна только для недопустимого хода, поэтому проверка повторяется лишь здесь
+            report['illegal'] = {'ply': ply, 'move': text, 'reason': game.validate_move(*move).reason or 'unreachable'}
+            return report
+        game.white_turn_active = 'black' if side == 'white' else 'white'
+        report['plies'] = ply + 1
+
+    result = game_over(game, game.generate_legal_moves(game.white_turn_active))
+    if result is not None:
+        report['result'] = list(result)
+        report['mismatch'] = 'winner' in record and record['winner'] != result[0]
+    return report
+
+def validate_batch(task):
+    """Проверяет пачку записей (задача для пула процессов).
+
+    Args:
+        task (tuple): Кортеж (игра по умолчанию, список пар (номер, запись)).
+
+    Returns:
+        list: Итоги validate_record.
+    """
+    default_game, batch = task
+    return [validate_record(index, record, default_game) for index, record in batch]
+
+def batches(records, size):
+    """Лениво разбивает поток записей на пачки пар (номер, запись)."""
+    batch = []
+    for index, record in enumerate(records):
+        batch.append((index, record))
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def validate_stream(records, default_game='chess', processes=None, batch_size=64):
+    """Проверяет поток записей на пуле процессов.
+
+    В работе одновременно не больше двух пачек на процесс, а следующие записи читаются
+    только по мере готовности результатов, поэтому память не зависит от размера архива.
+    Итоги выдаются в порядке записей.
+
+    Args:
+        records (iterable): Записи партий (например, records.read_records).
+        default_game (str): Игра для записей без поля 'game'.
+        processes (int or None): Число процессов (по умолчанию - все ядра).
+        batch_size (int): Записей в одной задаче.
+
+    Yields:
+        dict: Итог validate_record для очередной записи.
+    """
+    processes = processes or os.cpu_count()
+    in_flight = deque()
+    with ProcessPoolExecutor(processes) as executor:
+        for batch in batches(records, batch_size):
+            in_flight.append(executor.submit(validate_batch, (default_game, batch)))
+            if len(in_flight) >= 2 * processes:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+def summarize(reports, report_stream=None):
+    """Собирает сводку по итогам проверки, не храня сами итоги.
+
+    Args:
+        reports (iterable): Итоги validate_record.
+        report_stream (file or None): Файл, куда дописываются итоги партий с недопустимыми
+            ходами или расхождением результата.
+
+    Returns:
+        dict: Число партий, партий с недопустимыми ходами и с расхождением результата,
+        полуходов, результаты {причина: число}, время и скорость проверки.
+    """
+    start = time.perf_counter()
+    summary = {'games': 0, 'illegal': 0, 'mismatch': 0, 'plies': 0, 'results': {}}
+    for report in reports:
+        summary['games'] += 1
+        summary['plies'] += report['plies']
+        outcome = 'illegal' if report['illegal'] else ('unfinished' if report['result'] is None else report['result'][1])
+        summary['results'][outcome] = summary['results'].get(outcome, 0) + 1
+        if report['illegal']:
+            summary['illegal'] += 1
+        if report['mismatch']:
+            summary['mismatch'] += 1
+        if report_stream is not None and (report['illegal'] or report['mismatch']):
+            write_record(report_stream, report)
+    elapsed = time.perf_counter() - start
+    summary['seconds'] = round(elapsed, 3)
+    summary['games_per_second'] = round(summary['games'] / elapsed, 1) if elapsed > 0 else 0
+    summary['plies_per_second'] = round(summary['plies'] / elapsed, 1) if elapsed > 0 else 0
+    return summary
+
+def main():
+    """Разбирает аргументы командной строки, проверяет архивы партий и печатает сводку."""
+    parser = argparse.ArgumentParser(description='Потоковая проверка записей партий по правилам игры')
+    parser.add_argument('records', nargs='+', help='файлы записей партий (.jsonl или .jsonl.gz)')
+    parser.add_argument('--game', choices=sorted(GAMES), default='chess', help="игра для записей без поля 'game'")
+    parser.add_argument('--processes', type=int, default=None, help='число процессов (по умолчанию все ядра)')
+    parser.add_argument('--batch-size', type=int, default=64, help='записей в одной задаче')
+    parser.add_argument('--report', default=None, help='файл итогов партий с ошибками (.jsonl или .jsonl.gz)')
+    args = parser.parse_args()
+
+    records = chain.from_iterable(read_records(path) for path in args.records)
+    reports = validate_stream(records, args.game, args.processes, args.batch_size)
+    if args.report is not None:
+        with open_records(args.report, 'w') as stream:
+            summary = summarize(reports, stream)
+    else:
+        summary = summarize(reports)
+
+    print(f"Партий: {summary['games']}  полуходов: {summary['plies']}  с недопустимым ходом: {summary['illegal']}  "
+          f"с неверным результатом: {summary['mismatch']}")
+    print('Результаты:', ', '.join(f'{outcome}: {count}' for outcome, count in sorted(summary['results'].items())))
+    print(f"Время: {summary['seconds']} с  партий в секунду: {summary['games_per_second']}  "
+          f"полуходов в секунду: {summary['plies_per_second']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import random
+
+from figure import FIGURE_TYPES, Pawn
+
+ZOBRIST_SEED = 20250318  # Фиксированное зерно: ключи одинаковы во всех процессах и запусках
+
+FIGURE_TYPE_INDEX = {figure_type: index for index, figure_type in enumerate(FIGURE_TYPES)}
+
+_random = random.Random(ZOBRIST_SEED)
+# PIECE_KEYS[номер типа * 2 + (1 для черных)][row * 8 + col]
+PIECE_KEYS = [[_random.getrandbits(64) for _ in range(64)] for _ in range(len(FIGURE_TYPES) * 2)]
+# Добавляется к ключу пешки, которая еще не делала первый ход
+FIRST_MOVE_KEYS = [[_random.getrandbits(64) for _ in range(64)] for _ in range(2)]
+SIDE_KEY = _random.getrandbits(64)  # Добавляется, когда ход черных
+
+# Типы оценок, хранимых в таблице транспозиций
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+def figure_key(figure, row, col):
+    """Возвращает ключ Зобриста фигуры на клетке.
+
+    Args:
+        figure (Figure): Фигура.
+        row (int): Строка клетки.
+        col (int): Столбец клетки.
+
+    Returns:
+        int: 64-битный ключ с учетом типа, стороны и (для пешки) флага первого хода.
+    """
+    side_index = 1 if figure.side == 'black' else 0
+    square = row * 8 + col
+    key = PIECE_KEYS[FIGURE_TYPE_INDEX[type(figure)] * 2 + side_index][square]
+    if isinstance(figure, Pawn) and figure.is_first_move:
+        key ^= FIRST_MOVE_KEYS[side_index][square]
+    return key
+
+def compute_key(game):
+    """Вычисляет ключ позиции с нуля (для проверки инкрементального ключа).
+
+    Args:
+        game (Game): Позиция.
+
+    Returns:
+        int: Ключ позиции с учетом очереди хода.
+    """
+    key = SIDE_KEY if game.white_turn_active == 'black' else 0
+    for row in range(8):
+        for col in range(8):
+            figure = game.board[row][col]
+            if figure is not None:
+                key ^= figure_key(figure, row, col)
+    return key
+
+class TranspositionTable:
+    """Таблица транспозиций фиксированного размера.
+
+    Запись - кортеж (key, depth, score, bound, best_move, generation). Запись заменяется,
+    если ячейка пуста, в ней та же позиция, запись осталась от прошлого поиска
+    или новая запись получена на не меньшей глубине.
+    """
+
+    def __init__(self, size=1 << 20):
+        """Создает таблицу.
+
+        Args:
+            size (int): Число ячеек (округляется вниз до степени двойки).
+        """
+        size = 1 << (max(size, 1).bit_length() - 1)
+        self.mask = size - 1
+        self.entries = [None] * size
+        self.generation = 0
+
+    def new_search(self):
+        """Отмечает начало нового поиска: записи прошлых поисков становятся кандидатами на замену."""
+        self.generation += 1
+
+    def clear(self):
+        """Очищает таблицу."""
+        self.entries = [None] * (self.mask + 1)
+
+    def probe(self, key):
+        """Ищет запись для позиции.
+
+        Args:
+            key (int): Ключ позиции.
+
+        Returns:
+            tuple or None: Запись (key, depth, score, bound, best_move, generation) или None.
+        """
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, score, bound, best_move):
+        """Сохраняет результат поиска с учетом политики замены.
+
+        Args:
+            key (int): Ключ позиции.
+            depth (int): Глубина поиска.
+            score (int): Оценка.
+            bound (int): EXACT, LOWER_BOUND или UPPER_BOUND.
+            best_move (tuple or None): Лучший ход.
+        """
+        index = key & self.mask
+        entry = self.entries[index]
+        if entry is None or entry[0] == key or entry[5] != self.generation or depth >= entry[1]:
+            if best_move is None and entry is not None and entry[0] == key:
+                best_move = entry[4]
+            self.entries[index] = (key, depth, score, bound, best_move, self.generation)